@@ -137,7 +137,9 @@ def inject_queue_handler(handlers_cfg: dict, loggers_cfg: dict, log: BufferedLog
             q = SimpleQueue() if sys.version_info[:3] > (3, 12, 7) else Queue()
         else:
             q: SimpleQueue = SimpleQueue()
-        handlers_cfg[buffered_handler_name] = {'class': 'logging.handlers.QueueHandler', 'queue': q}
+        handlers_cfg[buffered_handler_name] = {
+            'class': 'HABApp.config.logging.queue_handler.LazyQueueHandler', 'queue': q
+        }
 
         qh = HABAppQueueHandler(q, handler_name, f'LogBuffer{handler_name:s}')
         q_handlers.append(qh)
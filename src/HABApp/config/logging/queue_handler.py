@@ -1,9 +1,12 @@
 import logging
+import logging.handlers
 from queue import Empty, SimpleQueue
 from threading import Lock, Thread
 from time import sleep
 from typing import Final
 
+from typing_extensions import override
+
 import HABApp
 
 from .config import CONFIG
@@ -15,6 +18,15 @@ log = logging.getLogger('HABApp.logging')
 LOCK = Lock()
 
 
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """Puts the record into the queue without formatting it.
+    Formatting is done in the thread of the HABAppQueueHandler (or not at all if the record gets skipped)."""
+
+    @override
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
 class HABAppQueueHandler:
     FLUSH_DELAY: float = CONFIG.habapp.logging.flush_every
 
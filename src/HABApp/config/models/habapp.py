@@ -5,6 +5,15 @@ from pydantic import Field, conint, model_validator
 from typing_extensions import Self
 
 
+class ThreadPoolPartitionConfig(BaseModel):
+    threads: conint(ge=1, le=32) = 1
+    '''Amount of threads of the partition'''
+
+    rule_files: tuple[str, ...] = Field((), alias='rule files')
+    '''Callbacks of rules from these files run in the partition.
+    Unix shell-style wildcards are supported (e.g. ``rules/heating/*``)'''
+
+
 class ThreadPoolConfig(BaseModel):
     enabled: bool = True
     '''When the thread pool is disabled HABApp will become an asyncio application.
@@ -14,6 +23,57 @@ class ThreadPoolConfig(BaseModel):
     threads: conint(ge=1, le=32) = 10
     '''Amount of threads to use for the executor'''
 
+    log_metrics: timedelta = Field(timedelta(0), alias='log metrics', ge=timedelta(0))
+    '''Interval in which a summary of the thread pool metrics (queue wait, run time, peak concurrency) is logged.
+    This helps to find the right amount of threads. ``0`` disables the summary'''
+
+    priority_threads: conint(ge=0, le=32) = Field(0, alias='priority threads')
+    '''Amount of threads which are reserved for callbacks that are triggered by a command event
+    (e.g. an openHAB item command). That way commands are processed quickly even if the other threads are busy.
+    ``0`` disables the priority threads'''
+
+    partitions: dict[str, ThreadPoolPartitionConfig] = Field(default_factory=dict)
+    '''Named partitions with their own threads. Slow rules can run in a partition,
+    so they don't delay the execution of the other rules.
+    A callback can also be assigned to a partition with the ``thread_partition`` decorator'''
+
+
+class EventBusConfig(BaseModel):
+    batched: bool = False
+    '''Post events into a bounded buffer which is processed in batches by a dedicated task
+    instead of notifying all listeners directly. This keeps the event loop responsive
+    if a lot of events are posted at once (e.g. during startup)'''
+
+    queue_size: int = Field(10_000, alias='queue size', ge=100, le=1_000_000)
+    '''Maximum amount of buffered events. If the buffer is full the oldest events will be dropped'''
+
+    batch_size: int = Field(200, alias='batch size', ge=1, le=10_000)
+    '''Amount of events that are dispatched before yielding to the event loop'''
+
+
+class FilesConfig(BaseModel):
+    parallel_load: conint(ge=1, le=32) = Field(1, alias='parallel load')
+    '''Amount of files which are loaded concurrently (e.g. during startup). Only files of the same kind
+    (e.g. rule files) which don't depend on each other (``depends on``) are loaded concurrently.
+    ``1`` loads the files one after another'''
+
+    bytecode_cache: bool = Field(False, alias='bytecode cache')
+    '''Additionally to the memory cache store the compiled code of the rule files on disk
+    (in the ``__pycache__`` folder next to the rule file), so unchanged files don't have to be compiled
+    again after a restart'''
+
+
+class EventLogLimitConfig(BaseModel):
+    topic: str
+    '''Topic of the event. Unix shell-style wildcards are supported (e.g. ``zigbee2mqtt/*``)'''
+
+    count: conint(ge=0) = 1
+    '''Maximum amount of events per topic that will be logged in the interval.
+    ``0`` disables the event log for the topic'''
+
+    interval: float = Field(1, gt=0)
+    '''Interval in seconds'''
+
 
 class LoggingConfig(BaseModel):
     use_buffer: bool = Field(True, alias='use buffer')
@@ -22,6 +82,9 @@ class LoggingConfig(BaseModel):
     flush_every: float = Field(0.5, alias='flush every', ge=0.1)
     '''Wait time in seconds before the buffer gets flushed again when it was empty'''
 
+    event_limits: tuple[EventLogLimitConfig, ...] = Field((), alias='event limits')
+    '''Limit the amount of logged events for high frequency topics. The first matching entry is used'''
+
 
 class PeriodicTracebackDumpConfig(BaseModel):
     """Periodically dump the traceback of all currently running threads into a file"""
@@ -79,4 +142,6 @@ class HABAppConfig(BaseModel):
 
     logging: LoggingConfig = Field(default_factory=LoggingConfig)
     thread_pool: ThreadPoolConfig = Field(default_factory=ThreadPoolConfig, alias='thread pool')
+    event_bus: EventBusConfig = Field(default_factory=EventBusConfig, alias='event bus')
+    files: FilesConfig = Field(default_factory=FilesConfig)
     debug: DebugConfig = Field(default_factory=DebugConfig)
@@ -82,6 +82,17 @@ class Publish(BaseModel):
     qos: QOS = Field(default=0, description='Default QoS when publishing values')
     retain: bool = Field(default=False, description='Default retain flag when publishing values')
 
+    # Advanced settings
+    in_flight: int = Field(
+        10, ge=1, le=1000, in_file=False,
+        description='Maximum amount of publishes which are sent to the broker without waiting for the confirmation',
+    )
+    coalesce_retained: bool = Field(
+        False, in_file=False,
+        description='If True and the broker can not process the messages fast enough only the latest pending '
+                    'retained message of a topic will be published.'
+    )
+
 
 class General(BaseModel):
     listen_only: bool = Field(False, description='If True HABApp does not publish any value to the broker')
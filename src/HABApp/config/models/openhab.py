@@ -20,6 +20,11 @@ class General(BaseModel):
         True,
         description='If True HABApp will wait for a successful openHAB connection before loading any rules on startup'
     )
+    coalesce_updates: bool = Field(
+        False, in_file=False,
+        description='If True and openHAB can not process the state updates fast enough only the latest pending '
+                    'state update of an item will be sent. Commands are always sent.'
+    )
 
     # Advanced settings
     min_start_level: int = Field(
@@ -73,6 +78,16 @@ class Websocket(BaseModel):
         7, alias='ping interval', description='Interval for ping messages in seconds', gt=0
     )
 
+    pipeline: bool = Field(
+        False, description='Receive and parse the events in separate tasks. Messages which are queued during a burst '
+        'of events are parsed together in a worker thread, so the event loop stays responsive.'
+    )
+
+    pipeline_batch_size: int = Field(
+        100, alias='pipeline batch size', ge=1, le=10_000,
+        description='Maximum amount of queued messages which are parsed together'
+    )
+
     @field_validator('max_msg_size')
     def validate_see_buffer(cls, value: ByteSize):
         valid_values = (
@@ -96,6 +111,16 @@ class Connection(BaseModel):
     password: str = ''
     verify_ssl: bool = Field(True, description='Check certificates when using https')
 
+    connection_limit: int = Field(
+        100, ge=0, in_file=False,
+        description='Maximum amount of simultaneous http connections to openHAB. 0 disables the limit.'
+    )
+    http_workers: int = Field(
+        1, ge=1, le=32, in_file=False,
+        description='Amount of workers which send updates and commands through http. '
+                    'Messages of the same item are always sent in order.'
+    )
+
     websocket: Websocket = Field(
         default_factory=Websocket, in_file=False, description='Options for the websocket connection which is used'
         'to connect to the openHAB event bus.'
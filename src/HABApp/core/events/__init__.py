@@ -1,3 +1,5 @@
+from HABApp.core.internals.event_bus import TopicPattern
+
 from . import habapp_events
 from .events import (
     ItemNoChangeEvent,
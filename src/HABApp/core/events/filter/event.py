@@ -1,5 +1,5 @@
 from inspect import isclass
-from typing import Final
+from typing import Any, Final
 from typing import get_type_hints as typing_get_type_hints
 
 from HABApp.core.const import MISSING
@@ -57,6 +57,12 @@ class EventFilter(EventFilterBase):
 
         return True
 
+    def get_index_key(self) -> tuple[type, str | None, Any] | None:
+        # A subclass might implement a different trigger logic
+        if type(self).trigger is not EventFilter.trigger:
+            return None
+        return self.event_class, self.attr_name1, self.attr_value1
+
     def describe(self) -> str:
 
         values = ''
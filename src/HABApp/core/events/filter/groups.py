@@ -31,6 +31,13 @@ class AndFilterGroup(EventFilterBaseGroup):
     def trigger(self, event: Any) -> bool:
         return all(f.trigger(event) for f in self.filters)
 
+    def get_index_key(self) -> tuple[type, str | None, Any] | None:
+        # all filters have to match, so we can use the index of any child
+        for f in self.filters:
+            if (key := f.get_index_key()) is not None:
+                return key
+        return None
+
     def describe(self) -> str:
         objs = [f.describe() for f in self.filters]
         return f'({" and ".join(objs)})'
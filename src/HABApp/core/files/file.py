@@ -129,6 +129,9 @@ class HABAppFile:
     def can_be_loaded(self) -> bool:
         return self._state is FileState.DEPENDENCIES_OK
 
+    def state_dependencies_missing(self) -> bool:
+        return self._state is FileState.DEPENDENCIES_MISSING
+
     def state_unload_pending(self) -> bool:
         return self._state is FileState.UNLOAD_PENDING
 
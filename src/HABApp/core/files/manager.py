@@ -3,6 +3,7 @@ from __future__ import annotations
 import asyncio
 import logging
 from asyncio import sleep
+from itertools import groupby
 from pathlib import Path
 from time import monotonic
 from typing import TYPE_CHECKING, Final
@@ -18,7 +19,7 @@ from HABApp.core.lib import SingleTask
 
 
 if TYPE_CHECKING:
-    from collections.abc import Awaitable, Callable
+    from collections.abc import Awaitable, Callable, Iterable
     from re import Pattern
 
     from HABApp.core.events.habapp_events import RequestFileLoadEvent, RequestFileUnloadEvent
@@ -135,9 +136,140 @@ class FileManager:
         if file.can_be_removed():
             self._files.pop(name)
 
+    def _get_load_plan(self) -> list[str]:
+        """Return the names of the files which can be loaded. Files are always after the files they depend on."""
+        waiting = [f.name for f in self._files.values() if f.can_be_loaded() or f.state_dependencies_missing()]
+
+        plan: list[str] = []
+        planned: set[str] = set()
+
+        ordered = list(self._file_names.get_names(waiting))
+        while ordered:
+            remaining = []
+            for name in ordered:
+                for dep in self._files[name].properties.depends_on:
+                    if dep in planned:
+                        continue
+                    # can_be_unloaded is only true for loaded files
+                    if (file := self.get_file(dep)) is None or not file.can_be_unloaded():
+                        remaining.append(name)
+                        break
+                else:
+                    plan.append(name)
+                    planned.add(name)
+
+            # the remaining files depend on files which can not be loaded
+            if len(remaining) == len(ordered):
+                break
+            ordered = remaining
+
+        return plan
+
+    async def _do_files_load(self, names: list[str], parallel: int) -> int:
+        pending = names.copy()
+        running: dict[asyncio.Task, str] = {}
+        try:
+            while True:
+                # start the files for which all dependencies are loaded
+                for name in tuple(pending):
+                    if len(running) >= parallel:
+                        break
+                    file = self._files[name]
+                    file.check_dependencies(self)
+                    if file.can_be_loaded() and not self._reloads_on_running(file, running.values()):
+                        pending.remove(name)
+                        running[asyncio.create_task(self._do_file_load(name))] = name
+
+                # the dependencies of the pending files could not be loaded
+                if not running:
+                    return len(names) - len(pending)
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    running.pop(task)
+                    task.result()
+        finally:
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+    def _reloads_on_running(self, file: HABAppFile, running: Iterable[str]) -> bool:
+        # If a file is loaded while a file it reloads on is loaded too the reload would get lost,
+        # because the state change of the loading file would be overwritten
+        for name in running:
+            if name in file.properties.reloads_on or file.name in self._files[name].properties.reloads_on:
+                return True
+        return False
+
+    async def _process_batch(self, *, log_msg: bool) -> tuple[int, int]:
+        unload_names: list[str] = []
+        loaded = 0
+
+        # files which are already loaded have to be unloaded before they can be loaded again
+        for name in self._files_request_load:
+            if (existing := self.get_file(name)) and existing.can_be_unloaded():
+                self._files_request_unload.add(name)
+
+        # unload order is reverse of load order, since we unload unconditionally we can
+        if self._files_request_unload:
+            unload_names.extend(self._file_names.get_names(self._files_request_unload, reverse=True))
+            self._files_request_unload.clear()
+            for name in unload_names:
+                await self._do_file_unload(name)
+
+        # then we add all the files we want to load
+        if self._files_request_load:
+            names = list(self._file_names.get_names(self._files_request_load))
+            self._files_request_load.clear()
+            for name in names:
+                self._files[name] = self.__create_file(name)
+
+        # check files for dependencies etc.
+        for file in self._files.values():
+            file.check_properties(self, log, log_msg=log_msg)
+            file.check_dependencies(self)
+
+        # unload pending files
+        if unload_pending := [f.name for f in self._files.values() if f.state_unload_pending()]:
+            names = list(self._file_names.get_names(unload_pending, reverse=True))
+            unload_names.extend(names)
+            for name in names:
+                await self._do_file_unload(name)
+
+            for file in self._files.values():
+                file.check_properties(self, log, log_msg=log_msg)
+
+        # load the files in the order of the plan.
+        # Only files of the same handler are loaded concurrently, e.g. the rule files have to wait
+        # until the parameter files are loaded
+        if plan := self._get_load_plan():
+            parallel = HABApp.CONFIG.habapp.files.parallel_load
+            for _, names in groupby(plan, key=self._get_file_handler):
+                loaded += await self._do_files_load(list(names), parallel)
+
+        return len(unload_names), loaded
+
+    async def _wait_for_events(self) -> None:
+        # Wait until no more events are received, so all changes are processed in one batch.
+        # If the events keep coming (e.g. git checkout) the delay is increased
+        delay = 0.1
+        delay_max = 1.6
+        wait_max = 10
+        start = monotonic()
+
+        while True:
+            async with self._lock:
+                if not self._event_received:
+                    return None
+                self._event_received = False
+
+            if monotonic() - start >= wait_max:
+                return None
+
+            await sleep(delay)
+            delay = min(delay * 2, delay_max)
+
     async def _load_file_task(self, *, keep_alive: bool = True) -> None:
         try:
-            task_sleep = 0.4
             task_alive = 15
 
             task_shutdown = False
@@ -147,54 +279,17 @@ class FileManager:
                 await sleep(0)
 
                 # wait to aggregate changes
-                while True:
-                    async with self._lock:
-                        if not self._event_received:
-                            break
-                        self._event_received = False
-
-                    await sleep(task_sleep)
+                await self._wait_for_events()
 
                 async with self._lock:
-                    # we first try to unload all files
-                    if self._files_request_unload:
-                        # unload order is reverse of load order, since we unload unconditionally we can
-                        unload_name = next(self._file_names.get_names(self._files_request_unload, reverse=True))
-                        self._files_request_unload.remove(unload_name)
-                        await self._do_file_unload(unload_name)
-                        last_process = monotonic()
-                        continue
-
-                    # then we add all the files we want to load
-                    if self._files_request_load:
-                        load_name = next(self._file_names.get_names(self._files_request_load))
-                        if (existing := self.get_file(load_name)) and existing.can_be_unloaded():
-                            self._files_request_unload.add(load_name)
-                            continue
-                        self._files_request_load.remove(load_name)
-                        self._files[load_name] = self.__create_file(load_name)
-                        last_process = monotonic()
-                        continue
-
-                    # Once we cleared all the queues the proper processing starts:
-                    # check files for dependencies etc.
-                    for file in self._files.values():
-                        file.check_properties(self, log, log_msg=task_shutdown)
-                        file.check_dependencies(self)
-
-                    # unload pending files
-                    if unload_pending := [f.name for f in self._files.values() if f.state_unload_pending()]:
-                        name = next(self._file_names.get_names(unload_pending, reverse=True))
-                        await self._do_file_unload(name)
-                        last_process = monotonic()
-                        continue
-
-                    # load files
-                    if can_be_loaded := [f.name for f in self._files.values() if f.can_be_loaded()]:
-                        name = next(self._file_names.get_names(can_be_loaded))
-                        await self._do_file_load(name)
-                        last_process = monotonic()
-                        continue
+                    start = monotonic()
+                    unloaded, loaded = await self._process_batch(log_msg=task_shutdown)
+
+                if unloaded or loaded:
+                    last_process = monotonic()
+                    log.info(f'Processed files in {last_process - start:.2f}s: '
+                             f'{unloaded:d} unloaded, {loaded:d} loaded')
+                    continue
 
                 if task_shutdown or not keep_alive:
                     break
@@ -6,6 +6,7 @@ from asyncio import Event, Task
 from collections.abc import Awaitable, Callable
 from pathlib import Path
 from re import Pattern
+from time import monotonic
 from typing import Any, Final
 
 from typing_extensions import override
@@ -64,9 +65,13 @@ class FolderDispatcher(FileWatcherDispatcherBase):
             return False
         return self._name == other._name and self._coro is other._coro and self._folder == other._folder
 
+    @property
+    def folder(self) -> str:
+        return self._folder
+
     @override
     def allow(self, change: Change, path: str) -> bool:
-        return path.startswith(self._folder)
+        return path.startswith(self._folder) and (len(path) == len(self._folder) or path[len(self._folder)] == '/')
 
 
 class FileDispatcher(FileWatcherDispatcherBase):
@@ -80,14 +85,60 @@ class FileDispatcher(FileWatcherDispatcherBase):
             return False
         return self._name == other._name and self._coro is other._coro and self._file == other._file
 
+    @property
+    def file(self) -> str:
+        return self._file
+
     @override
     def allow(self, change: Change, path: str) -> bool:
         return path == self._file
 
 
+class DispatcherIndex:
+    """Index to find the dispatchers for a path without having to check every dispatcher.
+    The dispatchers are returned in the order they were added.
+    """
+
+    def __init__(self, dispatchers: tuple[FileWatcherDispatcherBase, ...] = ()) -> None:
+        self._files: Final[dict[str, tuple[FileWatcherDispatcherBase, ...]]] = {}
+        self._folders: Final[dict[str, tuple[FileWatcherDispatcherBase, ...]]] = {}
+        self._others: tuple[FileWatcherDispatcherBase, ...] = ()
+        self._positions: Final[dict[int, int]] = {}
+
+        for i, d in enumerate(dispatchers):
+            self._positions[id(d)] = i
+            if isinstance(d, FileDispatcher):
+                self._files[d.file] = self._files.get(d.file, ()) + (d, )
+            elif isinstance(d, FolderDispatcher):
+                self._folders[d.folder] = self._folders.get(d.folder, ()) + (d, )
+            else:
+                self._others += (d, )
+
+    def get_dispatchers(self, path: str) -> list[FileWatcherDispatcherBase]:
+        ret = list(self._files.get(path, ()))
+
+        # check the path and all parent folders
+        folders = self._folders
+        key = path
+        while True:
+            if (found := folders.get(key)) is not None:
+                ret.extend(found)
+            key, sep, _ = key.rpartition('/')
+            if not sep or not key:
+                break
+
+        if self._others:
+            ret.extend(d for d in self._others if d.allow(None, path))
+
+        if len(ret) > 1:
+            ret.sort(key=lambda x: self._positions[id(x)])
+        return ret
+
+
 class HABAppFileWatcher:
     def __init__(self) -> None:
         self._dispatchers: tuple[FileWatcherDispatcherBase, ...] = ()
+        self._index: DispatcherIndex = DispatcherIndex()
         self._paths: tuple[str, ...] = ()
         self._files_task: Task | None = None
         self._stop_event: Final = Event()
@@ -106,6 +157,7 @@ class HABAppFileWatcher:
                 raise ValueError(msg)
 
         self._dispatchers = tuple(d for d in self._dispatchers if d is not dispatcher)
+        self._index = DispatcherIndex(self._dispatchers)
 
     def watch_folder(self, name: str, coro: Callable[[str], Awaitable[Any]], folder: Path, *,
                      habapp_internal: bool = False) -> FolderDispatcher:
@@ -138,6 +190,7 @@ class HABAppFileWatcher:
             raise ValueError(msg)
 
         self._dispatchers += (dispatcher, )
+        self._index = DispatcherIndex(self._dispatchers)
         log.debug(f'Added dispatcher {dispatcher.name:s}')
         self.__notify_task()
 
@@ -162,7 +215,7 @@ class HABAppFileWatcher:
         if dispatchers is not None:
             return any(dispatcher.allow(change, path) for dispatcher in dispatchers)
 
-        process = any(dispatcher.allow(change, path) for dispatcher in self._dispatchers)
+        process = bool(self._index.get_dispatchers(path))
         log.debug(f'{change.name:s} {path:s}{" (ignored)" if not process else ""}')
         return process
 
@@ -176,10 +229,12 @@ class HABAppFileWatcher:
                 log.debug('Starting file watcher')
                 async for changes in awatch(*self._paths, debounce=120_000, step=1000,
                                             watch_filter=self._watch_filter, stop_event=self._stop_event):
+                    start = monotonic()
                     file_names = sorted({Path(p).as_posix() for _, p in changes})
-                    for dispatcher in self._dispatchers:
-                        for path in file_names:
+                    for path in file_names:
+                        for dispatcher in self._index.get_dispatchers(path):
                             await dispatcher.dispatch(path)
+                    log.debug(f'Dispatched {len(file_names):d} changes in {monotonic() - start:.3f}s')
 
                 log.debug('File watcher stopped')
             except Exception as e:
@@ -191,6 +246,7 @@ class HABAppFileWatcher:
 
     async def shutdown(self) -> None:
         self._dispatchers = ()
+        self._index = DispatcherIndex()
         self._stop_event.set()
         if self._files_task is None:
             return None
@@ -256,6 +312,5 @@ class HABAppFileWatcher:
                         files.append(obj_str)
 
         for file in sorted(files):
-            for dispatcher in self._dispatchers:
-                if dispatcher.allow(None, file):
-                    await dispatcher.dispatch(file)
+            for dispatcher in self._index.get_dispatchers(file):
+                await dispatcher.dispatch(file)
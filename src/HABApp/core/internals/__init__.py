@@ -6,7 +6,7 @@ from .proxy import setup_internals, uses_event_bus, uses_get_item, uses_item_reg
 
 from .event_bus import EventBus
 from .event_filter import EventFilterBase
-from .item_registry import ItemRegistry, ItemRegistryItem
+from .item_registry import ItemRegistry, ItemRegistryItem, ItemRegistryQuery
 
 
 # isort: split
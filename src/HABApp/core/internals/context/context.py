@@ -51,6 +51,9 @@ class Context:
     def get_callback_name(self, callback: Callable) -> str | None:
         raise NotImplementedError()
 
+    def get_thread_partition(self) -> str | None:
+        return None
+
 
 class ContextProvidingObj:
     def __init__(self, context: Context | None = None, **kwargs: Any) -> None:
@@ -1,2 +1,4 @@
 from .base_listener import EventBusBaseListener
+from .dispatcher import EventBusDispatchStats
 from .event_bus import EventBus
+from .topic_pattern import TopicPattern
@@ -15,3 +15,8 @@ class EventBusBaseListener:
 
     def describe(self) -> str:
         raise NotImplementedError()
+
+    def get_index_key(self) -> tuple[type, str | None, Any] | None:
+        """Return (event class, attribute name, attribute value) which can be used to preselect the listener
+        or None if the listener has to be notified for every event."""
+        return None
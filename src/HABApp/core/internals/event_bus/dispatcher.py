@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import logging
+from asyncio import Event, sleep
+from collections import deque
+from dataclasses import dataclass
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Final
+
+from HABApp.core.const import loop
+from HABApp.core.lib import SingleTask, format_exception
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+log = logging.getLogger('HABApp')
+
+
+@dataclass(frozen=True)
+class EventBusDispatchStats:
+    queue_size: int             #: Maximum amount of events in the buffer
+    queue_depth: int            #: Current amount of events in the buffer
+    queue_depth_max: int        #: Highest amount of events in the buffer
+    dispatched: int             #: Amount of events that have been dispatched
+    dropped: int                #: Amount of events that have been dropped because the buffer was full
+    drain_latency: float        #: Time in seconds the oldest event of the last batch waited in the buffer
+    drain_latency_max: float    #: Highest time in seconds an event waited in the buffer
+
+
+class EventBusDispatcher:
+    __slots__ = (
+        '_buffer', '_depth_max', '_dispatch', '_dispatched', '_dropped', '_dropped_reported',
+        '_latency', '_latency_max', '_task', '_wake_pending', '_wakeup', 'batch_size', 'queue_size'
+    )
+
+    def __init__(self, dispatch: Callable[[str, Any], None], queue_size: int, batch_size: int) -> None:
+        if not isinstance(queue_size, int) or queue_size <= 0:
+            msg = 'Queue size must be a positive integer'
+            raise ValueError(msg)
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            msg = 'Batch size must be a positive integer'
+            raise ValueError(msg)
+
+        self.queue_size: Final = queue_size
+        self.batch_size: Final = batch_size
+
+        self._dispatch: Final = dispatch
+        self._buffer: Final[deque[tuple[float, str, Any]]] = deque(maxlen=queue_size)
+        self._wakeup: Final = Event()
+        self._wake_pending = False
+        self._task: Final = SingleTask(self._drain_task, name='EventBusDispatcher')
+
+        # statistics
+        self._depth_max = 0
+        self._dispatched = 0
+        self._dropped = 0
+        self._dropped_reported = 0
+        self._latency = 0.0
+        self._latency_max = 0.0
+
+    def put(self, topic: str, event: Any) -> None:
+        buffer = self._buffer
+
+        # deque drops the oldest entry when it's full
+        if (depth := len(buffer)) >= self.queue_size:
+            self._dropped += 1
+        elif depth >= self._depth_max:
+            self._depth_max = depth + 1
+
+        buffer.append((monotonic(), topic, event))
+
+        # Events can be posted from the worker threads, so we always have to wake up the task thread safe
+        if not self._wake_pending:
+            self._wake_pending = True
+            loop.call_soon_threadsafe(self._wakeup.set)
+
+    def start(self) -> None:
+        self._task.start_if_not_running()
+
+    def stop(self) -> None:
+        self._task.cancel()
+
+        # dispatch everything that is still buffered
+        buffer = self._buffer
+        while buffer:
+            self._process_batch(len(buffer))
+
+    def get_stats(self) -> EventBusDispatchStats:
+        return EventBusDispatchStats(
+            queue_size=self.queue_size, queue_depth=len(self._buffer), queue_depth_max=self._depth_max,
+            dispatched=self._dispatched, dropped=self._dropped,
+            drain_latency=self._latency, drain_latency_max=self._latency_max
+        )
+
+    def _process_batch(self, count: int) -> None:
+        buffer = self._buffer
+        dispatch = self._dispatch
+
+        ts_posted, topic, event = buffer.popleft()
+        self._latency = latency = monotonic() - ts_posted
+        self._latency_max = max(latency, self._latency_max)
+
+        processed = 0
+        while True:
+            try:
+                dispatch(topic, event)
+            except Exception as e:
+                log.error(f'Error while dispatching event on "{topic:s}": {e}')
+                for line in format_exception(e):
+                    log.error(line)
+
+            processed += 1
+            if processed >= count or not buffer:
+                break
+            _, topic, event = buffer.popleft()
+
+        self._dispatched += processed
+
+        if (dropped := self._dropped) != self._dropped_reported:
+            log.warning(f'Event bus buffer full! Dropped {dropped - self._dropped_reported:d} events '
+                        f'(queue size: {self.queue_size:d})')
+            self._dropped_reported = dropped
+
+    async def _drain_task(self) -> None:
+        buffer = self._buffer
+        wakeup = self._wakeup
+        batch_size = self.batch_size
+
+        while True:
+            await wakeup.wait()
+            wakeup.clear()
+            self._wake_pending = False
+
+            while buffer:
+                self._process_batch(batch_size)
+                # give other tasks the chance to run
+                await sleep(0)
@@ -1,42 +1,117 @@
 import logging
 import threading
-from typing import Any
+from collections.abc import Iterable
+from typing import Any, Final
 
 from HABApp.core.const.log import TOPIC_EVENTS
 
 from .base_listener import EventBusBaseListener
+from .dispatcher import EventBusDispatcher, EventBusDispatchStats
+from .log_limit import EventLogLimiter
+from .topic_listeners import TopicListeners
+from .topic_pattern import TopicPattern, TopicTrie
 
 
 event_log = logging.getLogger(TOPIC_EVENTS)
 habapp_log = logging.getLogger('HABApp')
 
+# Max amount of topics for which the matching pattern listeners are cached
+PATTERN_CACHE_SIZE: Final = 4096
+
 
 class EventBus:
-    __slots__ = ('_listeners', '_lock')
+    __slots__ = ('_dispatcher', '_listeners', '_lock', '_log_limiter', '_pattern_cache', '_patterns')
 
     def __init__(self) -> None:
         self._lock = threading.Lock()
-        self._listeners: dict[str, tuple[EventBusBaseListener, ...]] = {}
+        self._listeners: dict[str, TopicListeners] = {}
+        self._patterns = TopicTrie()
+        self._pattern_cache: dict[str, TopicListeners] = {}
+        self._dispatcher: EventBusDispatcher | None = None
+        self._log_limiter: EventLogLimiter | None = None
 
     def post_event(self, topic: str, event: Any) -> None:
         if not isinstance(topic, str):
             msg = f'Topic must be a string! Got {type(topic)}'
             raise TypeError(msg)
 
-        if not isinstance(event, str):
-            event_prv = str(event)
-        else:
-            event_prv = event[:120] + ' ...' if len(event) > 120 else event
-            event_prv = "'" + event_prv.replace('\n', '\\n') + "'"
+        # batched dispatch: the event gets logged and dispatched from the dispatcher task
+        if (dispatcher := self._dispatcher) is not None:
+            dispatcher.put(topic, event)
+            return None
+
+        return self._dispatch(topic, event)
 
-        event_log.info(f'{topic:>20s}: {event_prv}')
+    def _dispatch(self, topic: str, event: Any) -> None:
+        # Formatting of the event is deferred until the record gets emitted
+        if event_log.isEnabledFor(logging.INFO) and (
+                (limiter := self._log_limiter) is None or limiter.allow(topic)):
+            if not isinstance(event, str):
+                event_log.info('%20s: %s', topic, event)
+            else:
+                event_prv = event[:120] + ' ...' if len(event) > 120 else event
+                event_log.info('%20s: %s', topic, "'" + event_prv.replace('\n', '\\n') + "'")
 
         # Notify all listeners
         if (listeners := self._listeners.get(topic)) is not None:
-            for listener in listeners:
-                listener.notify_listeners(event)
+            listeners.notify_listeners(event)
+
+        # Notify all listeners with a matching pattern
+        if self._patterns:
+            if (listeners := self._pattern_cache.get(topic)) is None:
+                listeners = self._match_patterns(topic)
+            listeners.notify_listeners(event)
+        return None
+
+    def _match_patterns(self, topic: str) -> TopicListeners:
+        with self._lock:
+            # Topics can be arbitrary (e.g. from mqtt) so the cache is cleared once it grows too big
+            if len(cache := self._pattern_cache) >= PATTERN_CACHE_SIZE:
+                cache = self._pattern_cache = {}
+            cache[topic] = listeners = TopicListeners(self._patterns.match(topic))
+        return listeners
+
+    def enable_batched_dispatch(self, queue_size: int, batch_size: int) -> None:
+        """Post events into a bounded buffer which is drained in batches by a dedicated task.
+        If the buffer is full the oldest events will be dropped.
+
+        :param queue_size: maximum amount of buffered events
+        :param batch_size: amount of events that are dispatched before yielding to the event loop
+        """
+        if (dispatcher := self._dispatcher) is not None:
+            if dispatcher.queue_size == queue_size and dispatcher.batch_size == batch_size:
+                return None
+            self.disable_batched_dispatch()
+
+        dispatcher = EventBusDispatcher(self._dispatch, queue_size, batch_size)
+        dispatcher.start()
+        self._dispatcher = dispatcher
+        habapp_log.debug(f'Enabled batched event dispatch (queue size: {queue_size:d}, batch size: {batch_size:d})')
         return None
 
+    def disable_batched_dispatch(self) -> None:
+        """Dispatch all events directly when they are posted. Events that are still buffered will be dispatched."""
+        if (dispatcher := self._dispatcher) is None:
+            return None
+
+        self._dispatcher = None
+        dispatcher.stop()
+        habapp_log.debug('Disabled batched event dispatch')
+        return None
+
+    def get_dispatch_stats(self) -> EventBusDispatchStats | None:
+        """Return the statistics of the batched dispatch or ``None`` if events are dispatched directly"""
+        if (dispatcher := self._dispatcher) is None:
+            return None
+        return dispatcher.get_stats()
+
+    def set_event_log_limits(self, limits: Iterable[tuple[str, int, float]]) -> None:
+        """Limit the amount of events that are logged per topic.
+
+        :param limits: entries of (topic pattern, count, interval in secs). The first matching pattern is used.
+        """
+        self._log_limiter = EventLogLimiter(limits) or None
+
     def add_listener(self, listener: EventBusBaseListener) -> None:
         if not isinstance(listener, EventBusBaseListener):
             raise TypeError()
@@ -46,7 +121,11 @@ class EventBus:
             raise ValueError()
 
         with self._lock:
-            item_listeners = self._listeners.get(topic, ())
+            if isinstance(topic, TopicPattern):
+                return self._add_pattern_listener(topic, listener)
+
+            topic_listeners = self._listeners.get(topic)
+            item_listeners = topic_listeners.listeners if topic_listeners is not None else ()
 
             # don't add the same listener twice
             if listener in item_listeners:
@@ -54,7 +133,7 @@ class EventBus:
                 return None
 
             # add listener
-            self._listeners[topic] = item_listeners + (listener,)
+            self._listeners[topic] = TopicListeners(item_listeners + (listener,))
             habapp_log.debug(f'Added event listener for {listener.describe()}')
             return None
 
@@ -67,7 +146,11 @@ class EventBus:
             raise ValueError()
 
         with self._lock:
-            item_listeners = self._listeners.get(topic, ())
+            if isinstance(topic, TopicPattern):
+                return self._remove_pattern_listener(topic, listener)
+
+            topic_listeners = self._listeners.get(topic)
+            item_listeners = topic_listeners.listeners if topic_listeners is not None else ()
 
             # print warning if we try to remove it twice
             if listener not in item_listeners:
@@ -75,10 +158,35 @@ class EventBus:
                 return None
 
             # remove listener
-            self._listeners[topic] = tuple(o for o in item_listeners if o is not listener)
+            if new_listeners := tuple(o for o in item_listeners if o is not listener):
+                self._listeners[topic] = TopicListeners(new_listeners)
+            else:
+                self._listeners.pop(topic)
             habapp_log.debug(f'Removed event listener for {listener.describe()}')
             return None
 
+    def _add_pattern_listener(self, pattern: TopicPattern, listener: EventBusBaseListener) -> None:
+        if listener in self._patterns:
+            habapp_log.warning(f'Event listener for {listener.describe()} has already been added!')
+            return None
+
+        self._patterns.add(pattern, listener)
+        self._pattern_cache = {}
+        habapp_log.debug(f'Added event listener for {listener.describe()}')
+        return None
+
+    def _remove_pattern_listener(self, pattern: TopicPattern, listener: EventBusBaseListener) -> None:
+        if listener not in self._patterns:
+            habapp_log.warning(f'Event listener for {listener.describe()} has already been removed!')
+            return None
+
+        self._patterns.remove(pattern, listener)
+        self._pattern_cache = {}
+        habapp_log.debug(f'Removed event listener for {listener.describe()}')
+        return None
+
     def remove_all_listeners(self) -> None:
         with self._lock:
             self._listeners.clear()
+            self._patterns.clear()
+            self._pattern_cache = {}
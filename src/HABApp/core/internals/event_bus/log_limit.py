@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from fnmatch import fnmatchcase
+from time import monotonic
+from typing import TYPE_CHECKING, Final
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+# Max amount of topics for which the limit is cached
+TOPIC_CACHE_SIZE: Final = 4096
+
+
+class TopicLogLimit:
+    __slots__ = ('count', 'hits', 'interval', 'window_end')
+
+    def __init__(self, count: int, interval: float) -> None:
+        self.count: Final = count
+        self.interval: Final = interval
+
+        self.hits: int = 0
+        self.window_end: float = -1.0
+
+    def allow(self) -> bool:
+        if (now := monotonic()) >= self.window_end:
+            self.window_end = now + self.interval
+            self.hits = 0
+
+        if self.hits >= self.count:
+            return False
+
+        self.hits += 1
+        return True
+
+
+class EventLogLimiter:
+    """Limits how many events are logged per topic. Each topic that matches a pattern gets its own window."""
+
+    __slots__ = ('_limits', '_topics')
+
+    def __init__(self, limits: Iterable[tuple[str, int, float]]) -> None:
+        self._limits: Final = tuple(limits)
+        self._topics: dict[str, TopicLogLimit | None] = {}
+
+        for pattern, count, interval in self._limits:
+            if not isinstance(pattern, str) or not pattern:
+                msg = 'Pattern must be a non empty string'
+                raise ValueError(msg)
+            if not isinstance(count, int) or count < 0:
+                msg = 'Count must be an int >= 0'
+                raise ValueError(msg)
+            if interval <= 0:
+                msg = 'Interval must be > 0'
+                raise ValueError(msg)
+
+    def __bool__(self) -> bool:
+        return bool(self._limits)
+
+    def _create_limit(self, topic: str) -> TopicLogLimit | None:
+        for pattern, count, interval in self._limits:
+            if fnmatchcase(topic, pattern):
+                return TopicLogLimit(count, interval)
+        return None
+
+    def allow(self, topic: str) -> bool:
+        try:
+            limit = self._topics[topic]
+        except KeyError:
+            # Topics can be arbitrary (e.g. from mqtt) so the cache is cleared once it grows too big
+            if len(self._topics) >= TOPIC_CACHE_SIZE:
+                self._topics = {}
+            limit = self._topics[topic] = self._create_limit(topic)
+
+        return limit is None or limit.allow()
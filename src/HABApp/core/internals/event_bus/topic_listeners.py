@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, Final
+
+
+if TYPE_CHECKING:
+    from .base_listener import EventBusBaseListener
+
+
+# Below this amount of listeners it's faster to just check all of them
+INDEX_MIN_LISTENERS: Final = 5
+
+_ENTRY = tuple[int, 'EventBusBaseListener']
+_RESOLVED = tuple[tuple[_ENTRY, ...], tuple[tuple[str, dict[Any, tuple[_ENTRY, ...]]], ...]]
+
+_sort_key: Final = itemgetter(0)
+
+
+class TopicListeners:
+    """Immutable container for the listeners of a topic.
+
+    If there are enough listeners an index is built which is keyed by the event class (respecting the MRO)
+    and the value of the first attribute filter. The index only preselects the listeners,
+    the filter of each selected listener is still checked.
+    """
+
+    __slots__ = ('_by_attr', '_by_class', '_resolved', '_unindexed', 'listeners')
+
+    def __init__(self, listeners: tuple[EventBusBaseListener, ...]) -> None:
+        self.listeners: Final = listeners
+
+        # listeners that can not be indexed
+        self._unindexed: list[_ENTRY] = []
+        # event class -> listeners without attribute filter
+        self._by_class: dict[type, list[_ENTRY]] = {}
+        # event class -> attribute name -> attribute value -> listeners
+        self._by_attr: dict[type, dict[str, dict[Any, list[_ENTRY]]]] = {}
+        # resolved lookups for the concrete event class
+        self._resolved: dict[type, _RESOLVED] = {}
+
+        if len(listeners) < INDEX_MIN_LISTENERS:
+            return None
+
+        for pos, listener in enumerate(listeners):
+            entry = (pos, listener)
+            if (key := listener.get_index_key()) is None:
+                self._unindexed.append(entry)
+                continue
+
+            event_class, attr_name, attr_value = key
+            if attr_name is None:
+                self._by_class.setdefault(event_class, []).append(entry)
+                continue
+
+            try:
+                hash(attr_value)
+            except TypeError:
+                self._by_class.setdefault(event_class, []).append(entry)
+                continue
+
+            self._by_attr.setdefault(event_class, {}).setdefault(attr_name, {}).setdefault(attr_value, []).append(entry)
+        return None
+
+    def __bool__(self) -> bool:
+        return bool(self.listeners)
+
+    def _resolve(self, event_class: type) -> _RESOLVED:
+        plain: list[_ENTRY] = list(self._unindexed)
+        attrs: dict[str, dict[Any, list[_ENTRY]]] = {}
+
+        for cls in event_class.__mro__:
+            if (entries := self._by_class.get(cls)) is not None:
+                plain.extend(entries)
+            if (attr_objs := self._by_attr.get(cls)) is not None:
+                for attr_name, values in attr_objs.items():
+                    target = attrs.setdefault(attr_name, {})
+                    for value, entries in values.items():
+                        target.setdefault(value, []).extend(entries)
+
+        plain.sort(key=_sort_key)
+        return (
+            tuple(plain),
+            tuple(
+                (attr_name, {value: tuple(sorted(entries, key=_sort_key)) for value, entries in values.items()})
+                for attr_name, values in attrs.items()
+            )
+        )
+
+    def notify_listeners(self, event: Any) -> None:
+        if len(self.listeners) >= INDEX_MIN_LISTENERS:
+            return self._notify_indexed(event)
+
+        for listener in self.listeners:
+            listener.notify_listeners(event)
+        return None
+
+    def _notify_indexed(self, event: Any) -> None:
+        event_class = type(event)
+        try:
+            plain, attrs = self._resolved[event_class]
+        except KeyError:
+            plain, attrs = self._resolved[event_class] = self._resolve(event_class)
+
+        if not attrs:
+            for _, listener in plain:
+                listener.notify_listeners(event)
+            return None
+
+        selected: list[_ENTRY] = list(plain)
+        for attr_name, values in attrs:
+            try:
+                entries = values.get(getattr(event, attr_name, None))
+            except TypeError:
+                # value of the event is not hashable -> we have to check all listeners
+                for entries in values.values():
+                    selected.extend(entries)
+                continue
+
+            if entries is not None:
+                selected.extend(entries)
+
+        # keep the order in which the listeners were added
+        if len(selected) > len(plain):
+            selected.sort(key=_sort_key)
+
+        for _, listener in selected:
+            listener.notify_listeners(event)
+        return None
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+from fnmatch import fnmatchcase
+from typing import TYPE_CHECKING, Final
+
+from typing_extensions import Self
+
+
+if TYPE_CHECKING:
+    from .base_listener import EventBusBaseListener
+
+
+LEVEL_SEPARATOR: Final = '/'
+LEVEL_SINGLE: Final = '+'
+LEVEL_MULTI: Final = '#'
+GLOB_CHARS: Final = frozenset('*?[')
+
+
+class TopicPattern(str):
+    """A topic pattern which can be used to listen to multiple topics with one listener.
+    The topic is split into levels with ``/``.
+
+    - ``+`` matches exactly one level, e.g. ``zigbee2mqtt/+/state``
+    - ``#`` matches any amount of levels and has to be the last level, e.g. ``zigbee2mqtt/#``
+    - Unix shell-style wildcards (``*``, ``?``, ``[seq]``) match within a level, e.g. ``Light_*``
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, pattern: str) -> Self:
+        if not isinstance(pattern, str) or not pattern:
+            msg = f'Pattern must be a non empty string! Got {pattern!r}'
+            raise ValueError(msg)
+
+        levels = pattern.split(LEVEL_SEPARATOR)
+        for i, level in enumerate(levels):
+            if len(level) > 1 and (LEVEL_SINGLE in level or LEVEL_MULTI in level):
+                msg = f'Wildcards "{LEVEL_SINGLE}" and "{LEVEL_MULTI}" must occupy a whole level: "{pattern:s}"'
+                raise ValueError(msg)
+            if level == LEVEL_MULTI and i != len(levels) - 1:
+                msg = f'Wildcard "{LEVEL_MULTI}" must be the last level: "{pattern:s}"'
+                raise ValueError(msg)
+
+        return super().__new__(cls, pattern)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({super().__repr__()})'
+
+    def matches(self, topic: str) -> bool:
+        """Check if a topic matches the pattern"""
+        trie = TopicTrie()
+        trie.add(self, self)
+        return bool(trie.match(topic))
+
+
+class TopicTrieNode:
+    __slots__ = ('children', 'globs', 'listeners', 'multi', 'single')
+
+    def __init__(self) -> None:
+        self.children: dict[str, TopicTrieNode] = {}
+        self.globs: dict[str, TopicTrieNode] = {}
+        self.single: TopicTrieNode | None = None
+
+        # listeners where the pattern ends on this node and listeners with a multi level wildcard
+        self.listeners: tuple[EventBusBaseListener, ...] = ()
+        self.multi: tuple[EventBusBaseListener, ...] = ()
+
+    def __bool__(self) -> bool:
+        return bool(self.children or self.globs or self.single is not None or self.listeners or self.multi)
+
+    def get_child(self, level: str, *, create: bool) -> TopicTrieNode | None:
+        if level == LEVEL_SINGLE:
+            if self.single is None and create:
+                self.single = TopicTrieNode()
+            return self.single
+
+        container = self.globs if not GLOB_CHARS.isdisjoint(level) else self.children
+        if (node := container.get(level)) is None and create:
+            node = container[level] = TopicTrieNode()
+        return node
+
+    def remove_child(self, level: str) -> None:
+        if level == LEVEL_SINGLE:
+            self.single = None
+            return None
+
+        container = self.globs if not GLOB_CHARS.isdisjoint(level) else self.children
+        container.pop(level, None)
+        return None
+
+    def match(self, levels: list[str], pos: int, found: list[EventBusBaseListener]) -> None:
+        # multi level wildcard also matches the parent level
+        found.extend(self.multi)
+
+        if pos >= len(levels):
+            found.extend(self.listeners)
+            return None
+
+        level = levels[pos]
+        pos += 1
+
+        if (node := self.children.get(level)) is not None:
+            node.match(levels, pos, found)
+        if (node := self.single) is not None:
+            node.match(levels, pos, found)
+        for glob, node in self.globs.items():
+            if fnmatchcase(level, glob):
+                node.match(levels, pos, found)
+        return None
+
+
+class TopicTrie:
+    """Trie of topic patterns. Matching a topic is proportional to the amount of levels of the topic."""
+
+    __slots__ = ('_counter', '_order', '_root')
+
+    def __init__(self) -> None:
+        self._root = TopicTrieNode()
+        self._order: dict[EventBusBaseListener, int] = {}
+        self._counter = 0
+
+    def __bool__(self) -> bool:
+        return bool(self._order)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __contains__(self, listener: EventBusBaseListener) -> bool:
+        return listener in self._order
+
+    def add(self, pattern: TopicPattern, listener: EventBusBaseListener) -> None:
+        node = self._root
+        for level in pattern.split(LEVEL_SEPARATOR):
+            if level == LEVEL_MULTI:
+                node.multi += (listener,)
+                break
+            node = node.get_child(level, create=True)
+        else:
+            node.listeners += (listener,)
+
+        # insertion order is used to sort the matches
+        self._order[listener] = self._counter
+        self._counter += 1
+
+    def remove(self, pattern: TopicPattern, listener: EventBusBaseListener) -> None:
+        path: list[tuple[TopicTrieNode, str]] = []
+        node = self._root
+        for level in pattern.split(LEVEL_SEPARATOR):
+            if level == LEVEL_MULTI:
+                node.multi = tuple(o for o in node.multi if o is not listener)
+                break
+            if (child := node.get_child(level, create=False)) is None:
+                return None
+            path.append((node, level))
+            node = child
+        else:
+            node.listeners = tuple(o for o in node.listeners if o is not listener)
+
+        self._order.pop(listener, None)
+
+        # remove empty nodes
+        for parent, level in reversed(path):
+            if parent.get_child(level, create=False):
+                break
+            parent.remove_child(level)
+        return None
+
+    def match(self, topic: str) -> tuple[EventBusBaseListener, ...]:
+        found: list[EventBusBaseListener] = []
+        self._root.match(topic.split(LEVEL_SEPARATOR), 0, found)
+
+        if len(found) > 1:
+            order = self._order
+            found.sort(key=order.__getitem__)
+        return tuple(found)
+
+    def clear(self) -> None:
+        self._root = TopicTrieNode()
+        self._order.clear()
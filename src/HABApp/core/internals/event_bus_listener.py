@@ -1,9 +1,11 @@
+from datetime import timedelta
 from typing import Any
 
 from typing_extensions import override
 
 from HABApp.core.internals import AutoContextBoundObj, EventFilterBase, uses_event_bus
 from HABApp.core.internals.event_bus import EventBusBaseListener
+from HABApp.core.internals.event_coalescer import EventCoalescer
 from HABApp.core.internals.wrapped_function import WrappedFunctionBase
 
 
@@ -11,23 +13,36 @@ event_bus = uses_event_bus()
 
 
 class EventBusListener(EventBusBaseListener):
-    def __init__(self, topic: str, callback: WrappedFunctionBase, event_filter: EventFilterBase, **kwargs: Any) -> None:
+    def __init__(self, topic: str, callback: WrappedFunctionBase, event_filter: EventFilterBase,
+                 *, coalesce: timedelta | float | None = None, coalesce_batch: bool = False, **kwargs: Any) -> None:
         super().__init__(topic, **kwargs)
 
         assert isinstance(callback, WrappedFunctionBase)
         self.func: WrappedFunctionBase = callback
         self.filter: EventFilterBase = event_filter
+        self.coalescer: EventCoalescer | None = \
+            None if coalesce is None else EventCoalescer(callback, coalesce, batch=coalesce_batch)
 
     def notify_listeners(self, event: Any) -> None:
         if self.filter.trigger(event):
-            self.func.run(event)
+            if self.coalescer is None:
+                self.func.run(event)
+            else:
+                self.coalescer.add(event)
 
     def describe(self) -> str:
-        return f'"{self.topic}" (filter={self.filter.describe()})'
+        if self.coalescer is None:
+            return f'"{self.topic}" (filter={self.filter.describe()})'
+        return f'"{self.topic}" (filter={self.filter.describe()}, {self.coalescer.describe()})'
+
+    def get_index_key(self) -> tuple[type, str | None, Any] | None:
+        return self.filter.get_index_key()
 
     def cancel(self) -> None:
         """Stop listening on the event bus"""
         event_bus.remove_listener(self)
+        if self.coalescer is not None:
+            self.coalescer.cancel()
 
 
 class ContextBoundEventBusListener(EventBusListener, AutoContextBoundObj):
@@ -35,6 +50,8 @@ class ContextBoundEventBusListener(EventBusListener, AutoContextBoundObj):
     @override
     def _ctx_unlink(self):
         event_bus.remove_listener(self)
+        if self.coalescer is not None:
+            self.coalescer.cancel()
         return super()._ctx_unlink()
 
     @override
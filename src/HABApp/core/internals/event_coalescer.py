@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from asyncio import sleep
+from datetime import timedelta
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Final
+
+from HABApp.core.asyncio import create_task
+
+
+if TYPE_CHECKING:
+    from asyncio import Future
+
+    from HABApp.core.internals.wrapped_function import WrappedFunctionBase
+
+
+class EventCoalescer:
+    """Coalesces the events of a listener. The first event starts a time window,
+    when the window has passed the callback is called with the latest event (or a list of all events).
+    Events which are received while the callback is still running are delivered once it has finished.
+    """
+
+    __slots__ = ('_events', '_lock', '_task', 'batch', 'delivered', 'func', 'received', 'window')
+
+    def __init__(self, func: WrappedFunctionBase, window: timedelta | float, *, batch: bool = False) -> None:
+        if isinstance(window, timedelta):
+            window = window.total_seconds()
+        if not isinstance(window, (int, float)) or window < 0:
+            msg = f'Coalesce window must be a positive number or timedelta! Got {window!r}'
+            raise ValueError(msg)
+
+        self.func: Final = func
+        self.window: Final[float] = window
+        self.batch: Final = batch
+
+        self._lock: Final = Lock()
+        self._events: list[Any] = []
+        self._task: Future | None = None
+
+        # statistics
+        self.received: int = 0
+        self.delivered: int = 0
+
+    def describe(self) -> str:
+        return f'coalesce={self.window:g}s{", batch" if self.batch else ""}'
+
+    def add(self, event: Any) -> None:
+        # Events can be posted from the worker threads
+        with self._lock:
+            self.received += 1
+            if self.batch:
+                self._events.append(event)
+            else:
+                self._events = [event]
+
+            if self._task is not None:
+                return None
+
+            self._task = create_task(self._deliver(), name=f'Coalesce {self.func.name:s}')
+        return None
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._events = []
+            if (task := self._task) is not None:
+                self._task = None
+                task.cancel()
+
+    async def _deliver(self) -> None:
+        while True:
+            if self.window:
+                await sleep(self.window)
+
+            with self._lock:
+                events = self._events
+                self._events = []
+                if not events:
+                    self._task = None
+                    return None
+                self.delivered += 1
+
+            # the next events are collected while the callback is running
+            await self.func.async_run(events if self.batch else events[-1])
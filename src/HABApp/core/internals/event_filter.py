@@ -8,5 +8,10 @@ class EventFilterBase:
     def describe(self) -> str:
         raise NotImplementedError()
 
+    def get_index_key(self) -> tuple[type, str | None, Any] | None:
+        """Return (event class, attribute name, attribute value) if the filter only triggers on instances of
+        the event class (with the attribute value). This is used to build the listener index of the event bus."""
+        return None
+
     def __repr__(self) -> str:
         return f'<{self.describe()} at 0x{id(self):X}>'
@@ -3,3 +3,4 @@ from .item_registry_item import ItemRegistryItem
 # isort: split
 
 from .item_registry import ItemRegistry
+from .item_query import ItemRegistryQuery
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping
+from re import Pattern
+from typing import TYPE_CHECKING, Final
+
+
+if TYPE_CHECKING:
+    from .item_registry import ItemRegistry
+    from .item_registry_item import ItemRegistryItem
+
+
+# noinspection PyProtectedMember
+class ItemRegistryQuery:
+    """Search for items in the item registry. The candidates are taken from the secondary indexes of the registry
+    and are cached until the item registry changes, so a query object should be reused.
+    The function filter is not cached because it can depend on values which don't change the registry
+    (e.g. the metadata value of an item), so it's applied every time.
+
+    :param type: item has to be an instance of this class
+    :param name: regex that is used to search the name
+    :param index: index name -> values, the item must have all values, e.g. ``{'tags': ('tag1', 'tag2')}``
+    :param index_pattern: index name -> regex, the item must have at least one value that matches the regex
+    :param func: function which is called with the item and returns ``True`` if the item matches
+    """
+
+    def __init__(self, type: type | tuple[type, ...] | None = None, name: Pattern[str] | None = None,
+                 index: Mapping[str, Iterable[str]] | None = None,
+                 index_pattern: Mapping[str, Pattern[str]] | None = None,
+                 func: Callable[[ItemRegistryItem], bool] | None = None) -> None:
+        self.type: Final = type
+        self.name: Final = name
+        self.index: Final = {k: frozenset(v) for k, v in index.items()} if index else {}
+        self.index_pattern: Final = dict(index_pattern) if index_pattern else {}
+        self.func: Final = func
+
+        self._cache_registry: ItemRegistry | None = None
+        self._cache_version: int = -1
+        self._cache: tuple[ItemRegistryItem, ...] = ()
+
+    def get_items(self, registry: ItemRegistry) -> tuple[ItemRegistryItem, ...]:
+        """Return the matching items in the order they were added to the registry"""
+        if self._cache_registry is not registry or self._cache_version != registry._version:
+            with registry._lock:
+                version = registry._version
+                ret = self._search(registry)
+
+            self._cache_registry = registry
+            self._cache_version = version
+            self._cache = ret
+
+        if (func := self.func) is not None:
+            return tuple(item for item in self._cache if func(item))
+        return self._cache
+
+    def _search(self, registry: ItemRegistry) -> tuple[ItemRegistryItem, ...]:
+        candidates: list[Mapping[str, ItemRegistryItem]] = []
+
+        for index_name, values in self.index.items():
+            index = registry._indexes.get(index_name, {})
+            candidates.extend(index.get(value, {}) for value in values)
+
+        for index_name, pattern in self.index_pattern.items():
+            matches: dict[str, ItemRegistryItem] = {}
+            for value, items in registry._indexes.get(index_name, {}).items():
+                if pattern.search(value):
+                    matches.update(items)
+            candidates.append(matches)
+
+        if (_type := self.type) is not None:
+            matches = {}
+            for cls, items in registry._by_class.items():
+                if issubclass(cls, _type):
+                    matches.update(items)
+            candidates.append(matches)
+
+        if not candidates:
+            items: Iterable[ItemRegistryItem] = registry._items.values()
+        else:
+            smallest = min(candidates, key=len)
+            others = [c for c in candidates if c is not smallest]
+            items = [item for name, item in smallest.items() if all(name in c for c in others)]
+            items.sort(key=registry._get_position)
+
+        if (name := self.name) is not None:
+            items = [item for item in items if name.search(item.name)]
+        return tuple(items)
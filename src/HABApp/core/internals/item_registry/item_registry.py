@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 import threading
+from itertools import count
 from typing import Final, TypeVar, overload
 
 from HABApp.core.errors import ItemAlreadyExistsError, ItemNotFoundException
@@ -19,6 +20,21 @@ class ItemRegistry:
         self._lock = threading.Lock()
         self._items: Final[dict[str, ItemRegistryItem]] = {}
 
+        # Secondary indexes which are used to search items
+        self._version: int = 0
+        self._seq: Final = count()
+        self._positions: Final[dict[str, int]] = {}
+        self._by_class: Final[dict[type, dict[str, ItemRegistryItem]]] = {}
+        # index name -> index value -> item name -> item
+        self._indexes: Final[dict[str, dict[str, dict[str, ItemRegistryItem]]]] = {}
+        # item name -> index name -> index values
+        self._indexed: Final[dict[str, dict[str, frozenset[str]]]] = {}
+
+    @property
+    def version(self) -> int:
+        """Incremented every time an item is added, removed or reindexed"""
+        return self._version
+
     def item_exists(self, name: str | ItemRegistryItem) -> bool:
         if not isinstance(name, str):
             name = name.name
@@ -54,6 +70,10 @@ class ItemRegistry:
                 raise ItemAlreadyExistsError(name)
 
             self._items[name] = item
+            self._positions[name] = next(self._seq)
+            self._by_class.setdefault(item.__class__, {})[name] = item
+            self._index_add(item)
+            self._version += 1
 
         log.debug(f'Added {name} ({item.__class__.__name__})')
         item._on_item_added()
@@ -77,10 +97,64 @@ class ItemRegistry:
             except KeyError:
                 raise ItemNotFoundException(name) from None
 
+            self._positions.pop(name)
+            by_class = self._by_class[item.__class__]
+            by_class.pop(name)
+            if not by_class:
+                self._by_class.pop(item.__class__)
+            self._index_remove(name)
+            self._version += 1
+
         log.debug(f'Removed {name} ({item.__class__.__name__})')
         item._on_item_removed()
         return item
 
+    def update_index(self, item: ItemRegistryItem) -> None:
+        """Update the secondary indexes of an item, e.g. because the tags have changed.
+        Does nothing if the item is not in the registry.
+        """
+        with self._lock:
+            if self._items.get(item.name) is not item:
+                return None
+
+            # only invalidate the queries if something changed
+            new = {k: frozenset(v) for k, v in (item._get_registry_index() or {}).items()}
+            if {k: v for k, v in new.items() if v} == self._indexed.get(item.name, {}):
+                return None
+
+            self._index_remove(item.name)
+            self._index_add(item)
+            self._version += 1
+
+    def _index_add(self, item: ItemRegistryItem) -> None:
+        if not (index := item._get_registry_index()):
+            return None
+
+        name = item.name
+        indexed = {}
+        for index_name, values in index.items():
+            if not (values := frozenset(values)):
+                continue
+            indexed[index_name] = values
+            obj = self._indexes.setdefault(index_name, {})
+            for value in values:
+                obj.setdefault(value, {})[name] = item
+
+        if indexed:
+            self._indexed[name] = indexed
+
+    def _index_remove(self, name: str) -> None:
+        for index_name, values in self._indexed.pop(name, {}).items():
+            obj = self._indexes[index_name]
+            for value in values:
+                items = obj[value]
+                items.pop(name)
+                if not items:
+                    obj.pop(value)
+
+    def _get_position(self, item: ItemRegistryItem) -> int:
+        return self._positions[item.name]
+
     def __bool__(self) -> bool:
         return bool(self._items)
 
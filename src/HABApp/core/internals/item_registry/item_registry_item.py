@@ -1,3 +1,6 @@
+from collections.abc import Iterable, Mapping
+
+
 class ItemRegistryItem:
     """ItemRegistryItem, all items that will be stored in the Item Registry must inherit from this
     """
@@ -25,3 +28,8 @@ class ItemRegistryItem:
         """This function gets automatically called when the item was removed from the item registry
         """
         raise NotImplementedError()
+
+    def _get_registry_index(self) -> Mapping[str, Iterable[str]] | None:
+        """Return the values for the secondary indexes of the item registry, e.g. ``{'tags': ('tag1', )}``
+        """
+        return None
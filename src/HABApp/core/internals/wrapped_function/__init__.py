@@ -3,4 +3,5 @@ from HABApp.core.internals.wrapped_function.base import WrappedFunctionBase
 
 # isort: split
 
+from HABApp.core.internals.wrapped_function.wrapped_thread import get_thread_pool_metrics, thread_partition
 from HABApp.core.internals.wrapped_function.wrapper import wrap_func
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass
+from math import inf
+from typing import Final
+
+
+# Upper bounds of the histogram buckets in seconds, the last bucket catches everything else
+HISTOGRAM_BUCKETS: Final = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, inf)
+
+
+@dataclass(frozen=True)
+class HistogramInfo:
+    count: int                  #: Amount of values
+    total: float                #: Sum of all values
+    max: float                  #: Highest value
+    buckets: dict[float, int]   #: Upper bound of the bucket (in seconds) -> amount of values
+
+    @property
+    def avg(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+@dataclass(frozen=True)
+class ThreadPoolMetrics:
+    threads: int                            #: Configured amount of threads
+    peak_concurrency: int                   #: Highest amount of concurrently running functions
+    queue_wait: HistogramInfo               #: Time between submission and start of the execution
+    run_time: HistogramInfo                 #: Execution time of all functions
+    callbacks: dict[str, HistogramInfo]     #: Execution time per function
+
+    def get_summary(self, top: int = 5) -> list[str]:
+        """Return a human-readable summary
+
+        :param top: amount of functions with the highest total run time that will be included
+        """
+        wait = self.queue_wait
+        run = self.run_time
+        wait_slow = sum(v for k, v in wait.buckets.items() if k > 0.05)  # noqa: PLR2004
+
+        lines = [
+            f'Thread pool: {self.threads:d} threads, peak concurrency: {self.peak_concurrency:d}, runs: {run.count:d}',
+            f'  Queue wait: avg {wait.avg:.3f}s, max {wait.max:.3f}s, > 50ms: {wait_slow:d}',
+            f'  Run time  : avg {run.avg:.3f}s, max {run.max:.3f}s',
+        ]
+
+        callbacks = sorted(self.callbacks.items(), key=lambda x: x[1].total, reverse=True)[:top]
+        if callbacks:
+            width = max(len(name) for name, _ in callbacks)
+            lines.append('  Functions with the highest total run time:')
+            lines.extend(
+                f'    {name:{width}s}: runs {info.count:d}, total {info.total:.3f}s, '
+                f'avg {info.avg:.3f}s, max {info.max:.3f}s' for name, info in callbacks
+            )
+        return lines
+
+
+class Histogram:
+    __slots__ = ('buckets', 'count', 'max', 'total')
+
+    def __init__(self) -> None:
+        self.buckets: Final = [0] * len(HISTOGRAM_BUCKETS)
+        self.count: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+
+    def add(self, value: float) -> None:
+        self.buckets[bisect_left(HISTOGRAM_BUCKETS, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(value, self.max)
+
+    def merge(self, other: Histogram) -> None:
+        for i, value in enumerate(other.buckets):
+            self.buckets[i] += value
+        self.count += other.count
+        self.total += other.total
+        self.max = max(other.max, self.max)
+
+    def info(self) -> HistogramInfo:
+        return HistogramInfo(
+            count=self.count, total=self.total, max=self.max,
+            buckets=dict(zip(HISTOGRAM_BUCKETS, self.buckets, strict=True))
+        )
+
+
+class WorkerMetrics:
+    """Metrics of a single worker thread. Only the owning thread writes to it, so no lock is required."""
+
+    __slots__ = ('callbacks', 'generation', 'peak_concurrency', 'queue_wait', 'run_time')
+
+    def __init__(self, generation: int) -> None:
+        self.generation: Final = generation
+        self.queue_wait: Final = Histogram()
+        self.run_time: Final = Histogram()
+        self.callbacks: Final[dict[str, Histogram]] = {}
+        self.peak_concurrency: int = 0
+
+    def add_run(self, name: str, dur_start: float, dur_run: float, concurrency: int) -> None:
+        self.queue_wait.add(dur_start)
+        self.run_time.add(dur_run)
+        if (cb := self.callbacks.get(name)) is None:
+            cb = self.callbacks[name] = Histogram()
+        cb.add(dur_run)
+        self.peak_concurrency = max(concurrency, self.peak_concurrency)
+
+
+_LOCAL: Final = threading.local()
+_WORKERS: list[WorkerMetrics] = []
+_GENERATION: int = 0
+
+
+def get_worker_metrics() -> WorkerMetrics:
+    if (metrics := getattr(_LOCAL, 'metrics', None)) is not None and metrics.generation == _GENERATION:
+        return metrics
+
+    _LOCAL.metrics = metrics = WorkerMetrics(_GENERATION)
+    _WORKERS.append(metrics)
+    return metrics
+
+
+def reset_metrics() -> None:
+    global _WORKERS, _GENERATION
+
+    # the threads will create new objects on the next run
+    _GENERATION += 1
+    _WORKERS = []
+
+
+def collect_metrics(threads: int) -> ThreadPoolMetrics:
+    queue_wait = Histogram()
+    run_time = Histogram()
+    callbacks: dict[str, Histogram] = {}
+    peak = 0
+
+    for worker in tuple(_WORKERS):
+        queue_wait.merge(worker.queue_wait)
+        run_time.merge(worker.run_time)
+        peak = max(worker.peak_concurrency, peak)
+        for name, hist in tuple(worker.callbacks.items()):
+            if (obj := callbacks.get(name)) is None:
+                obj = callbacks[name] = Histogram()
+            obj.merge(hist)
+
+    return ThreadPoolMetrics(
+        threads=threads, peak_concurrency=peak, queue_wait=queue_wait.info(), run_time=run_time.info(),
+        callbacks={name: hist.info() for name, hist in callbacks.items()}
+    )
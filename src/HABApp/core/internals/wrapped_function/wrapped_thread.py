@@ -1,23 +1,31 @@
 from __future__ import annotations
 
 from concurrent.futures import ThreadPoolExecutor
-from threading import Lock
 from time import monotonic
-from typing import TYPE_CHECKING, Any, Final
+from typing import TYPE_CHECKING, Any, Final, TypeVar
 
 from typing_extensions import override
 
 from HABApp.core.asyncio import run_func_from_async, thread_context
 from HABApp.core.const import loop
+from HABApp.core.events.events import ValueCommandEvent
 from HABApp.core.internals import Context, ContextProvidingObj
 from HABApp.core.internals.wrapped_function.base import P, R, WrappedFunctionBase, default_logger
+from HABApp.core.internals.wrapped_function.pool_metrics import (
+    ThreadPoolMetrics,
+    collect_metrics,
+    get_worker_metrics,
+    reset_metrics,
+)
 
 
 if TYPE_CHECKING:
     import logging
-    from collections.abc import Callable
+    from collections.abc import Callable, Mapping
 
 
+T = TypeVar('T')
+
 POOL: ThreadPoolExecutor | None = None
 POOL_THREADS: int = 0
 
@@ -26,22 +34,88 @@ def _initialize_thread() -> None:
     thread_context.set('HABAppWorker')
 
 
-def create_thread_pool(count: int) -> None:
-    global POOL, POOL_THREADS
+class ThreadPoolPartition:
+    __slots__ = ('executor', 'name', 'running', 'threads')
+
+    def __init__(self, name: str, threads: int) -> None:
+        if not isinstance(threads, int) or threads <= 0:
+            msg = f'Thread count of partition "{name:s}" must be a positive integer'
+            raise ValueError(msg)
+
+        self.name: Final = name
+        self.threads: Final = threads
+        self.running: Final[set[PoolFunc]] = set()
+        self.executor: Final = ThreadPoolExecutor(threads, f'HabAppWorker_{name:s}', initializer=_initialize_thread)
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} {self.name:s} threads: {self.threads:d}>'
+
+
+# Callbacks which are triggered by a command event run in the priority partition
+PRIORITY_PARTITION: ThreadPoolPartition | None = None
+PARTITIONS: dict[str, ThreadPoolPartition] = {}
+
+PARTITION_ATTR: Final = '_habapp_thread_partition'
+
+
+def thread_partition(name: str) -> Callable[[T], T]:
+    """Run the decorated function in the thread pool partition with the given name.
+    If the partition is not configured the function runs in the default thread pool.
+
+    :param name: name of the partition
+    """
+    if not isinstance(name, str) or not name:
+        msg = f'Partition name must be a non empty string! Got {name!r}'
+        raise ValueError(msg)
+
+    def decorator(func: T) -> T:
+        setattr(func, PARTITION_ATTR, name)
+        return func
+    return decorator
+
+
+def get_thread_partition_name(func: Callable) -> str | None:
+    name = getattr(func, PARTITION_ATTR, None)
+    return name if isinstance(name, str) else None
+
+
+def create_thread_pool(count: int, *, priority_threads: int = 0, partitions: Mapping[str, int] | None = None) -> None:
+    global POOL, POOL_THREADS, PRIORITY_PARTITION
 
     if not isinstance(count, int) or count <= 0:
         msg = 'Thread count must be a positive integer'
         raise ValueError(msg)
+    if not isinstance(priority_threads, int) or priority_threads < 0:
+        msg = 'Priority thread count must be an integer >= 0'
+        raise ValueError(msg)
 
     default_logger.debug(f'Starting thread pool with {count:d} threads!')
 
     stop_thread_pool()
+    reset_metrics()
     POOL_THREADS = count
     POOL = ThreadPoolExecutor(count, 'HabAppWorker', initializer=_initialize_thread)
 
+    if priority_threads:
+        default_logger.debug(f'Starting priority partition with {priority_threads:d} threads!')
+        PRIORITY_PARTITION = ThreadPoolPartition('priority', priority_threads)
+
+    for name, threads in (partitions or {}).items():
+        default_logger.debug(f'Starting partition "{name:s}" with {threads:d} threads!')
+        PARTITIONS[name] = ThreadPoolPartition(name, threads)
+
 
 def stop_thread_pool() -> None:
-    global POOL, POOL_THREADS
+    global POOL, POOL_THREADS, PRIORITY_PARTITION
+
+    partitions = list(PARTITIONS.values())
+    PARTITIONS.clear()
+    if PRIORITY_PARTITION is not None:
+        partitions.append(PRIORITY_PARTITION)
+        PRIORITY_PARTITION = None
+
+    for partition in partitions:
+        partition.executor.shutdown()
 
     if (pool := POOL) is None:
         return None
@@ -53,15 +127,26 @@ def stop_thread_pool() -> None:
     default_logger.debug('Thread pool stopped!')
 
 
+def get_thread_pool_metrics() -> ThreadPoolMetrics:
+    """Return the metrics of the thread pool (queue wait, run time per function and peak concurrency).
+    The metrics include the priority threads and the threads of all partitions."""
+    threads = POOL_THREADS + sum(p.threads for p in PARTITIONS.values())
+    if PRIORITY_PARTITION is not None:
+        threads += PRIORITY_PARTITION.threads
+    return collect_metrics(threads)
+
+
+# Functions which are currently running. Adding and removing is atomic, so we don't need a lock
 POOL_INFO: Final[set[PoolFunc]] = set()
-POOL_LOCK: Final = Lock()
 
 
 class PoolFunc(ContextProvidingObj):
     def __init__(self, parent: WrappedThreadFunction, func_obj: Callable[..., Any], func_args: tuple[Any, ...],
-                 func_kwargs: dict[str, Any], context: Context | None = None, **kwargs: Any) -> None:
+                 func_kwargs: dict[str, Any], context: Context | None = None,
+                 partition: ThreadPoolPartition | None = None, **kwargs: Any) -> None:
         super().__init__(context=context, **kwargs)
         self.parent: Final = parent
+        self.partition: Final = partition
         self.func_obj: Final = func_obj
         self.func_args: Final = func_args
         self.func_kwargs: Final = func_kwargs
@@ -75,26 +160,30 @@ class PoolFunc(ContextProvidingObj):
         self.usage_high: int = 0
 
     def __repr__(self) -> str:
-        return f'<{self.__class__.__name__} high: {self.usage_high:d}/{POOL_THREADS:d}>'
+        threads = POOL_THREADS if self.partition is None else self.partition.threads
+        return f'<{self.__class__.__name__} high: {self.usage_high:d}/{threads:d}>'
 
     def run(self) -> Any:
-        pool_lock: Final = POOL_LOCK
-        pool_info: Final = POOL_INFO
         parent = self.parent
+        if (partition := self.partition) is None:
+            pool_info = POOL_INFO
+            pool_threads = POOL_THREADS
+            pool_name = ''
+        else:
+            pool_info = partition.running
+            pool_threads = partition.threads
+            pool_name = f' in partition "{partition.name:s}"'
 
         try:
             ts_start = monotonic()
             self.dur_start = ts_start - self.submitted
 
-            with pool_lock:
-                pool_info.add(self)
-                count = len(pool_info)
-                for info in pool_info:
-                    info.usage_high = max(count, info.usage_high)
+            pool_info.add(self)
+            self.usage_high = len(pool_info)
 
             # notify if we don't process quickly
             if self.dur_start > 0.05:
-                parent.log.warning(f'Starting of {parent.name} took too long: {self.dur_start:.2f}s. '
+                parent.log.warning(f'Starting of {parent.name}{pool_name} took too long: {self.dur_start:.2f}s. '
                                    f'Maybe there are not enough threads?')
 
             # Profiler does not work
@@ -105,12 +194,16 @@ class PoolFunc(ContextProvidingObj):
 
             # log warning if execution takes too long
             self.dur_run = monotonic() - ts_start
+            # concurrency is only sampled at start and end, so there is no work for the other running functions
+            self.usage_high = max(len(pool_info), self.usage_high)
 
-            if parent.warn_too_long and self.dur_run > 0.8 and self.usage_high >= POOL_THREADS * 0.6:
-                parent.log.warning(f'{self.usage_high}/{POOL_THREADS} threads have been in use and '
+            if parent.warn_too_long and self.dur_run > 0.8 and self.usage_high >= pool_threads * 0.6:
+                parent.log.warning(f'{self.usage_high}/{pool_threads} threads{pool_name} have been in use and '
                                    f'execution of {parent.name} took too long: {self.dur_run:.2f}s')
 
         except Exception as e:
+            self.dur_run = monotonic() - ts_start
+
             # Process and dump the exception traceback from a coroutine.
             # That way we effectively serialize the logged tracebacks in case two exceptions happen at once
             run_func_from_async(self.parent.process_exception, e, *self.func_args, **self.func_kwargs)
@@ -118,8 +211,8 @@ class PoolFunc(ContextProvidingObj):
         else:
             return ret
         finally:
-            with pool_lock:
-                pool_info.discard(self)
+            pool_info.discard(self)
+            get_worker_metrics().add_run(parent.name, self.dur_start, self.dur_run, self.usage_high)
 
 
 class WrappedThreadFunction(WrappedFunctionBase[P, R]):
@@ -128,22 +221,43 @@ class WrappedThreadFunction(WrappedFunctionBase[P, R]):
                  warn_too_long: bool = True,
                  name: str | None = None,
                  logger: logging.Logger | None = None,
-                 context: Context | None = None) -> None:
+                 context: Context | None = None,
+                 partition: str | None = None) -> None:
 
         super().__init__(name=name, func=func, logger=logger, context=context)
 
         self.func: Final = func
         self.warn_too_long: Final = warn_too_long
 
+        # The decorator has priority over the partition of the context (e.g. the partition of the rule file)
+        if partition is None:
+            partition = get_thread_partition_name(func)
+        if partition is None and self._habapp_ctx is not None:
+            partition = self._habapp_ctx.get_thread_partition()
+        if partition is not None and POOL is not None and partition not in PARTITIONS:
+            self.log.warning(f'Thread pool partition "{partition:s}" for {self.name:s} is not configured! '
+                             f'Using the default thread pool.')
+        self.partition: Final = partition
+
+    def _get_partition(self, args: tuple[Any, ...]) -> ThreadPoolPartition | None:
+        if (priority := PRIORITY_PARTITION) is not None and args and isinstance(args[0], ValueCommandEvent):
+            return priority
+        if (name := self.partition) is None:
+            return None
+        return PARTITIONS.get(name)
+
     @override
     def run(self, *args: P.args, **kwargs: P.kwargs) -> None:
+        partition = self._get_partition(args)
+
         # we need to copy the context, so it's available when the function is run
-        pool_func = PoolFunc(self, self.func, args, kwargs, context=self._habapp_ctx)
-        POOL.submit(pool_func.run)
+        pool_func = PoolFunc(self, self.func, args, kwargs, context=self._habapp_ctx, partition=partition)
+        (POOL if partition is None else partition.executor).submit(pool_func.run)
         return None
 
     @override
     async def async_run(self, *args: P.args, **kwargs: P.kwargs) -> R | None:
+        partition = self._get_partition(args)
 
-        pool_func = PoolFunc(self, self.func, args, kwargs, context=self._habapp_ctx)
-        return await loop.run_in_executor(POOL, pool_func.run)
+        pool_func = PoolFunc(self, self.func, args, kwargs, context=self._habapp_ctx, partition=partition)
+        return await loop.run_in_executor(POOL if partition is None else partition.executor, pool_func.run)
@@ -1,19 +1,21 @@
 import logging
-from asyncio import iscoroutinefunction
+from asyncio import iscoroutinefunction, sleep
 from collections.abc import Callable, Coroutine
 from typing import Any
 
 from HABApp.config import CONFIG
 from HABApp.core import shutdown
 from HABApp.core.internals import Context
-from HABApp.core.internals.wrapped_function.base import P, R, WrappedFunctionBase
+from HABApp.core.internals.wrapped_function.base import P, R, WrappedFunctionBase, default_logger
 from HABApp.core.internals.wrapped_function.wrapped_async import WrappedAsyncFunction
 from HABApp.core.internals.wrapped_function.wrapped_sync import WrappedSyncFunction
 from HABApp.core.internals.wrapped_function.wrapped_thread import (
     WrappedThreadFunction,
     create_thread_pool,
+    get_thread_pool_metrics,
     stop_thread_pool,
 )
+from HABApp.core.lib import SingleTask
 
 
 def wrap_func(func: Callable[P, R] | Callable[P, Coroutine[Any, Any, R]],
@@ -43,9 +45,21 @@ def wrap_func(func: Callable[P, R] | Callable[P, Coroutine[Any, Any, R]],
 SYNC_CLS: type[WrappedThreadFunction] | type[WrappedSyncFunction]
 
 
+async def log_metrics() -> None:
+    while (interval := THREAD_POOL.log_metrics.total_seconds()) > 0:
+        await sleep(interval)
+        for line in get_thread_pool_metrics().get_summary():
+            default_logger.info(line)
+
+
+LOG_METRICS_TASK = SingleTask(log_metrics, 'LogThreadPoolMetrics')
+
+
 def setup() -> None:
     global SYNC_CLS
 
+    LOG_METRICS_TASK.cancel()
+
     if not THREAD_POOL.enabled:
         SYNC_CLS = WrappedSyncFunction
 
@@ -56,10 +70,17 @@ def setup() -> None:
     SYNC_CLS = WrappedThreadFunction
 
     # create thread pool
-    create_thread_pool(THREAD_POOL.threads)
+    create_thread_pool(
+        THREAD_POOL.threads, priority_threads=THREAD_POOL.priority_threads,
+        partitions={name: cfg.threads for name, cfg in THREAD_POOL.partitions.items()}
+    )
+
+    if THREAD_POOL.log_metrics.total_seconds() > 0:
+        LOG_METRICS_TASK.start()
 
     # this function can be called multiple times, so it's no problem if we register it more than once!
     shutdown.register(stop_thread_pool, msg='Stopping thread pool', last=True)
+    shutdown.register(LOG_METRICS_TASK.cancel, msg='Stopping thread pool metrics log')
 
 
 THREAD_POOL = CONFIG.habapp.thread_pool
@@ -1,9 +1,11 @@
 import logging
-from typing import Generic, TypeVar
+from threading import Lock, get_ident
+from typing import Final, Generic, TypeVar
 
 from whenever import Instant
 
-from HABApp.core.asyncio import run_func_from_async
+from HABApp.core.asyncio import thread_ident
+from HABApp.core.const import loop
 from HABApp.core.items.base_item_watch import BaseWatch, ItemNoChangeWatch, ItemNoUpdateWatch
 
 
@@ -12,6 +14,36 @@ log = logging.getLogger('HABApp')
 WATCH_OBJ = TypeVar('WATCH_OBJ', bound=BaseWatch)
 
 
+# Watches of all items that were set are rescheduled once per loop iteration
+_SCHEDULE_LOCK: Final = Lock()
+_SCHEDULE_PENDING: dict['ItemTimes', None] = {}
+
+
+def _schedule_watches(obj: 'ItemTimes') -> None:
+    with _SCHEDULE_LOCK:
+        if _SCHEDULE_PENDING:
+            _SCHEDULE_PENDING[obj] = None
+            return None
+        _SCHEDULE_PENDING[obj] = None
+
+    if get_ident() == thread_ident:
+        loop.call_soon(_run_scheduled_watches)
+    else:
+        loop.call_soon_threadsafe(_run_scheduled_watches)
+    return None
+
+
+def _run_scheduled_watches() -> None:
+    global _SCHEDULE_PENDING
+
+    with _SCHEDULE_LOCK:
+        pending = _SCHEDULE_PENDING
+        _SCHEDULE_PENDING = {}
+
+    for obj in pending:
+        obj._schedule_events()
+
+
 class ItemTimes(Generic[WATCH_OBJ]):
     WATCH: type[ItemNoUpdateWatch] | type[ItemNoChangeWatch]
 
@@ -26,7 +58,7 @@ class ItemTimes(Generic[WATCH_OBJ]):
             return
 
         if events:
-            run_func_from_async(self.__async_schedule_events)
+            _schedule_watches(self)
         return None
 
     def add_watch(self, secs: int | float) -> WATCH_OBJ:
@@ -41,7 +73,7 @@ class ItemTimes(Generic[WATCH_OBJ]):
         log.debug(f'Added {self.WATCH.__name__} ({w.fut.secs}s) for {self.name}')
         return w
 
-    def __async_schedule_events(self):
+    def _schedule_events(self):
         canceled = []
         for t in self.tasks:
             if t.fut.is_canceled:
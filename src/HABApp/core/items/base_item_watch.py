@@ -12,7 +12,7 @@ from HABApp.core.internals import (
     uses_post_event,
     wrap_func,
 )
-from HABApp.core.lib import PendingFuture
+from HABApp.core.lib import TIMER_SERVICE
 
 
 if typing.TYPE_CHECKING:
@@ -30,10 +30,11 @@ class BaseWatch(AutoContextBoundObj):
 
     def __init__(self, name: str, secs: int | float) -> None:
         super().__init__()
-        self.fut = PendingFuture(self._post_event, secs)
+        # all watches share one timer service, so a reset only updates the deadline
+        self.fut = TIMER_SERVICE.create_timer(self._post_event, secs)
         self.name: str = name
 
-    async def _post_event(self) -> None:
+    def _post_event(self) -> None:
         post_event(self.name, self.EVENT(self.name, self.fut.secs))
 
     def __cancel_watch(self) -> None:
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import asyncio
-import collections
+import statistics
 import time
 import typing
 from datetime import timedelta
@@ -17,6 +17,7 @@ from HABApp.core.internals import (
     wrap_func,
 )
 from HABApp.core.items import BaseValueItem
+from HABApp.core.lib import ValueHistory
 from HABApp.core.wrapper import process_exception
 
 
@@ -25,6 +26,13 @@ item_registry = uses_item_registry()
 event_bus = uses_event_bus()
 
 
+# These functions are calculated incrementally by the history
+INCREMENTAL_FUNCS: typing.Final[dict[typing.Callable, str]] = {
+    min: 'min', max: 'max', sum: 'sum',
+    statistics.mean: 'mean', statistics.fmean: 'mean', statistics.median: 'median',
+}
+
+
 class AggregationItem(BaseValueItem):
 
     @classmethod
@@ -54,8 +62,7 @@ class AggregationItem(BaseValueItem):
         self.__period: float = 0
         self.__aggregation_func: typing.Callable[[typing.Iterable], typing.Any] = lambda x: x
 
-        self._ts: collections.deque[float] = collections.deque()
-        self._vals: collections.deque[typing.Any] = collections.deque()
+        self._history: ValueHistory = ValueHistory()
 
         self.__listener: EventBusListener | None = None
 
@@ -66,6 +73,8 @@ class AggregationItem(BaseValueItem):
 
         :param func: The function which takes an iterator an returns an aggregated value.
                      Important: the function must be **non blocking**!
+                     ``min``, ``max``, ``sum``, ``statistics.mean`` and ``statistics.median`` are calculated
+                     incrementally for numeric values, so they are cheap even for long periods.
         """
         self.__aggregation_func = func
         return self
@@ -82,9 +91,8 @@ class AggregationItem(BaseValueItem):
         self.__period = period
 
         # Clean old items (e.g. if we made the period shorter)
-        while len(self._ts) > 1 and self._ts[1] + self.__period < time.time():
-            self._ts.popleft()
-            self._vals.popleft()
+        while len(self._history) > 1 and self._history.get_timestamp(1) + self.__period < time.time():
+            self._history.popleft()
 
         return self
 
@@ -122,8 +130,8 @@ class AggregationItem(BaseValueItem):
 
     async def __update_task(self):
         try:
-            while len(self._ts) > 1:
-                ts = self._ts[1]
+            while len(self._history) > 1:
+                ts = self._history.get_timestamp(1)
                 now = time.time()
 
                 left = (ts + self.__period) - now
@@ -133,12 +141,11 @@ class AggregationItem(BaseValueItem):
                     now = time.time()
                     left = (ts + self.__period) - now
 
-                self._ts.popleft()
-                self._vals.popleft()
+                self._history.popleft()
 
                 # old entries are removed -> now do the aggregation
                 try:
-                    val = self.__aggregation_func(self._vals)
+                    val = self._aggregate()
                 except Exception as e:
                     process_exception(self.__aggregation_func, e)
                     continue
@@ -150,15 +157,20 @@ class AggregationItem(BaseValueItem):
             self.__task = None
         return None
 
+    def _aggregate(self) -> typing.Any:
+        func = self.__aggregation_func
+        if self._history.numeric and (name := INCREMENTAL_FUNCS.get(func)) is not None:
+            return getattr(self._history, name)
+        return func(self._history)
+
     async def _add_value(self, event: ValueChangeEvent):
-        self._ts.append(time.time())
-        self._vals.append(event.value)
+        self._history.append(event.value, time.time())
 
         if self.__task is None:
             self.__task = asyncio.create_task(self.__update_task())
 
         try:
-            val = self.__aggregation_func(self._vals)
+            val = self._aggregate()
         except Exception as e:
             process_exception(self.__aggregation_func, e)
             return None
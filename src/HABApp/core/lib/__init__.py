@@ -1,8 +1,11 @@
 from .exceptions import HINT_EXCEPTION, format_exception
 from .helper import get_obj_name
 from .instant_view import InstantView
+from .outgoing_queue import OutgoingQueue, OutgoingQueueStats
 from .pending_future import PendingFuture
 from .priority_list import PriorityList
 from .single_task import SingleTask
 from .timeout import Timeout, TimeoutNotRunningError
+from .timer_service import TIMER_SERVICE, SharedTimer, TimerService, TimerServiceStats
 from .value_change import ValueChange
+from .value_history import ValueHistory
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import re
+from typing import Final
+
+
+# Characters that are relevant for the structure of the document
+_RE_STRUCTURE: Final = re.compile(rb'[\[\]{}",]')
+# Characters that end or escape inside a string
+_RE_STRING: Final = re.compile(rb'["\\]')
+
+_QUOTE: Final = ord('"')
+_BACKSLASH: Final = ord('\\')
+_ARRAY_START: Final = ord('[')
+_OPEN: Final = b'[{'
+_CLOSE: Final = b']}'
+
+
+def _skip_string(buf: bytearray, pos: int) -> int:
+    # Return the position after the end of the string or -1 if the string is not complete
+    while (m := _RE_STRING.search(buf, pos)) is not None:
+        end = m.start()
+        if buf[end] != _BACKSLASH:
+            return end + 1
+        # skip the escaped character
+        pos = end + 2
+    return -1
+
+
+class JsonArraySplitter:
+    """Incrementally splits a JSON array into the raw json of its elements.
+    The data can be fed in arbitrary chunks, so the whole document never has to be kept in memory.
+    The elements are not validated, this has to be done by the consumer.
+    """
+
+    __slots__ = ('_buf', '_depth', '_done', '_elem_start', '_pos')
+
+    def __init__(self) -> None:
+        self._buf: Final = bytearray()
+        self._pos = 0
+        self._depth = 0
+        self._elem_start = -1
+        self._done = False
+
+    @property
+    def done(self) -> bool:
+        """True if the end of the array has been reached"""
+        return self._done
+
+    def feed(self, data: bytes) -> list[bytes]:
+        """Process the next chunk of data and return the elements which are complete"""
+        buf = self._buf
+        buf.extend(data)
+
+        elements: list[bytes] = []
+        pos = self._pos
+        depth = self._depth
+        elem_start = self._elem_start
+
+        while not self._done:
+            if (m := _RE_STRUCTURE.search(buf, pos)) is None:
+                pos = len(buf)
+                break
+
+            i = m.start()
+            char = buf[i]
+            pos = i + 1
+
+            if char == _QUOTE:
+                if (pos := _skip_string(buf, pos)) < 0:
+                    # string is not complete -> rescan it with the next chunk
+                    pos = i
+                    break
+                continue
+
+            if char in _OPEN:
+                depth += 1
+                if depth == 1:
+                    if char != _ARRAY_START:
+                        msg = 'Expected a json array'
+                        raise ValueError(msg)
+                    elem_start = pos
+                continue
+
+            if char in _CLOSE:
+                depth -= 1
+                if depth == 0:
+                    if value := bytes(buf[elem_start:i]).strip():
+                        elements.append(value)
+                    elem_start = -1
+                    self._done = True
+                continue
+
+            # comma
+            if depth == 1:
+                elements.append(bytes(buf[elem_start:i]).strip())
+                elem_start = pos
+
+        # remove the processed data, so the buffer doesn't grow
+        if (cut := pos if elem_start < 0 else elem_start) > 0:
+            del buf[:cut]
+            pos -= cut
+            if elem_start >= 0:
+                elem_start -= cut
+
+        self._pos = pos
+        self._depth = depth
+        self._elem_start = elem_start
+        return elements
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from asyncio import Queue
+from collections import deque
+from dataclasses import dataclass
+from time import monotonic
+from typing import TYPE_CHECKING, Final, Generic, TypeVar
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+T = TypeVar('T')
+
+
+@dataclass(frozen=True)
+class OutgoingQueueStats:
+    size: int           #: Current amount of messages in the queue
+    coalesced: int      #: Amount of messages that were replaced by a newer message
+    dropped: int        #: Amount of messages that were discarded because the connection was lost
+    age: float          #: Time in seconds the oldest message is waiting in the queue
+    age_max: float      #: Highest time in seconds a message waited in the queue
+
+
+class OutgoingQueue(Queue, Generic[T]):
+    """Queue for outgoing messages, e.g. the messages which are sent to openHAB or published to the mqtt broker.
+
+    If coalescing is enabled only the latest pending message for a key (e.g. the state update of an item)
+    is kept (last write wins). Messages which can not be coalesced (e.g. commands) are never replaced and messages
+    which are queued after such a message will not be moved in front of it.
+
+    :param get_key: function which returns the key (e.g. item name) and if the message can be coalesced or ``None``
+    :param coalesce: coalesce pending messages
+    """
+
+    def __init__(self, get_key: Callable[[T], tuple[str, bool] | None], *, coalesce: bool = False) -> None:
+        super().__init__()
+        self.get_key: Final = get_key
+        self.coalesce: Final = coalesce
+
+        self._coalesced: int = 0
+        self._dropped: int = 0
+        self._age_max: float = 0.0
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # Queue internals, the entries are [key or None, message, timestamp]
+    # ------------------------------------------------------------------------------------------------------------------
+    def _init(self, maxsize: int) -> None:  # noqa: ARG002
+        self._queue: deque[list] = deque()
+        self._pending: dict[str, list] = {}
+
+    def _put(self, item: T) -> None:
+        name = None
+        if self.coalesce and (key := self.get_key(item)) is not None:
+            name, can_coalesce = key
+            if not can_coalesce:
+                name = None
+
+        entry = [name, item, monotonic()]
+        if name is not None:
+            self._pending[name] = entry
+        self._queue.append(entry)
+
+    def _get(self) -> T:
+        entry = self._queue.popleft()
+        name, item, ts = entry
+        if name is not None and self._pending.get(name) is entry:
+            del self._pending[name]
+
+        self._age_max = max(monotonic() - ts, self._age_max)
+        return item
+
+    # ------------------------------------------------------------------------------------------------------------------
+
+    def put_nowait(self, item: T) -> None:
+        if self.coalesce and (key := self.get_key(item)) is not None:
+            name, can_coalesce = key
+            if not can_coalesce:
+                # updates after the command must not be sent before the command
+                self._pending.pop(name, None)
+            elif (entry := self._pending.get(name)) is not None:
+                entry[1] = item
+                self._coalesced += 1
+                return None
+
+        return super().put_nowait(item)
+
+    def clear(self) -> int:
+        """Remove all messages from the queue and return the amount of removed messages"""
+        count = len(self._queue)
+        self._queue.clear()
+        self._pending.clear()
+
+        self._dropped += count
+        return count
+
+    def get_age(self) -> float:
+        """Return the time in seconds the oldest message is waiting in the queue"""
+        if not self._queue:
+            return 0.0
+        return monotonic() - self._queue[0][2]
+
+    def get_stats(self) -> OutgoingQueueStats:
+        return OutgoingQueueStats(
+            size=self.qsize(), coalesced=self._coalesced, dropped=self._dropped,
+            age=self.get_age(), age_max=self._age_max
+        )
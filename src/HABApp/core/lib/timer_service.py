@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from heapq import heappop, heappush
+from itertools import count
+from time import get_clock_info
+from typing import TYPE_CHECKING, Any, Final
+
+from HABApp.core.const import loop
+from HABApp.core.lib.exceptions import format_exception
+from HABApp.core.lib.helper import get_obj_name
+
+
+if TYPE_CHECKING:
+    from asyncio import TimerHandle
+    from collections.abc import Callable
+
+
+log = logging.getLogger('HABApp')
+
+
+@dataclass(frozen=True)
+class TimerServiceStats:
+    timers: int     #: Amount of created timers which are not canceled
+    pending: int    #: Amount of timers which are waiting to expire
+    heap: int       #: Amount of entries in the heap (including outdated entries)
+    resets: int     #: Amount of timer resets
+    expired: int    #: Amount of expired timers
+
+
+class SharedTimer:
+    """Timer which calls a function once the time has passed since the last reset.
+    A reset only updates the deadline, the timer will be moved to the correct position in the heap once it's due.
+    Must only be used from the event loop.
+    """
+
+    __slots__ = ('_deadline', '_in_heap', '_service', 'func', 'is_canceled', 'secs')
+
+    def __init__(self, service: TimerService, func: Callable[[], Any], secs: float) -> None:
+        if not isinstance(secs, (int, float)) or secs < 0:
+            msg = f'Pending time must be int/float and >= 0! Is: {secs} ({type(secs)})'
+            raise ValueError(msg)
+
+        self.func: Final = func
+        self.secs: Final = secs
+        self.is_canceled: bool = False
+
+        self._service: Final = service
+        self._deadline: float | None = None
+        self._in_heap: bool = False
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} {get_obj_name(self.func)} {self.secs}s>'
+
+    @property
+    def is_pending(self) -> bool:
+        """True if the timer is running and will expire"""
+        return self._deadline is not None
+
+    def reset(self) -> None:
+        """(Re)start the timer"""
+        if self.is_canceled:
+            return None
+        self._service._reset(self)
+
+    def cancel(self) -> None:
+        """Cancel the timer, it can not be started again"""
+        if self.is_canceled:
+            return None
+        self.is_canceled = True
+        self._service._cancel(self)
+
+
+class TimerService:
+    """Runs many timers with a single loop callback. The timers are kept in a heap sorted by their deadline."""
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[float, int, SharedTimer]] = []
+        # timers which are due within the resolution of the clock are expired together, like the event loop does
+        self._resolution: Final = get_clock_info('monotonic').resolution
+        self._seq: Final = count()
+        self._handle: TimerHandle | None = None
+        self._handle_at: float = 0.0
+
+        self._timers: int = 0
+        self._pending: int = 0
+        self._resets: int = 0
+        self._expired: int = 0
+
+    def create_timer(self, func: Callable[[], Any], secs: float) -> SharedTimer:
+        timer = SharedTimer(self, func, secs)
+        self._timers += 1
+        return timer
+
+    def get_stats(self) -> TimerServiceStats:
+        return TimerServiceStats(
+            timers=self._timers, pending=self._pending, heap=len(self._heap),
+            resets=self._resets, expired=self._expired
+        )
+
+    def _reset(self, timer: SharedTimer) -> None:
+        self._resets += 1
+        if timer._deadline is None:
+            self._pending += 1
+        timer._deadline = deadline = loop.time() + timer.secs
+
+        # The entry in the heap has an earlier deadline so it will be moved once it's due
+        if timer._in_heap:
+            return None
+
+        timer._in_heap = True
+        heappush(self._heap, (deadline, next(self._seq), timer))
+        if self._handle is None or deadline < self._handle_at:
+            self._arm(deadline)
+
+    def _cancel(self, timer: SharedTimer) -> None:
+        self._timers -= 1
+        if timer._deadline is not None:
+            timer._deadline = None
+            self._pending -= 1
+        # the entry is removed from the heap once it's due
+
+    def _arm(self, when: float) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+        self._handle = loop.call_at(when, self._run)
+        self._handle_at = when
+
+    def _run(self) -> None:
+        self._handle = None
+        heap = self._heap
+        now = loop.time() + self._resolution
+        expired: list[SharedTimer] = []
+
+        while heap and heap[0][0] <= now:
+            _, _, timer = heappop(heap)
+
+            if (deadline := timer._deadline) is None:
+                timer._in_heap = False
+                continue
+
+            # the timer was reset in the meantime
+            if deadline > now:
+                heappush(heap, (deadline, next(self._seq), timer))
+                continue
+
+            timer._in_heap = False
+            timer._deadline = None
+            self._pending -= 1
+            self._expired += 1
+            expired.append(timer)
+
+        if heap:
+            self._arm(heap[0][0])
+
+        # The functions are called in the next iteration of the loop, so callbacks which were due
+        # at the same time (e.g. a sleep that was started before the timer) run first
+        if expired:
+            loop.call_soon(self._call_expired, expired)
+
+    @staticmethod
+    def _call_expired(expired: list[SharedTimer]) -> None:
+        for timer in expired:
+            # the timer was canceled or reset after it expired
+            if timer.is_canceled or timer._deadline is not None:
+                continue
+
+            try:
+                timer.func()
+            except Exception as e:
+                log.error(f'Error {e} in {get_obj_name(timer.func)}:')
+                for line in format_exception(e):
+                    log.error(line)
+
+
+TIMER_SERVICE: Final = TimerService()
@@ -0,0 +1,322 @@
+from __future__ import annotations
+
+from array import array
+from collections import deque
+from heapq import heapify, heappop, heappush
+from itertools import chain
+from math import fsum
+from typing import TYPE_CHECKING, Any, Final
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+_INT_LIMIT: Final = 2 ** 63
+
+
+def _get_typecode(value: Any) -> str | None:
+    # bools are ints but they would be returned as ints, so they are stored as objects
+    if type(value) is int:
+        return 'q' if -_INT_LIMIT <= value < _INT_LIMIT else None
+    if type(value) is float:
+        return 'd'
+    return None
+
+
+class ValueHistory:
+    """Ring buffer of values with timestamps. Numeric values are stored in compact arrays.
+    Sum, mean, min and max are updated incrementally and the median is tracked with two heaps,
+    so adding and removing values never requires a pass over all values.
+    If a non-numeric value is added the values are kept as objects and no statistics are available.
+
+    :param max_samples: maximum amount of values, if more values are added the oldest value is removed
+    """
+
+    __slots__ = (
+        '_cap', '_high', '_high_n', '_len', '_low', '_low_n', '_max', '_min', '_numeric',
+        '_seq', '_start', '_sum', '_sum_ops', '_ts', '_vals', 'max_samples',
+    )
+
+    def __init__(self, max_samples: int | None = None) -> None:
+        if max_samples is not None and max_samples < 1:
+            msg = f'max_samples must be at least 1! Got {max_samples}'
+            raise ValueError(msg)
+
+        self.max_samples: Final = max_samples
+        self._init()
+
+    def _init(self) -> None:
+        self._cap: int = self.max_samples if self.max_samples is not None else 8
+        self._ts: array = array('d', bytes(8 * self._cap))
+        self._vals: array | list = array('q', bytes(8 * self._cap))
+        self._start: int = 0
+        self._len: int = 0
+        # sequence number of the oldest value, values with a lower number have been removed
+        self._seq: int = 0
+
+        self._numeric: bool = True
+        self._sum: float = 0
+        self._sum_ops: int = 0
+        # monotonic deques with (seq, value)
+        self._min: deque[tuple[int, Any]] = deque()
+        self._max: deque[tuple[int, Any]] = deque()
+        # lower half as max heap (-value, -seq) and upper half as min heap (value, seq)
+        self._low: list[tuple[Any, int]] = []
+        self._high: list[tuple[Any, int]] = []
+        self._low_n: int = 0
+        self._high_n: int = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[Any]:
+        return self._iter(self._vals)
+
+    def __getitem__(self, index: int) -> Any:
+        return self._vals[self._get_pos(index)]
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} len: {self._len:d}>'
+
+    def _iter(self, obj: array | list) -> Iterator[Any]:
+        start = self._start
+        end = start + self._len
+        if end <= self._cap:
+            return iter(obj[start:end])
+        return chain(obj[start:], obj[:end - self._cap])
+
+    def _get_pos(self, index: int) -> int:
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            msg = 'index out of range'
+            raise IndexError(msg)
+        return (self._start + index) % self._cap
+
+    @property
+    def numeric(self) -> bool:
+        """True if all values are numeric and the statistics are available"""
+        return self._numeric
+
+    def timestamps(self) -> Iterator[float]:
+        """Return an iterator over the timestamps"""
+        return self._iter(self._ts)
+
+    def get_timestamp(self, index: int) -> float:
+        """Return the timestamp of the value at the index"""
+        return self._ts[self._get_pos(index)]
+
+    def clear(self) -> None:
+        self._init()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------------------------------------------------------
+    def _resize(self, cap: int) -> None:
+        self._ts = array('d', chain(self._iter(self._ts), (0.0,) * (cap - self._len)))
+        if isinstance(self._vals, array):
+            self._vals = array(self._vals.typecode, chain(self._iter(self._vals), (0,) * (cap - self._len)))
+        else:
+            self._vals = [*self._iter(self._vals), *((None,) * (cap - self._len))]
+        self._cap = cap
+        self._start = 0
+
+    def append(self, value: Any, timestamp: float) -> None:
+        """Add a new value. The timestamps must be monotonic.
+
+        :param value: value
+        :param timestamp: timestamp of the value
+        """
+        if self._len == self._cap:
+            if self.max_samples is not None:
+                self.popleft()
+            else:
+                self._resize(self._cap * 2)
+
+        if self._numeric and _get_typecode(value) is None:
+            self._disable_statistics()
+
+        if isinstance(self._vals, array) and _get_typecode(value) != self._vals.typecode:
+            self._convert_storage(value)
+
+        pos = (self._start + self._len) % self._cap
+        self._ts[pos] = timestamp
+        self._vals[pos] = value
+        seq = self._seq + self._len
+        self._len += 1
+
+        if self._numeric:
+            self._stats_add(seq, value)
+
+    def _convert_storage(self, value: Any) -> None:
+        # The layout of the buffer stays the same. int -> float is possible, everything else is stored as objects.
+        vals = self._vals
+        typecode = _get_typecode(value)
+        if typecode == 'q' and vals.typecode == 'd':
+            return None
+        if typecode == 'd' and vals.typecode == 'q':
+            self._vals = array('d', vals)
+            return None
+        self._vals = list(vals)
+
+    def popleft(self) -> tuple[float, Any]:
+        """Remove the oldest value and return timestamp and value"""
+        if not self._len:
+            msg = 'pop from an empty history'
+            raise IndexError(msg)
+
+        pos = self._start
+        ts = self._ts[pos]
+        value = self._vals[pos]
+        if isinstance(self._vals, list):
+            self._vals[pos] = None
+
+        seq = self._seq
+        self._start = (pos + 1) % self._cap
+        self._len -= 1
+        self._seq += 1
+
+        if self._numeric:
+            self._stats_remove(seq, value)
+        return ts, value
+
+    def remove_older_than(self, timestamp: float) -> int:
+        """Remove all values with a timestamp lower than the given timestamp and return the amount of removed values"""
+        count = 0
+        while self._len and self._ts[self._start] < timestamp:
+            self.popleft()
+            count += 1
+        return count
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # Statistics
+    # ------------------------------------------------------------------------------------------------------------------
+    def _disable_statistics(self) -> None:
+        self._numeric = False
+        self._sum = 0
+        self._min.clear()
+        self._max.clear()
+        self._low.clear()
+        self._high.clear()
+        self._low_n = self._high_n = 0
+
+    def _stats_add(self, seq: int, value: float) -> None:
+        self._sum += value
+
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((seq, value))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((seq, value))
+
+        self._prune()
+        if self._low_n and (value, seq) < (-self._low[0][0], -self._low[0][1]):
+            heappush(self._low, (-value, -seq))
+            self._low_n += 1
+        else:
+            heappush(self._high, (value, seq))
+            self._high_n += 1
+        self._rebalance()
+
+    def _stats_remove(self, seq: int, value: float) -> None:
+        # repeated additions and subtractions accumulate float errors, so the sum is recalculated from time to time
+        self._sum -= value
+        self._sum_ops += 1
+        if self._sum_ops >= self._cap and isinstance(self._vals, array) and self._vals.typecode == 'd':
+            self._sum = fsum(self)
+            self._sum_ops = 0
+
+        if self._min and self._min[0][0] == seq:
+            self._min.popleft()
+        if self._max and self._max[0][0] == seq:
+            self._max.popleft()
+
+        # The removed value is still in one of the heaps and is removed lazily once it's on top.
+        # The order of the heaps is (value, seq) so it's possible to find out in which heap it is
+        low = self._low
+        while low and -low[0][1] < seq:
+            heappop(low)
+        if self._low_n and (value, seq) <= (-low[0][0], -low[0][1]):
+            self._low_n -= 1
+        else:
+            self._high_n -= 1
+
+        self._prune()
+        self._rebalance()
+
+        # remove old entries, otherwise the heaps would grow if the values are monotonic
+        if len(low) + len(self._high) > 2 * self._len + 16:
+            self._low = [k for k in low if -k[1] >= self._seq]
+            self._high = [k for k in self._high if k[1] >= self._seq]
+            heapify(self._low)
+            heapify(self._high)
+
+    def _prune(self) -> None:
+        seq = self._seq
+        low = self._low
+        while low and -low[0][1] < seq:
+            heappop(low)
+        high = self._high
+        while high and high[0][1] < seq:
+            heappop(high)
+
+    def _rebalance(self) -> None:
+        # the lower half contains the same amount or one value more than the upper half
+        while self._low_n > self._high_n + 1:
+            value, seq = heappop(self._low)
+            heappush(self._high, (-value, -seq))
+            self._low_n -= 1
+            self._high_n += 1
+            self._prune()
+        while self._high_n > self._low_n:
+            value, seq = heappop(self._high)
+            heappush(self._low, (-value, -seq))
+            self._high_n -= 1
+            self._low_n += 1
+            self._prune()
+
+    def _check_numeric(self) -> bool:
+        if not self._numeric:
+            msg = 'Statistics are only available for numeric values'
+            raise TypeError(msg)
+        return self._len > 0
+
+    @property
+    def sum(self) -> float | None:
+        """Sum of all values"""
+        if not self._check_numeric():
+            return None
+        return self._sum
+
+    @property
+    def mean(self) -> float | None:
+        """Mean of all values"""
+        if not self._check_numeric():
+            return None
+        return self._sum / self._len
+
+    @property
+    def min(self) -> float | None:
+        """Minimum of all values"""
+        if not self._check_numeric():
+            return None
+        return self._min[0][1]
+
+    @property
+    def max(self) -> float | None:
+        """Maximum of all values"""
+        if not self._check_numeric():
+            return None
+        return self._max[0][1]
+
+    @property
+    def median(self) -> float | None:
+        """Median of all values"""
+        if not self._check_numeric():
+            return None
+        lower = -self._low[0][0]
+        if self._low_n > self._high_n:
+            return lower
+        return (lower + self._high[0][0]) / 2
@@ -1,20 +1,57 @@
-from asyncio import Queue
-from typing import Any
+from __future__ import annotations
+
+from asyncio import Semaphore, Task, create_task
+from dataclasses import dataclass
+from time import monotonic
+from typing import TYPE_CHECKING, Any
 
 from pydantic import BaseModel
 
 from HABApp.config import CONFIG
 from HABApp.config.models.mqtt import QOS
 from HABApp.core.asyncio import run_func_from_async
+from HABApp.core.connections.base_connection import AlreadyHandledException
 from HABApp.core.const.json import dump_json
 from HABApp.core.internals import ItemRegistryItem
+from HABApp.core.lib import OutgoingQueue, OutgoingQueueStats
 from HABApp.mqtt.connection.connection import MqttPlugin
 
 
+if TYPE_CHECKING:
+    from aiomqtt import Client
+
+
+HINT_PUBLISH_MSG = tuple[str, Any, int, bool]
+
+
+@dataclass(frozen=True)
+class MqttPublishStats:
+    queue: OutgoingQueueStats | None    #: Statistics of the queue or ``None`` if there is no connection
+    in_flight: int                      #: Amount of publishes which wait for the confirmation of the broker
+    published: int                      #: Amount of published messages
+    latency_avg: float                  #: Average time in seconds until a publish was confirmed by the broker
+    latency_max: float                  #: Highest time in seconds until a publish was confirmed by the broker
+
+
+def get_publish_key(msg: HINT_PUBLISH_MSG) -> tuple[str, bool]:
+    # only retained messages can be coalesced
+    topic, _, _, retain = msg
+    return topic, retain
+
+
+def create_queue() -> OutgoingQueue[HINT_PUBLISH_MSG]:
+    return OutgoingQueue(get_publish_key, coalesce=CONFIG.mqtt.publish.coalesce_retained)
+
+
 class PublishHandler(MqttPlugin):
     def __init__(self) -> None:
         super().__init__(task_name='MqttPublish')
 
+        self._in_flight: int = 0
+        self._published: int = 0
+        self._latency_sum: float = 0.0
+        self._latency_max: float = 0.0
+
     async def mqtt_task(self) -> None:
         if CONFIG.mqtt.general.listen_only:
             return None
@@ -24,36 +61,73 @@ class PublishHandler(MqttPlugin):
             client = self.plugin_connection.context
             assert client is not None
 
-            cfg = CONFIG.mqtt.publish
             queue = QUEUE
             assert queue is not None
 
-            # worker to publish things
-            while True:
-                topic, value, qos, retain = await queue.get()
-                if qos is None:
-                    qos = cfg.qos
-                if retain is None:
-                    retain = cfg.retain
+            # Multiple publishes can wait for the confirmation of the broker at the same time.
+            # The tasks are started in the order they were created, so the messages are still sent in order.
+            window = Semaphore(CONFIG.mqtt.publish.in_flight)
+            tasks: set[Task] = set()
 
+            # worker to publish things
+            try:
+                while True:
+                    msg = await queue.get()
+                    await window.acquire()
+
+                    task = create_task(self._publish(client, window, msg))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                    queue.task_done()
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+    async def _publish(self, client: Client, window: Semaphore, msg: HINT_PUBLISH_MSG) -> None:
+        topic, value, qos, retain = msg
+
+        self._in_flight += 1
+        start = monotonic()
+        try:
+            with self.plugin_connection.handle_exception(self.mqtt_task):
                 await client.publish(topic, value, qos, retain)
-                queue.task_done()
+        except AlreadyHandledException:
+            return None
+        finally:
+            self._in_flight -= 1
+            window.release()
+
+        duration = monotonic() - start
+        self._published += 1
+        self._latency_sum += duration
+        self._latency_max = max(duration, self._latency_max)
+
+    def get_stats(self) -> MqttPublishStats:
+        """Return the statistics of the outgoing messages"""
+        return MqttPublishStats(
+            queue=QUEUE.get_stats() if QUEUE is not None else None,
+            in_flight=self._in_flight, published=self._published,
+            latency_avg=self._latency_sum / self._published if self._published else 0.0,
+            latency_max=self._latency_max
+        )
 
     async def on_connected(self) -> None:
         global QUEUE
 
         if not CONFIG.mqtt.general.listen_only:
-            QUEUE = Queue()
+            QUEUE = create_queue()
         await super().on_connected()
 
     async def on_disconnected(self) -> None:
         global QUEUE
 
         await super().on_disconnected()
+        if QUEUE is not None:
+            QUEUE.clear()
         QUEUE = None
 
 
-QUEUE: Queue | None = Queue()
+QUEUE: OutgoingQueue[HINT_PUBLISH_MSG] | None = create_queue()
 
 
 PUBLISH_HANDLER = PublishHandler()
@@ -82,6 +156,11 @@ def async_publish(topic: str | ItemRegistryItem, payload: Any, qos: QOS | None =
     elif isinstance(payload, (dict, list, set, frozenset)):
         payload = dump_json(payload)
 
+    cfg = CONFIG.mqtt.publish
+    if qos is None:
+        qos = cfg.qos
+    if retain is None:
+        retain = cfg.retain
     queue.put_nowait((topic, payload, qos, retain))
     return None
 
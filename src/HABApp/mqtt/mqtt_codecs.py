@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from threading import Lock
+from typing import Any, Final
+
+from pydantic import TypeAdapter
+
+from HABApp.core.const.json import load_json
+from HABApp.core.internals.event_bus.topic_pattern import LEVEL_MULTI, LEVEL_SINGLE, TopicPattern, TopicTrie
+
+
+try:
+    from orjson import loads as _load_json_bytes
+except ImportError:
+    _load_json_bytes = load_json
+
+
+class MqttPayloadCodec:
+    """Base class for payload codecs. A codec converts the raw payload of a message to the value of the event."""
+
+    def decode(self, payload: bytes) -> Any:
+        raise NotImplementedError()
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__}>'
+
+
+class MqttRawCodec(MqttPayloadCodec):
+    """Pass the payload as bytes"""
+
+    def decode(self, payload: bytes) -> bytes:
+        return payload
+
+
+class MqttStrCodec(MqttPayloadCodec):
+    """Decode the payload as an utf-8 string"""
+
+    def decode(self, payload: bytes) -> str:
+        return payload.decode('utf-8')
+
+
+class MqttJsonCodec(MqttPayloadCodec):
+    """Parse the payload as json. If available ``orjson`` is used."""
+
+    def decode(self, payload: bytes) -> Any:
+        return _load_json_bytes(payload)
+
+
+class MqttNumberCodec(MqttPayloadCodec):
+    """Parse the payload as an int or a float"""
+
+    def decode(self, payload: bytes) -> int | float:
+        try:
+            return int(payload)
+        except ValueError:
+            return float(payload)
+
+
+class MqttModelCodec(MqttPayloadCodec):
+    """Validate the json payload with pydantic, e.g. against a pydantic model
+
+    :param type_hint: the model or a type hint
+    """
+
+    def __init__(self, type_hint: Any) -> None:
+        self.type_hint: Final = type_hint
+        self._adapter: Final = TypeAdapter(type_hint)
+
+    def decode(self, payload: bytes) -> Any:
+        return self._adapter.validate_json(payload)
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} {self.type_hint}>'
+
+
+def get_topic_pattern(topic: str) -> TopicPattern | None:
+    """Return the pattern for a topic with mqtt wildcards or ``None`` if the topic has no wildcards"""
+    if LEVEL_SINGLE not in topic and LEVEL_MULTI not in topic:
+        return None
+    return TopicPattern(topic)
+
+
+# Max amount of topics for which the codec is cached
+CODEC_CACHE_SIZE: Final = 4096
+
+
+class MqttCodecRegistry:
+    """Codecs for topics or topic patterns. Codecs for topics take precedence over codecs for patterns.
+    Patterns are matched in the order in which they were registered.
+    The result of the lookup is cached per topic so every topic is only matched once.
+    """
+
+    def __init__(self) -> None:
+        self._lock: Final = Lock()
+        self._topics: dict[str, MqttPayloadCodec] = {}
+        self._patterns: dict[str, tuple[TopicPattern, MqttPayloadCodec]] = {}
+        self._trie: Final = TopicTrie()
+        self._cache: dict[str, MqttPayloadCodec | None] = {}
+
+    def register(self, topic: str, codec: MqttPayloadCodec) -> None:
+        if not isinstance(codec, MqttPayloadCodec):
+            msg = f'Codec must be an instance of {MqttPayloadCodec.__name__}! Got {codec!r}'
+            raise TypeError(msg)
+
+        pattern = get_topic_pattern(topic)
+        with self._lock:
+            if pattern is None:
+                self._topics[topic] = codec
+            else:
+                self._remove_pattern(topic)
+                # the pattern itself is the entry in the trie, the codec is looked up with it
+                self._trie.add(pattern, pattern)
+                self._patterns[topic] = pattern, codec
+            self._cache = {}
+
+    def remove(self, topic: str) -> bool:
+        with self._lock:
+            found = self._topics.pop(topic, None) is not None or self._remove_pattern(topic)
+            self._cache = {}
+        return found
+
+    def _remove_pattern(self, topic: str) -> bool:
+        if (entry := self._patterns.pop(topic, None)) is None:
+            return False
+        pattern = entry[0]
+        self._trie.remove(pattern, pattern)
+        return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._topics.clear()
+            self._patterns.clear()
+            self._trie.clear()
+            self._cache = {}
+
+    def get(self, topic: str) -> MqttPayloadCodec | None:
+        # fast path, this is called for every message
+        try:
+            return self._cache[topic]
+        except KeyError:
+            pass
+
+        with self._lock:
+            if (codec := self._topics.get(topic)) is None and (found := self._trie.match(topic)):
+                codec = self._patterns[found[0]][1]
+            # Topics can be arbitrary so the cache is cleared once it grows too big
+            if len(self._cache) >= CODEC_CACHE_SIZE:
+                self._cache = {}
+            self._cache[topic] = codec
+        return codec
+
+
+CODEC_REGISTRY: Final = MqttCodecRegistry()
+
+
+def register_payload_codec(topic: str, codec: MqttPayloadCodec) -> None:
+    """Use a codec to decode the payload of all messages of a topic instead of guessing the type of the payload.
+    The topic can contain the mqtt wildcards ``+`` and ``#``.
+
+    :param topic: topic or topic pattern
+    :param codec: codec instance
+    """
+    CODEC_REGISTRY.register(topic, codec)
+
+
+def remove_payload_codec(topic: str) -> bool:
+    """Remove a previously registered codec
+
+    :param topic: topic or topic pattern which was used for the registration
+    :return: ``True`` if a codec was removed
+    """
+    return CODEC_REGISTRY.remove(topic)
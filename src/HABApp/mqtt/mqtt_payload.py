@@ -6,6 +6,7 @@ from aiomqtt import Message
 from HABApp.core.const.json import load_json
 from HABApp.core.const.log import TOPIC_EVENTS
 from HABApp.core.wrapper import process_exception
+from HABApp.mqtt.mqtt_codecs import CODEC_REGISTRY
 
 
 log = logging.getLogger(f'{TOPIC_EVENTS}.mqtt')
@@ -16,6 +17,12 @@ def get_msg_payload(msg: Message) -> tuple[str | None, Any]:
         topic = msg.topic.value
         raw = msg.payload
 
+        # registered codecs skip the guessing of the type
+        if (codec := CODEC_REGISTRY.get(topic)) is not None:
+            if log.isEnabledFor(logging.DEBUG):
+                log._log(logging.DEBUG, f'{topic} ({msg.qos}): {raw[:100]!r} ({codec})', [])
+            return topic, codec.decode(raw)
+
         try:
             val = raw.decode('utf-8')
         except UnicodeDecodeError:
@@ -1 +1,11 @@
 from .publish_options import MqttPublishOptions
+from HABApp.mqtt.mqtt_codecs import (
+    MqttJsonCodec,
+    MqttModelCodec,
+    MqttNumberCodec,
+    MqttPayloadCodec,
+    MqttRawCodec,
+    MqttStrCodec,
+    register_payload_codec,
+    remove_payload_codec,
+)
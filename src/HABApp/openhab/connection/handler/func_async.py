@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import warnings
+from asyncio import Semaphore, gather
 from datetime import datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any, Final
 from urllib.parse import quote as quote_url
 
 from HABApp.core.internals import ItemRegistryItem
+from HABApp.core.lib.json_array import JsonArraySplitter
+from HABApp.openhab.definitions.helpers.item_definition import OpenhabItemDefinition, OpenhabItemsCreateResult
 from HABApp.openhab.definitions.rest import (
     ItemChannelLinkResp,
     ItemChannelLinkRespList,
@@ -25,6 +28,7 @@ from HABApp.openhab.definitions.rest import (
 )
 from HABApp.openhab.definitions.rest.habapp_data import get_api_vals, load_habapp_meta
 from HABApp.openhab.errors import (
+    HABAppOpenhabError,
     ItemNotEditableError,
     ItemNotFoundError,
     LinkNotEditableError,
@@ -41,6 +45,10 @@ from . import convert_to_oh_str
 from .handler import delete, get, post, put
 
 
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterable
+
+
 # ----------------------------------------------------------------------------------------------------------------------
 # root
 # ----------------------------------------------------------------------------------------------------------------------
@@ -90,6 +98,28 @@ async def async_get_items() -> tuple[ItemResp, ...]:
     return ItemRespList.validate_json(body)
 
 
+async def async_iter_items_json(chunk_size: int, read_size: int = 64 * 1024) -> AsyncIterator[list[bytes]]:
+    """Stream the items and yield the raw json of the items in chunks,
+    so the response never has to be kept completely in memory"""
+
+    resp = await get('/rest/items', params={'metadata': '.+'})
+    splitter = JsonArraySplitter()
+    elements: list[bytes] = []
+
+    async for data in resp.content.iter_chunked(read_size):
+        elements.extend(splitter.feed(data))
+        while len(elements) >= chunk_size:
+            yield elements[:chunk_size]
+            del elements[:chunk_size]
+
+    if not splitter.done:
+        msg = 'Incomplete response for items'
+        raise ValueError(msg)
+
+    if elements:
+        yield elements
+
+
 async def async_get_item(item: str | ItemRegistryItem) -> ItemResp | None:
     # noinspection PyProtectedMember
     item = item if isinstance(item, str) else item._name
@@ -139,15 +169,29 @@ async def async_create_item(item_type: str, name: str,
                             group_function: str | None = None,
                             group_function_params: list[str] | None = None) -> bool:
 
+    payload = _get_item_payload(
+        item_type, name, label=label, category=category, tags=tags, groups=groups,
+        group_type=group_type, group_function=group_function, group_function_params=group_function_params
+    )
+    return await _put_item(name, payload)
+
+
+def _get_item_payload(item_type: str, name: str, *,
+                      label: str | None = None, category: str | None = None,
+                      tags: Iterable[str] | None = None, groups: Iterable[str] | None = None,
+                      group_type: str | None = None,
+                      group_function: str | None = None,
+                      group_function_params: Iterable[str] | None = None) -> dict[str, Any]:
+
     payload = {'type': item_type, 'name': name}
     if label:
         payload['label'] = label
     if category:
         payload['category'] = category
     if tags:
-        payload['tags'] = tags
+        payload['tags'] = list(tags)
     if groups:
-        payload['groupNames'] = groups  # CamelCase!
+        payload['groupNames'] = list(groups)  # CamelCase!
 
     # we create a group
     if group_type:
@@ -156,8 +200,11 @@ async def async_create_item(item_type: str, name: str,
         payload['function'] = {}
         payload['function']['name'] = group_function
         if group_function_params:
-            payload['function']['params'] = group_function_params
+            payload['function']['params'] = list(group_function_params)
+    return payload
 
+
+async def _put_item(name: str, payload: dict[str, Any]) -> bool:
     if (ret := await put(f'/rest/items/{name:s}', json=payload)) is None:
         return False
 
@@ -201,6 +248,98 @@ async def async_set_metadata(item: str | ItemRegistryItem, namespace: str, value
     return ret.status < 300
 
 
+async def async_create_items(items: Iterable[OpenhabItemDefinition], *,
+                             concurrency: int = 10) -> OpenhabItemsCreateResult:
+    """Create or update multiple items including their metadata and links.
+    The current item definitions and links are requested once and only the changed objects are sent to openHAB.
+    Groups are created before the other items.
+
+    :param items: item definitions
+    :param concurrency: how many items are processed at the same time
+    """
+    if concurrency < 1:
+        msg = f'Concurrency must be at least 1! Got {concurrency}'
+        raise ValueError(msg)
+
+    definitions: dict[str, OpenhabItemDefinition] = {}
+    for item in items:
+        if not isinstance(item, OpenhabItemDefinition):
+            msg = f'Expected {OpenhabItemDefinition.__name__}, got {type(item)}'
+            raise TypeError(msg)
+        if item.name in definitions:
+            msg = f'Item {item.name:s} is defined multiple times'
+            raise ValueError(msg)
+        definitions[item.name] = item
+
+    existing: dict[str, ItemResp] = {item.name: item for item in await async_get_items()}
+    links: set[tuple[str, str]] = set()
+    if any(d.link for d in definitions.values()):
+        links = {(link.item, link.channel) for link in await async_get_links()}
+
+    created: list[str] = []
+    updated: list[str] = []
+    unchanged: list[str] = []
+    failed: dict[str, Exception] = {}
+    sem = Semaphore(concurrency)
+
+    async def process(definition: OpenhabItemDefinition) -> None:
+        name = definition.name
+        async with sem:
+            try:
+                result = await _apply_item_definition(definition, existing.get(name), links)
+            except Exception as e:
+                failed[name] = e
+                return None
+        {'created': created, 'updated': updated, 'unchanged': unchanged}[result].append(name)
+
+    groups = [d for d in definitions.values() if d.type == 'Group']
+    await gather(*(process(d) for d in groups))
+    await gather(*(process(d) for d in definitions.values() if d.type != 'Group'))
+
+    return OpenhabItemsCreateResult(
+        created=tuple(created), updated=tuple(updated), unchanged=tuple(unchanged), failed=failed
+    )
+
+
+async def _apply_item_definition(definition: OpenhabItemDefinition, existing: ItemResp | None,
+                                 links: set[tuple[str, str]]) -> str:
+    name = definition.name
+    result = 'created' if existing is None else 'unchanged'
+
+    if existing is None or definition.item_differs(existing):
+        payload = _get_item_payload(
+            definition.type, name, label=definition.label, category=definition.category,
+            tags=definition.tags, groups=definition.groups, group_type=definition.group_type,
+            group_function=definition.group_function, group_function_params=definition.group_function_params
+        )
+        if not await _put_item(name, payload):
+            msg = f'Could not create item {name:s}'
+            raise HABAppOpenhabError(msg)
+        if existing is not None:
+            result = 'updated'
+
+    current_metadata = existing.metadata if existing is not None else {}
+    for namespace, (value, config) in definition.get_metadata().items():
+        if (current := current_metadata.get(namespace)) is not None and \
+                current.get('value') == value and current.get('config', {}) == config:
+            continue
+        if not await async_set_metadata(name, namespace, value, config):
+            raise MetadataNotEditableError.create_text(name, namespace)
+        if result == 'unchanged':
+            result = 'updated'
+
+    if (channel := definition.link) is not None and (name, channel) not in links:
+        # the item exists at this point so the check in async_create_link can be skipped
+        json = {'itemName': name, 'channelUID': channel}
+        if (resp := await put(__get_item_link_url(name, channel), json=json)) is None or resp.status >= 300:
+            msg = f'Could not create link {name:s} <-> {channel:s}'
+            raise LinkRequestError(msg)
+        if result == 'unchanged':
+            result = 'updated'
+
+    return result
+
+
 # ----------------------------------------------------------------------------------------------------------------------
 # /things
 # ----------------------------------------------------------------------------------------------------------------------
@@ -385,9 +524,13 @@ async def async_get_persistence_services() -> tuple[PersistenceServiceResp, ...]
     return PersistenceServiceRespList.validate_json(body)
 
 
+# Max amount of pages that are requested for one query of persistence data
+PERSISTENCE_MAX_PAGES: Final = 1_000
+
+
 async def async_get_persistence_data(item: str | ItemRegistryItem, persistence: str | None,
                                      start_time: datetime | None,
-                                     end_time: datetime | None) -> ItemHistoryResp:
+                                     end_time: datetime | None, *, page_length: int | None = None) -> ItemHistoryResp:
     # noinspection PyProtectedMember
     item = item if isinstance(item, str) else item._name
 
@@ -398,9 +541,37 @@ async def async_get_persistence_data(item: str | ItemRegistryItem, persistence:
         params['starttime'] = convert_to_oh_str(start_time)
     if end_time is not None:
         params['endtime'] = convert_to_oh_str(end_time)
-    if not params:
-        params = None
 
+    if page_length is None:
+        return await _get_persistence_page(item, params if params else None)
+
+    if page_length < 1:
+        msg = f'page_length must be at least 1! Is: {page_length}'
+        raise ValueError(msg)
+
+    # Request the data in multiple pages so the individual responses stay small
+    params['pagelength'] = str(page_length)
+    ret: ItemHistoryResp | None = None
+    for page in range(PERSISTENCE_MAX_PAGES):
+        params['page'] = str(page)
+        resp = await _get_persistence_page(item, params)
+        if ret is None:
+            ret = resp
+        else:
+            # If the service does not support paging it returns the same data again
+            if not resp.data or (ret.data and resp.data[0].time <= ret.data[-1].time):
+                break
+            ret.data.extend(resp.data)
+
+        # A longer page means the service returned all data at once
+        if len(resp.data) != page_length:
+            break
+
+    ret.data_points = str(len(ret.data))
+    return ret
+
+
+async def _get_persistence_page(item: str, params: dict[str, str] | None) -> ItemHistoryResp:
     resp = await get(f'/rest/persistence/items/{item:s}', params=params)
     if resp.status >= 300:
         raise PersistenceRequestError()
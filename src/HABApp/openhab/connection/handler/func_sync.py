@@ -1,16 +1,18 @@
 from __future__ import annotations
 
 import datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any, Final
 
 from HABApp.core.asyncio import run_coro_from_thread
 from HABApp.core.internals import ItemRegistryItem
 from HABApp.openhab import definitions
-from HABApp.openhab.definitions.helpers import OpenhabPersistenceData
+from HABApp.openhab.definitions.helpers import OpenhabItemDefinition, OpenhabItemsCreateResult, OpenhabPersistenceData
+from HABApp.openhab.definitions.helpers.persistence_data import PersistenceDataCache
 from HABApp.openhab.definitions.rest import ItemChannelLinkResp, ItemResp
 
 from .func_async import (
     async_create_item,
+    async_create_items,
     async_create_link,
     async_get_item,
     async_get_link,
@@ -27,6 +29,10 @@ from .func_async import (
 )
 
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
 # ----------------------------------------------------------------------------------------------------------------------
 # /items
 # ----------------------------------------------------------------------------------------------------------------------
@@ -135,6 +141,23 @@ def create_item(item_type: str, name: str,
     )
 
 
+def create_items(items: Iterable[OpenhabItemDefinition], concurrency: int = 10) -> OpenhabItemsCreateResult:
+    """Creates or updates multiple items in the openHAB item registry including their metadata and links.
+    Only the objects which are different from the definition are sent to openHAB,
+    so this is much faster than creating the items one by one.
+
+    :param items: item definitions
+    :param concurrency: how many items are processed at the same time
+    :return: names of the created, updated, unchanged and failed items
+    """
+    items = tuple(items)
+    for item in items:
+        assert isinstance(item, OpenhabItemDefinition), type(item)
+    assert isinstance(concurrency, int) and concurrency > 0, concurrency
+
+    return run_coro_from_thread(async_create_items(items, concurrency=concurrency), calling=create_items)
+
+
 def set_metadata(item: str | ItemRegistryItem, namespace: str, value: str, config: dict):
     """
     Add/set metadata to an item
@@ -204,15 +227,24 @@ def get_persistence_services():
     return run_coro_from_thread(async_get_persistence_services(), calling=get_persistence_services)
 
 
+PERSISTENCE_CACHE: Final = PersistenceDataCache()
+
+
 def get_persistence_data(item: str | ItemRegistryItem, persistence: str | None,
                          start_time: datetime.datetime | None,
-                         end_time: datetime.datetime | None) -> OpenhabPersistenceData:
+                         end_time: datetime.datetime | None, *,
+                         page_length: int | None = None, max_age: float | None = None) -> OpenhabPersistenceData:
     """Query historical data from the openHAB persistence service
 
     :param item: name of the persistent item
     :param persistence: name of the persistence service (e.g. ``rrd4j``, ``mapdb``). If not set default will be used
     :param start_time: return only items which are newer than this
     :param end_time: return only items which are older than this
+    :param page_length: if set the data will be requested in multiple pages with this amount of data points
+    :param max_age: if set and the same data was requested less than ``max_age`` seconds ago
+                    the cached data will be returned. Start and end time are rounded to ``max_age`` seconds
+                    so e.g. queries relative to the current time can also be served from the cache.
+                    The returned object is shared so it must not be modified.
     :return: last stored data from persistency service
     """
     assert isinstance(item, (str, ItemRegistryItem)), type(item)
@@ -220,11 +252,23 @@ def get_persistence_data(item: str | ItemRegistryItem, persistence: str | None,
     assert isinstance(start_time, datetime.datetime) or start_time is None, start_time
     assert isinstance(end_time, datetime.datetime) or end_time is None, end_time
 
+    # noinspection PyProtectedMember
+    name = item if isinstance(item, str) else item._name
+    if max_age is not None:
+        key = PersistenceDataCache.get_key(name, persistence, start_time, end_time, max_age)
+        if (obj := PERSISTENCE_CACHE.get(key, max_age)) is not None:
+            return obj
+
     ret = run_coro_from_thread(
-        async_get_persistence_data(item=item, persistence=persistence, start_time=start_time, end_time=end_time),
+        async_get_persistence_data(
+            item=item, persistence=persistence, start_time=start_time, end_time=end_time, page_length=page_length
+        ),
         calling=get_persistence_data
     )
-    return OpenhabPersistenceData.from_resp(ret)
+    obj = OpenhabPersistenceData.from_resp(ret)
+    if max_age is not None:
+        PERSISTENCE_CACHE.set(key, obj)
+    return obj
 
 
 def set_persistence_data(item: str | ItemRegistryItem, persistence: str | None, time: datetime.datetime, state: Any):
@@ -240,6 +284,8 @@ def set_persistence_data(item: str | ItemRegistryItem, persistence: str | None,
     assert isinstance(persistence, str) or persistence is None, persistence
     assert isinstance(time, datetime.datetime), time
 
+    # noinspection PyProtectedMember
+    PERSISTENCE_CACHE.remove_item(item if isinstance(item, str) else item._name)
     return run_coro_from_thread(
         async_set_persistence_data(item=item, persistence=persistence, time=time, state=state),
         calling=set_persistence_data
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-from asyncio import Queue
 from typing import Any, Final
 
 import aiohttp
@@ -13,7 +12,9 @@ from HABApp.core.connections import BaseConnectionPlugin
 from HABApp.core.connections._definitions import CONNECTION_HANDLER_NAME
 from HABApp.core.connections.base_connection import AlreadyHandledException
 from HABApp.core.const.json import dump_json
+from HABApp.core.lib import OutgoingQueue
 from HABApp.openhab.connection.connection import OpenhabConnection, OpenhabContext
+from HABApp.openhab.connection.out_queue import get_websocket_event_key
 from HABApp.openhab.errors import OpenhabCredentialsInvalidError, OpenhabDisconnectedError
 
 
@@ -69,6 +70,7 @@ class ConnectionHandler(BaseConnectionPlugin[OpenhabConnection]):
             timeout=aiohttp.ClientTimeout(total=None),
             json_serialize=dump_json,
             auth=aiohttp.BasicAuth(user, password),
+            connector=aiohttp.TCPConnector(limit=config.connection_limit),
         )
         self.request = self.session._request
 
@@ -171,7 +173,7 @@ class ConnectionHandler(BaseConnectionPlugin[OpenhabConnection]):
 
             connection.context = OpenhabContext.new_context(
                 version=vers, session=self.session, session_options=self.options,
-                out_queue=Queue()
+                out_queue=OutgoingQueue(get_websocket_event_key, coalesce=CONFIG.openhab.general.coalesce_updates)
             )
 
         # during startup we get OpenhabCredentialsInvalidError even though credentials are correct
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from typing import Any
+
+from HABApp.openhab.definitions.websockets import ItemCommandSendEvent, ItemStateSendEvent
+
+
+def get_websocket_event_key(event: Any) -> tuple[str, bool] | None:
+    # 'openhab/items/<NAME>/<state|command>'
+    if isinstance(event, ItemStateSendEvent):
+        return event.topic[14:-6], True
+    if isinstance(event, ItemCommandSendEvent):
+        return event.topic[14:-8], False
+    return None
+
+
+def get_http_event_key(event: tuple[str, str, bool]) -> tuple[str, bool]:
+    item, _, is_cmd = event
+    return item, not is_cmd
@@ -1,22 +1,31 @@
 from __future__ import annotations
 
+import json
 import logging
 from asyncio import sleep
-from typing import TYPE_CHECKING
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Final, TypeAlias
 
 from immutables import Map
 
 import HABApp.openhab.events
 from HABApp.core.connections import BaseConnectionPlugin
-from HABApp.core.internals import uses_item_registry
+from HABApp.core.events import NoEventFilter
+from HABApp.core.internals import EventBusListener, uses_event_bus, uses_item_registry, wrap_func
 from HABApp.openhab.connection.connection import OpenhabConnection, OpenhabContext
 from HABApp.openhab.connection.handler import map_null_str
-from HABApp.openhab.connection.handler.func_async import async_get_all_items_state, async_get_items, async_get_things
+from HABApp.openhab.connection.handler.func_async import (
+    async_get_all_items_state,
+    async_get_things,
+    async_iter_items_json,
+)
+from HABApp.openhab.definitions.rest import ItemRespList
+from HABApp.openhab.definitions.topics import TOPIC_ITEMS
 from HABApp.openhab.definitions.websockets.item_value_types import QuantityTypeModel
+from HABApp.openhab.events import ItemAddedEvent, ItemRemovedEvent, ItemUpdatedEvent
 from HABApp.openhab.item_to_reg import (
     add_thing_to_registry,
     add_to_registry,
-    fresh_item_sync,
     get_thing_status_from_resp,
     remove_from_registry,
     remove_thing_from_registry,
@@ -25,21 +34,62 @@ from HABApp.openhab.item_to_reg import (
 
 if TYPE_CHECKING:
     from HABApp.core.lib import InstantView
-    from HABApp.openhab.definitions.rest import ThingResp
+    from HABApp.openhab.definitions.rest import ItemResp, ThingResp
+    from HABApp.openhab.items import OpenhabItem
 
 
 log = logging.getLogger('HABApp.openhab.items')
 Items = uses_item_registry()
+EventBus = uses_event_bus()
+
+
+# Amount of items which are validated and mapped before other tasks can run
+ITEMS_CHUNK_SIZE: Final = 250
+
+
+ItemFingerprint: TypeAlias = tuple[str, str | None, frozenset[str], frozenset[str], str | None]
+
+
+def get_item_fingerprint(item: ItemResp) -> ItemFingerprint:
+    # Everything except the state that is used to create the item.
+    # The tuple itself is stored and not the hash, because different definitions could have the same hash
+    return (
+        item.type, item.label, frozenset(item.tags), frozenset(item.groups),
+        json.dumps(item.metadata, sort_keys=True, default=str) if item.metadata else None
+    )
+
+
+def get_value_from_state(item: OpenhabItem, item_type: str, state: str | None) -> Any:
+    if state is None:
+        return None
+    # UoM item handling
+    if item_type.startswith('Number:'):
+        return QuantityTypeModel.get_value_from_state(state)
+    return item._state_from_oh_str(state)
 
 
 class LoadOpenhabItemsPlugin(BaseConnectionPlugin[OpenhabConnection]):
 
+    def __init__(self, name: str | None = None) -> None:
+        super().__init__(name)
+
+        # Fingerprint of the item definitions of the last load, so only changed items have to be mapped again
+        self.item_fingerprints: dict[str, ItemFingerprint] = {}
+        self.item_listener: EventBusListener | None = None
+
     async def on_connected(self, context: OpenhabContext) -> None:
         # The context will be created fresh for each connect
         if not context.created_items and not context.created_things:
             await self.load_items(context)
             await self.load_things(context)
 
+            # Items which are changed through events have to be mapped again on the next load
+            if self.item_listener is None:
+                self.item_listener = EventBusListener(
+                    TOPIC_ITEMS, wrap_func(self.item_event_received), NoEventFilter()
+                )
+                EventBus.add_listener(self.item_listener)
+
         # We create the same plugin twice because it uses the same logic to load the objects,
         # One plugin instance will create the objects the other one will sync the state.
         # That's why this is in the else branch
@@ -66,41 +116,91 @@ class LoadOpenhabItemsPlugin(BaseConnectionPlugin[OpenhabConnection]):
                 else:
                     log.warning('Thing sync failed!')
 
+    async def on_disconnected(self) -> None:
+        if self.item_listener is not None:
+            self.item_listener.cancel()
+            self.item_listener = None
+
+    async def item_event_received(self, event: Any) -> None:
+        if isinstance(event, (ItemAddedEvent, ItemUpdatedEvent, ItemRemovedEvent)):
+            self.item_fingerprints.pop(event.name, None)
+
     async def load_items(self, context: OpenhabContext) -> None:
         from HABApp.openhab.map_items import map_item
         OpenhabItem = HABApp.openhab.items.OpenhabItem
 
         log.debug('Requesting items')
-        items = await async_get_items()
-        items_len = len(items)
-        log.debug(f'Got response with {items_len} items')
-
-        fresh_item_sync()
 
-        # add all items
-        for item in items:
-            new_item = map_item(
-                item.name, item.type, map_null_str(item.state), item.label,
-                frozenset(item.tags), frozenset(item.groups), item.metadata
-            )
-
-            # error
-            if new_item is None:
-                continue
-            add_to_registry(new_item, set_value=True)
+        # The items are streamed and processed in chunks, so we don't need to keep the whole response in memory
+        # and other tasks can run between the chunks
+        soll: set[str] = set()
+        created_items: dict[str, tuple[OpenhabItem, InstantView]] = {}
+        fingerprints = self.item_fingerprints
+        chunks = changed = 0
+        dur_request = dur_validate = dur_map = 0.0
+
+        ts = monotonic()
+        async for chunk in async_iter_items_json(ITEMS_CHUNK_SIZE):
+            ts_validate = monotonic()
+            dur_request += ts_validate - ts
+
+            items = ItemRespList.validate_json(b'[' + b','.join(chunk) + b']')
+            ts_map = monotonic()
+            dur_validate += ts_map - ts_validate
+
+            # add all items
+            for item in items:
+                name = item.name
+                soll.add(name)
+                state = map_null_str(item.state)
+
+                # If the definition is unchanged only the state has to be updated
+                fingerprint = get_item_fingerprint(item)
+                if fingerprints.get(name) == fingerprint and Items.item_exists(name) and \
+                        isinstance(existing := Items.get_item(name), OpenhabItem):
+                    existing.set_value(get_value_from_state(existing, item.type, state))
+                    created_items[name] = (existing, existing.last_update)
+                    continue
+
+                changed += 1
+                new_item = map_item(
+                    name, item.type, state, item.label,
+                    frozenset(item.tags), frozenset(item.groups), item.metadata
+                )
+
+                # error
+                if new_item is None:
+                    fingerprints.pop(name, None)
+                    continue
+                add_to_registry(new_item, set_value=True)
+
+                fingerprints[name] = fingerprint
+                created = Items.get_item(name)
+                created_items[name] = (created, created.last_update)
+
+            chunks += 1
+            dur_map += monotonic() - ts_map
+
+            # give other tasks the chance to run
+            await sleep(0)
+            ts = monotonic()
+
+        dur_request += monotonic() - ts
+        items_len = len(soll)
+        log.debug(f'Got response with {items_len} items')
+        log.debug(f'Loaded items in {chunks:d} chunks ({changed:d} changed): request {dur_request:.3f}s, '
+                  f'validation {dur_validate:.3f}s, mapping {dur_map:.3f}s')
 
         # remove items which are no longer available
+        for name in fingerprints.keys() - soll:
+            fingerprints.pop(name)
         ist = set(Items.get_item_names())
-        soll = {item.name for item in items}
         for k in ist - soll:
             if isinstance(Items.get_item(k), OpenhabItem):
                 remove_from_registry(k)
 
         log.info(f'Updated {items_len:d} Items')
 
-        created_items: dict[str, tuple[OpenhabItem, InstantView]] = {
-            i.name: (i, i.last_update) for i in Items.get_items() if isinstance(i, OpenhabItem)
-        }
         context.created_items.update(created_items)
 
     async def sync_items(self, context: OpenhabContext):
@@ -116,12 +216,7 @@ class LoadOpenhabItemsPlugin(BaseConnectionPlugin[OpenhabConnection]):
                 continue
 
             existing_item, existing_item_update = created_items[item.name]
-
-            # UoM item handling
-            if item.type.startswith('Number:'):
-                new_value = QuantityTypeModel.get_value_from_state(new_state)
-            else:
-                new_value = existing_item._state_from_oh_str(new_state)
+            new_value = get_value_from_state(existing_item, item.type, new_state)
 
             if existing_item.value != new_value and existing_item.last_update == existing_item_update:
                 existing_item.value = new_value
@@ -1,21 +1,25 @@
 from __future__ import annotations
 
-from asyncio import Queue, QueueEmpty, sleep
+from asyncio import Queue, QueueEmpty, gather, sleep
 from typing import TYPE_CHECKING, Any, Final, Literal
 
+from HABApp.config import CONFIG
 from HABApp.core.asyncio import run_func_from_async
 from HABApp.core.connections import BaseConnectionPlugin
 from HABApp.core.errors import ItemNotFoundException
 from HABApp.core.internals import ItemRegistryItem, uses_get_item
-from HABApp.core.lib import SingleTask
+from HABApp.core.lib import OutgoingQueue, OutgoingQueueStats, SingleTask
 from HABApp.core.logger import log_error, log_info, log_warning
 from HABApp.openhab.connection.connection import OpenhabConnection, OpenhabContext
 from HABApp.openhab.connection.handler import convert_to_oh_str, post, put
+from HABApp.openhab.connection.out_queue import get_http_event_key
 from HABApp.openhab.definitions.websockets import ItemCommandSendEvent, ItemStateSendEvent
 from HABApp.openhab.definitions.websockets.item_value_types import RawTypeModel
 
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from HABApp.openhab.definitions.websockets.base import BaseOutEvent
     from HABApp.openhab.items import OpenhabItem
 
@@ -24,12 +28,19 @@ get_item = uses_get_item()
 
 
 def empty_queue(queue: Queue) -> None:
-    if queue is not None:
-        try:
-            while True:
-                queue.get_nowait()
-        except QueueEmpty:
-            pass
+    if queue is None:
+        return None
+
+    if isinstance(queue, OutgoingQueue):
+        queue.clear()
+        return None
+
+    try:
+        while True:
+            queue.get_nowait()
+    except QueueEmpty:
+        pass
+    return None
 
 
 class OutgoingCommandsPlugin(BaseConnectionPlugin[OpenhabConnection]):
@@ -38,7 +49,7 @@ class OutgoingCommandsPlugin(BaseConnectionPlugin[OpenhabConnection]):
         super().__init__(name)
 
         self.queue: Queue[BaseOutEvent] | None = None
-        self.http_queue: Queue[tuple[str, str, bool]] | None = None
+        self.http_queues: tuple[OutgoingQueue[tuple[str, str, bool]], ...] = ()
 
         self.task_http_worker: Final = SingleTask(self.http_queue_worker, 'OhHttpQueueWorker')
         self.task_watcher_websocket: Final = SingleTask(self.websocket_queue_watcher, 'OhWebsocketQueueWatcher')
@@ -46,29 +57,51 @@ class OutgoingCommandsPlugin(BaseConnectionPlugin[OpenhabConnection]):
 
     async def on_connected(self, context: OpenhabContext) -> None:
         self.queue: Queue[BaseOutEvent] = context.out_queue
-        self.http_queue: Queue[tuple[str, str, bool]] = Queue()
+        self.http_queues = tuple(
+            OutgoingQueue(get_http_event_key, coalesce=CONFIG.openhab.general.coalesce_updates)
+            for _ in range(CONFIG.openhab.connection.http_workers)
+        )
 
         self.task_http_worker.start()
         self.task_watcher_http.start()
-        self.task_http_worker.start()
+        self.task_watcher_websocket.start()
 
     async def on_disconnected(self) -> None:
         queue = self.queue
         self.queue = None
-        http_queue = self.http_queue
-        self.http_queue = None
+        http_queues = self.http_queues
+        self.http_queues = ()
 
         await self.task_http_worker.cancel_wait()
         await self.task_watcher_http.cancel_wait()
-        await self.task_http_worker.cancel_wait()
+        await self.task_watcher_websocket.cancel_wait()
 
         empty_queue(queue)
-        empty_queue(http_queue)
+        for http_queue in http_queues:
+            empty_queue(http_queue)
+
+    def get_queue_stats(self) -> dict[str, OutgoingQueueStats]:
+        """Return the statistics of the outgoing queues"""
+        queues: list[tuple[str, Queue | None]] = [('websocket', self.queue)]
+        if len(self.http_queues) == 1:
+            queues.append(('http', self.http_queues[0]))
+        else:
+            queues.extend((f'http{i:d}', queue) for i, queue in enumerate(self.http_queues))
+
+        return {name: queue.get_stats() for name, queue in queues if isinstance(queue, OutgoingQueue)}
+
+    def get_http_queue(self, item: str) -> OutgoingQueue[tuple[str, str, bool]] | None:
+        # All messages of an item are always processed by the same worker so they are sent in order
+        if not (queues := self.http_queues):
+            return None
+        if len(queues) == 1:
+            return queues[0]
+        return queues[hash(item) % len(queues)]
 
     async def http_queue_worker(self) -> None:
+        await gather(*(self._http_worker(queue) for queue in self.http_queues))
 
-        queue: Final = self.http_queue
-
+    async def _http_worker(self, queue: OutgoingQueue[tuple[str, str, bool]]) -> None:
         while True:
             try:
                 while True:
@@ -94,7 +127,7 @@ class OutgoingCommandsPlugin(BaseConnectionPlugin[OpenhabConnection]):
             item = item.name
         if not isinstance(state, str):
             state = convert_to_oh_str(state)
-        if (queue := self.http_queue) is None:
+        if (queue := self.get_http_queue(item)) is None:
             return None
         queue.put_nowait((item, state, False))
 
@@ -103,7 +136,7 @@ class OutgoingCommandsPlugin(BaseConnectionPlugin[OpenhabConnection]):
             item = item.name
         if not isinstance(state, str):
             state = convert_to_oh_str(state)
-        if (queue := self.http_queue) is None:
+        if (queue := self.get_http_queue(item)) is None:
             return None
         queue.put_nowait((item, state, True))
 
@@ -115,10 +148,10 @@ class OutgoingCommandsPlugin(BaseConnectionPlugin[OpenhabConnection]):
         # Workaround for big message sizes
         # https://github.com/openhab/openhab-core/issues/4587
         if isinstance(event.payload, RawTypeModel):
-            if (http_queue := self.http_queue) is None:
-                return None
             # 'openhab/items/<NAME>/<state|command>'
             _, _, name, action = event.topic.split('/')
+            if (http_queue := self.get_http_queue(name)) is None:
+                return None
             http_queue.put_nowait((name, event.payload.value, action == 'command'))
             return None
 
@@ -127,12 +160,12 @@ class OutgoingCommandsPlugin(BaseConnectionPlugin[OpenhabConnection]):
         queue.put_nowait(event)
 
     async def websocket_queue_watcher(self) -> None:
-        await self._queue_watcher(self.queue, 'websocket')
+        await self._queue_watcher((self.queue, ), 'websocket')
 
     async def http_queue_watcher(self) -> None:
-        await self._queue_watcher(self.http_queue, 'http')
+        await self._queue_watcher(self.http_queues, 'http')
 
-    async def _queue_watcher(self, queue: Queue, name: str) -> None:
+    async def _queue_watcher(self, queues: Sequence[Queue], name: str) -> None:
         log = self.plugin_connection.log
         first_msg_at = 150
 
@@ -142,13 +175,18 @@ class OutgoingCommandsPlugin(BaseConnectionPlugin[OpenhabConnection]):
 
         while True:
             await sleep(10)
-            size = queue.qsize()
+            size = sum(queue.qsize() for queue in queues)
 
             # small log msg
             if size > upper:
                 upper = size * 2
                 lower = size // 2
-                log_warning(log, f'{size} messages in {name:s} queue')
+                details = ''
+                if stats := [queue.get_stats() for queue in queues if isinstance(queue, OutgoingQueue)]:
+                    age = max(s.age for s in stats)
+                    coalesced = sum(s.coalesced for s in stats)
+                    details = f' (oldest: {age:.1f}s, coalesced: {coalesced:d})'
+                log_warning(log, f'{size} messages in {name:s} queue{details:s}')
             elif size < lower:
                 upper = max(size / 2, first_msg_at)
                 lower = size // 2
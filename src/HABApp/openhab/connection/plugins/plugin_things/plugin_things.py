@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import json
 import time
+from hashlib import blake2b
 from pathlib import Path
 from typing import Any
 
@@ -20,6 +22,7 @@ from HABApp.openhab.connection.plugins.plugin_things.filters import (
 )
 
 from ._log import log
+from .cfg_validator import UserItem
 from .file_writer import ItemsFileWriter
 from .item_worker import cleanup_items, create_item
 from .thing_worker import update_thing_cfg
@@ -29,6 +32,12 @@ class DuplicateItemError(Exception):
     pass
 
 
+def create_checksum(text: str) -> bytes:
+    b = blake2b()
+    b.update(text.encode())
+    return b.digest()
+
+
 class TextualThingConfigPlugin(BaseConnectionPlugin[OpenhabConnection]):
 
     def __init__(self) -> None:
@@ -40,6 +49,13 @@ class TextualThingConfigPlugin(BaseConnectionPlugin[OpenhabConnection]):
 
         self.cache_ts: float = 0.0
         self.cache_cfg: list[dict[str, Any]] = []
+        self.cache_checksum: bytes = b''
+        self.cache_checksum_for: list[dict[str, Any]] | None = None
+
+        # file name -> checksum of the file content and the thing data of the last successful run
+        self.file_checksums: dict[str, bytes] = {}
+        # file name -> item name -> item configuration that was successfully sent to openHAB
+        self.applied_items: dict[str, dict[str, UserItem]] = {}
 
     async def on_setup(self):
         path = HABApp.CONFIG.directories.config
@@ -68,6 +84,10 @@ class TextualThingConfigPlugin(BaseConnectionPlugin[OpenhabConnection]):
         if self.watcher is None:
             return None
 
+        # openHAB might have been restarted, so everything has to be checked again
+        self.file_checksums.clear()
+        self.applied_items.clear()
+
         await self.load_thing_data(always=True)
         await self.watcher.trigger_all()
 
@@ -84,6 +104,13 @@ class TextualThingConfigPlugin(BaseConnectionPlugin[OpenhabConnection]):
             self.cache_ts = time.time()
         return self.cache_cfg
 
+    def get_thing_data_checksum(self) -> bytes:
+        # the thing data only changes when it is requested again, so the checksum can be cached
+        if self.cache_checksum_for is not self.cache_cfg:
+            self.cache_checksum = create_checksum(json.dumps(self.cache_cfg, sort_keys=True))
+            self.cache_checksum_for = self.cache_cfg
+        return self.cache_checksum
+
     async def file_load(self, name: str, path: Path):
         # we have to check the naming structure because we get file events for the whole folder
         _name = path.name.lower()
@@ -94,9 +121,30 @@ class TextualThingConfigPlugin(BaseConnectionPlugin[OpenhabConnection]):
         # only load if we don't supply the data
         data = await self.load_thing_data(always=False)
 
+        # we also get events when the file gets deleted
+        if not path.is_file():
+            self.created_items.pop(path.name, None)
+            self.file_checksums.pop(path.name, None)
+            self.applied_items.pop(path.name, None)
+            self.do_cleanup.reset()
+            log.debug(f'File {path} does not exist -> skipping Thing configuration!')
+            return None
+
+        with path.open(mode='r', encoding='utf-8') as file:
+            text = file.read()
+
+        # Skip the file if neither the file nor the things have changed since the last run
+        checksum = create_checksum(text) + self.get_thing_data_checksum()
+        if self.file_checksums.get(path.name) == checksum:
+            log.debug(f'{name} and things are unchanged -> skipping Thing configuration!')
+            return None
+        self.file_checksums.pop(path.name, None)
+
         # remove created items
         self.created_items.pop(path.name, None)
         created_items = self.created_items.setdefault(path.name, set())
+        applied_items = self.applied_items.pop(path.name, {})
+        new_applied_items: dict[str, UserItem] = {}
 
         # shedule cleanup
         self.do_cleanup.reset()
@@ -105,19 +153,14 @@ class TextualThingConfigPlugin(BaseConnectionPlugin[OpenhabConnection]):
         items_file_path = path.with_suffix('.items')
         items_file_writer = ItemsFileWriter()
 
-        # we also get events when the file gets deleted
-        if not path.is_file():
-            log.debug(f'File {path} does not exist -> skipping Thing configuration!')
-            return None
         log.debug(f'Loading {name}!')
 
         # load the config file
-        with path.open(mode='r', encoding='utf-8') as file:
-            try:
-                cfg = HABApp.core.const.yml.load(file)
-            except Exception as e:
-                HABAppError(log).add_exception(e).dump()
-                return None
+        try:
+            cfg = HABApp.core.const.yml.load(text)
+        except Exception as e:
+            HABAppError(log).add_exception(e).dump()
+            return None
 
         # validate configuration
         cfg = validate_cfg(cfg, path.name)
@@ -129,6 +172,7 @@ class TextualThingConfigPlugin(BaseConnectionPlugin[OpenhabConnection]):
             log_overview(data, THING_ALIAS, 'Thing overview')
 
         # process each thing part in the cfg
+        completed = True
         for cfg_entry in cfg:
             test: bool = cfg_entry.test
             things = list(apply_filters(cfg_entry.filter, data, test))
@@ -138,9 +182,9 @@ class TextualThingConfigPlugin(BaseConnectionPlugin[OpenhabConnection]):
                 log_warning(log, f'No things matched for {cfg_entry.filter}')
                 continue
 
-            # update thing configuration
-            if cfg_entry.thing_config:
-                await update_thing_cfg(cfg_entry.thing_config, things, test)
+            # update thing configuration, the thing data has only to be requested again if it was changed
+            if cfg_entry.thing_config and await update_thing_cfg(cfg_entry.thing_config, things, test):
+                self.cache_cfg = []
 
             try:
                 # item creation for every thing
@@ -183,21 +227,34 @@ class TextualThingConfigPlugin(BaseConnectionPlugin[OpenhabConnection]):
                         log.info('')
             except InvalidItemNameError as e:
                 HABAppError(log).add_exception(e).dump()
+                completed = False
                 continue
             except DuplicateItemError as e:
                 # Duplicates should never happen, the user clearly made a mistake, that's why we exit here
                 HABAppError(log).add_exception(e).dump()
                 return None
 
-            # Create all items
+            # Create all items, items which have already been sent with the same configuration are skipped
             for item_cfg in create_items.values():
-                created = await create_item(item_cfg, test)
+                name = item_cfg.name
+                if not test and applied_items.get(name) == item_cfg:
+                    created = True
+                else:
+                    created = await create_item(item_cfg, test)
                 if created:
-                    created_items.add(item_cfg.name)
+                    created_items.add(name)
+                    new_applied_items[name] = item_cfg
+                elif not test:
+                    completed = False
 
             self.do_cleanup.reset()
 
             items_file_writer.add_items(create_items.values())
-            self.cache_cfg = []
+            if test:
+                completed = False
 
         items_file_writer.create_file(items_file_path)
+
+        self.applied_items[path.name] = new_applied_items
+        if completed:
+            self.file_checksums[path.name] = checksum
@@ -23,7 +23,8 @@ def show_config_overview(cfgs: list[ThingConfigChanger], all_params) -> None:
         log.info(line)
 
 
-async def update_thing_cfg(target_cfg, things, test: bool):
+async def update_thing_cfg(target_cfg, things, test: bool) -> bool:
+    """Update the thing configuration and return True if a configuration was sent to openHAB"""
 
     cfgs = [ThingConfigChanger.from_dict(k['UID'], k.get('configuration', {})) for k in things]
     cur_vals = tuple(k.get_dict(filter=True) for k in cfgs)
@@ -51,6 +52,7 @@ async def update_thing_cfg(target_cfg, things, test: bool):
             show_config_overview(cfgs, all_params)
 
     # update the thing configs. If nothing has changed this will do nothing
+    changed = False
     for c in cfgs:
         # do not create partially correct configs
         if c in skip_cfg:
@@ -63,6 +65,7 @@ async def update_thing_cfg(target_cfg, things, test: bool):
             else:
                 log.info(f'Nothing changed for {c.uid}')
         else:
+            changed = changed or bool(c.new)
             await c.update_thing_cfg()
 
-    return None
+    return changed
@@ -1,16 +1,17 @@
 from __future__ import annotations
 
 import logging
-from asyncio import Queue, sleep
+from asyncio import Event, Queue, sleep
 from base64 import b64encode
-from inspect import isclass
-from typing import Annotated, Final, get_args, get_origin
+from collections import deque
+from typing import Any, Final
 
 from aiohttp import BasicAuth, ClientError, ClientWebSocketResponse, WSMsgType
 from pydantic import ValidationError
 
 import HABApp
 from HABApp.core.connections import BaseConnectionPlugin
+from HABApp.core.const import loop
 from HABApp.core.const.const import PYTHON_311
 from HABApp.core.const.log import TOPIC_EVENTS
 from HABApp.core.internals import uses_item_registry
@@ -19,12 +20,12 @@ from HABApp.core.logger import HABAppError, HABAppWarning
 from HABApp.openhab.connection.connection import OpenhabConnection, OpenhabContext
 from HABApp.openhab.definitions.websockets import (
     OPENHAB_EVENT_TYPE,
-    OPENHAB_EVENT_TYPE_ADAPTER,
     WebsocketHeartbeatEvent,
     WebsocketSendTypeFilter,
     WebsocketTopicEnum,
 )
 from HABApp.openhab.definitions.websockets.base import BaseModel, BaseOutEvent
+from HABApp.openhab.definitions.websockets.parser import OpenhabEventParser, get_event_type_names
 from HABApp.openhab.process_events import on_openhab_event
 
 
@@ -52,6 +53,8 @@ class WebsocketPlugin(BaseConnectionPlugin[OpenhabConnection]):
 
         self._sent_events: Final[dict[str, BaseOutEvent]] = {}
 
+        self.parser: OpenhabEventParser | None = None
+
     async def on_connected(self, context: OpenhabContext) -> None:
         self.queue: Queue[BaseOutEvent] = context.out_queue
         self.task.start()
@@ -151,33 +154,7 @@ class WebsocketPlugin(BaseConnectionPlugin[OpenhabConnection]):
 
     @staticmethod
     def _get_event_type_names_from_union(union: type[BaseModel]) -> list[str]:
-        names = set()
-
-        objs = [get_args(union)[0]]
-
-        while objs:
-            obj = objs.pop(0)
-
-            if isclass(obj) and issubclass(obj, BaseModel):
-                literal = obj.model_fields['type'].annotation
-                literal_value = get_args(literal)
-                if len(literal_value) != 1:
-                    msg = f'Expected exactly one literal value for {literal!r}'
-                    raise ValueError(msg)
-                names.add(literal_value[0])
-                continue
-
-            if get_origin(obj) is Annotated:
-                objs.append(get_args(obj)[0])
-                continue
-
-            new = get_args(obj)
-            if not new:
-                msg = f'Expected args for {obj!r}'
-                raise ValueError(msg)
-            objs.extend(new)
-
-        return sorted(names)
+        return sorted(get_event_type_names(union))
 
     async def _setup_websocket_filter(self, ws: ClientWebSocketResponse, log: logging.Logger) -> None:
         # setup event type filter
@@ -218,21 +195,41 @@ class WebsocketPlugin(BaseConnectionPlugin[OpenhabConnection]):
         if (ws := self._websocket) is None:
             return None
 
-        # cache so we don't have to look up every event
-        _on_openhab_event = on_openhab_event
         log = self.plugin_connection.log
-        log_events = logging.getLogger(f'{TOPIC_EVENTS}.openhab')
-        debug_lvl = logging.DEBUG
+        ws_cfg = HABApp.CONFIG.openhab.connection.websocket
 
         # Setup event filter
         await self._setup_websocket_filter(ws, log)
 
+        if self.parser is None:
+            self.parser = OpenhabEventParser()
+
+        try:
+            if not ws_cfg.pipeline:
+                await self._websocket_receiver(ws, None)
+            else:
+                frames: deque[str] = deque()
+                wakeup = Event()
+                async with TaskGroup() as tg:
+                    tg.create_task(self._websocket_receiver(ws, (frames, wakeup)))
+                    tg.create_task(self._websocket_parser(frames, wakeup, ws_cfg.pipeline_batch_size))
+        finally:
+            if log.isEnabledFor(logging.DEBUG) and (stats := self.parser.get_stats()):
+                log.debug('Websocket event parse time:')
+                for name, info in stats.items():
+                    log.debug(f' - {name:s}: {info.count:d} events, {info.errors:d} errors, '
+                              f'avg {info.avg * 1000:.3f}ms, max {info.max * 1000:.3f}ms')
+
+    async def _websocket_receiver(self, ws: ClientWebSocketResponse,
+                                  pipeline: tuple[deque[str], Event] | None) -> None:
+        log = self.plugin_connection.log
+        log_events = logging.getLogger(f'{TOPIC_EVENTS}.openhab')
+        debug_lvl = logging.DEBUG
+        parser = self.parser
+
         # Websocket constants
         ws_type_text = WSMsgType.TEXT
         ws_type_close = WSMsgType.CLOSED
-        topic_heartbeat = WebsocketTopicEnum.HEARTBEAT
-        topic_error = WebsocketTopicEnum.REQUEST_FAILED
-        topic_success = WebsocketTopicEnum.REQUEST_SUCCESS
 
         while True:
             msg = await ws.receive()
@@ -249,45 +246,84 @@ class WebsocketPlugin(BaseConnectionPlugin[OpenhabConnection]):
             if log_events.isEnabledFor(debug_lvl):
                 log_events._log(debug_lvl, data, ())
 
-            try:
-                oh_event = OPENHAB_EVENT_TYPE_ADAPTER.validate_json(data)
-            except ValidationError as e:
-                HABAppError(log).add(f'Input: {data:s}').add_exception(e).dump()
-                continue
-
-            # Websocket events are not processed by the event bus
-            if oh_event.type == 'WebSocketEvent':
-                topic = oh_event.topic
-
-                # confirmation that the event was processed
-                if topic == topic_success:
-                    self._sent_events.pop(oh_event.event_id, None)
-                    continue
-
-                # Error processing the sent event
-                if topic == topic_error:
-                    err_log = HABAppError(log)
-                    err_log.add('Request failed!')
-                    if (send_obj := self._sent_events.get(oh_event.event_id)) is not None:
-                        err_log.add(f'Sent    : {send_obj.model_dump_json(by_alias=True, exclude_none=True):s}')
-                    err_log.add(f'Received: {data}').add(f'{oh_event}').dump()
-                    self._sent_events.pop(oh_event.event_id, None)
-                    continue
-
-                if topic == topic_heartbeat:
-                    continue
-
-                log.debug(f'Receive: {data}')
-                log.debug(str(oh_event))
+            # In pipeline mode the messages are parsed in another task
+            if pipeline is not None:
+                frames, wakeup = pipeline
+                frames.append(data)
+                wakeup.set()
                 continue
 
             try:
-                event = oh_event.to_event()
-            except ValueError as e:
-                HABAppError(log).add(f'Input: {data:s}').add(f'{e} ({type(e)}').dump()
+                oh_event = parser.parse(data)
+            except ValidationError as e:
+                HABAppError(log).add(f'Input: {data:s}').add_exception(e).dump()
                 continue
 
-            _on_openhab_event(event)
+            self._process_event(data, oh_event)
 
         # We need to raise an error otherwise the task group will not exit
         raise WebSocketClosedError()
+
+    async def _websocket_parser(self, frames: deque[str], wakeup: Event, batch_size: int) -> None:
+        log = self.plugin_connection.log
+        parser = self.parser
+
+        while True:
+            await wakeup.wait()
+            wakeup.clear()
+
+            while frames:
+                batch = [frames.popleft() for _ in range(min(batch_size, len(frames)))]
+
+                # Only use a thread if there is more than one message, otherwise the overhead is too big
+                if len(batch) == 1:
+                    results = parser.parse_batch(batch)
+                else:
+                    results = await loop.run_in_executor(None, parser.parse_batch, batch)
+
+                for data, oh_event in zip(batch, results, strict=True):
+                    if isinstance(oh_event, ValidationError):
+                        HABAppError(log).add(f'Input: {data:s}').add_exception(oh_event).dump()
+                        continue
+                    self._process_event(data, oh_event)
+
+                # give other tasks the chance to run
+                await sleep(0)
+
+    def _process_event(self, data: str, oh_event: Any) -> None:
+        # Websocket events are not processed by the event bus
+        if oh_event.type == 'WebSocketEvent':
+            topic = oh_event.topic
+
+            # confirmation that the event was processed
+            if topic == WebsocketTopicEnum.REQUEST_SUCCESS:
+                self._sent_events.pop(oh_event.event_id, None)
+                return None
+
+            log = self.plugin_connection.log
+
+            # Error processing the sent event
+            if topic == WebsocketTopicEnum.REQUEST_FAILED:
+                err_log = HABAppError(log)
+                err_log.add('Request failed!')
+                if (send_obj := self._sent_events.get(oh_event.event_id)) is not None:
+                    err_log.add(f'Sent    : {send_obj.model_dump_json(by_alias=True, exclude_none=True):s}')
+                err_log.add(f'Received: {data}').add(f'{oh_event}').dump()
+                self._sent_events.pop(oh_event.event_id, None)
+                return None
+
+            if topic == WebsocketTopicEnum.HEARTBEAT:
+                return None
+
+            log.debug(f'Receive: {data}')
+            log.debug(str(oh_event))
+            return None
+
+        try:
+            event = oh_event.to_event()
+        except ValueError as e:
+            HABAppError(self.plugin_connection.log).add(f'Input: {data:s}').add(f'{e} ({type(e)}').dump()
+            return None
+
+        on_openhab_event(event)
+        return None
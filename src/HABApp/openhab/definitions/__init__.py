@@ -5,3 +5,4 @@ from .things import ThingStatusDetailEnum, ThingStatusEnum
 # isort: split
 
 from . import rest
+from .helpers import OpenhabItemDefinition, OpenhabItemsCreateResult
@@ -1,2 +1,3 @@
 from .persistence_data import OpenhabPersistenceData
 from .log_table import Table
+from .item_definition import OpenhabItemDefinition, OpenhabItemsCreateResult
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from HABApp.openhab.definitions.items import GROUP_ITEM_FUNCTIONS, ITEM_DIMENSIONS, ITEM_TYPES
+
+
+if TYPE_CHECKING:
+    from HABApp.openhab.definitions.rest import ItemResp
+
+
+@dataclass(frozen=True)
+class OpenhabItemDefinition:
+    """Definition of an openHAB item which can be created in bulk
+
+    :param type: item type, e.g. ``Number`` or ``Number:Temperature``
+    :param name: item name
+    :param label: item label
+    :param category: item category
+    :param tags: item tags
+    :param groups: in which groups is the item
+    :param group_type: what kind of group is it
+    :param group_function: group state aggregation function
+    :param group_function_params: params for group state aggregation
+    :param metadata: namespace -> value or (value, config), e.g. ``{"stateDescription": ("", {"pattern": "%d"})}``
+    :param link: channel uid which will be linked to the item
+    """
+
+    type: str
+    name: str
+    label: str | None = None
+    category: str | None = None
+    tags: tuple[str, ...] = ()
+    groups: tuple[str, ...] = ()
+    group_type: str | None = None
+    group_function: str | None = None
+    group_function_params: tuple[str, ...] = ()
+    metadata: dict[str, str | tuple[str, dict[str, Any]]] = field(default_factory=dict)
+    link: str | None = None
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.name, str) or not self.name:
+            msg = f'Invalid item name: {self.name!r}'
+            raise ValueError(msg)
+
+        _type, _, _unit = self.type.partition(':')
+        if _type not in ITEM_TYPES:
+            msg = f'{_type} is not an openHAB type: {", ".join(ITEM_TYPES)}'
+            raise ValueError(msg)
+        if _unit and _unit not in ITEM_DIMENSIONS:
+            msg = f'{_unit} is not a valid openHAB unit: {", ".join(ITEM_DIMENSIONS)}'
+            raise ValueError(msg)
+
+        if self.group_type or self.group_function or self.group_function_params:
+            if self.type != 'Group':
+                msg = f'Item type must be "Group"! Is: {self.type}'
+                raise ValueError(msg)
+            if self.group_function and self.group_function not in GROUP_ITEM_FUNCTIONS:
+                msg = f'{self.group_function} is not a group function: {", ".join(GROUP_ITEM_FUNCTIONS)}'
+                raise ValueError(msg)
+
+        # allow lists, so the definitions can easily be built from configuration files
+        for name in ('tags', 'groups', 'group_function_params'):
+            if not isinstance(value := getattr(self, name), tuple):
+                object.__setattr__(self, name, tuple(value))
+
+    def get_metadata(self) -> dict[str, tuple[str, dict[str, Any]]]:
+        """Return the metadata as namespace -> (value, config)"""
+        return {ns: (cfg, {}) if isinstance(cfg, str) else cfg for ns, cfg in self.metadata.items()}
+
+    def item_differs(self, item: ItemResp) -> bool:
+        """Return ``True`` if the item definition in openHAB is different from this definition"""
+        if item.type != self.type or (item.label or '') != (self.label or '') or \
+                (item.category or '') != (self.category or '') or \
+                set(item.tags) != set(self.tags) or set(item.groups) != set(self.groups):
+            return True
+
+        if self.type != 'Group':
+            return False
+
+        if (item.group_type or None) != (self.group_type or None):
+            return True
+        if (func := item.group_function) is None:
+            return self.group_function is not None
+        return func.name != self.group_function or tuple(func.params) != self.group_function_params
+
+
+@dataclass(frozen=True)
+class OpenhabItemsCreateResult:
+    created: tuple[str, ...]        #: Items that did not exist and were created
+    updated: tuple[str, ...]        #: Items where the definition, metadata or link was changed
+    unchanged: tuple[str, ...]      #: Items that were already correct
+    failed: dict[str, Exception]    #: Items where an operation failed -> the error
@@ -1,53 +1,284 @@
-from datetime import datetime
-from typing import Optional
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from math import floor, fsum
+from threading import Lock
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Final, Literal, Optional
 
 from fastnumbers import try_real
 
-from HABApp.openhab.definitions.rest import ItemHistoryResp
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
+    from HABApp.openhab.definitions.rest import ItemHistoryResp
 
 
 OPTIONAL_DT = Optional[datetime]
+AGGREGATE_FUNCS = Literal['mean', 'min', 'max', 'sum', 'count', 'first', 'last']
+
+
+def _mean(values: list) -> float:
+    return fsum(values) / len(values)
+
+
+_AGGREGATE_FUNCS: Final[dict[str, Callable[[list], Any]]] = {
+    'mean': _mean,
+    'min': min,
+    'max': max,
+    'sum': fsum,
+    'count': len,
+    'first': lambda x: x[0],
+    'last': lambda x: x[-1],
+}
+
+
+class _DataDict(dict):
+    """Dict which caches the data as sorted columns. The columns are dropped when the dict is modified."""
+
+    __slots__ = ('_columns', )
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._columns: tuple[list[float], array | list] | None = None
+
+    def __setitem__(self, key: float, value: Any) -> None:
+        self._columns = None
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key: float) -> None:
+        self._columns = None
+        super().__delitem__(key)
+
+    def __ior__(self, other: Any) -> _DataDict:
+        self._columns = None
+        return super().__ior__(other)
+
+    def clear(self) -> None:
+        self._columns = None
+        super().clear()
+
+    def pop(self, *args: Any) -> Any:
+        self._columns = None
+        return super().pop(*args)
+
+    def popitem(self) -> tuple[float, Any]:
+        self._columns = None
+        return super().popitem()
+
+    def setdefault(self, key: float, default: Any = None) -> Any:
+        self._columns = None
+        return super().setdefault(key, default)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        self._columns = None
+        super().update(*args, **kwargs)
+
+
+def _create_columns(data: dict[float, Any]) -> tuple[list[float], array | list]:
+    timestamps = sorted(data)
+    values = [data[ts] for ts in timestamps]
+    # bools are ints, so they must be checked explicitly
+    if all(type(v) is float or type(v) is int for v in values):
+        try:
+            return timestamps, array('d', values)
+        except OverflowError:
+            pass
+    return timestamps, values
 
 
 class OpenhabPersistenceData:
+    """Data returned from the openHAB persistence service.
+    The data is additionally kept as columns which are sorted by the timestamp, so time ranges can be found with
+    bisect. Numeric values are stored in a float array, so aggregated values of numeric data are floats.
+
+    :ivar data: timestamp (seconds since epoch) -> value
+    """
 
     def __init__(self) -> None:
-        self.data: dict[float, int | float | str] = {}
+        self.data: dict[float, int | float | str] = _DataDict()
 
     @classmethod
-    def from_resp(cls, data: ItemHistoryResp) -> 'OpenhabPersistenceData':
+    def from_resp(cls, data: ItemHistoryResp) -> OpenhabPersistenceData:
         c = cls()
-        for entry in data.data:
+        # openHAB returns the data sorted, but we must not rely on it
+        for entry in sorted(data.data, key=lambda x: x.time):
             # calc as timestamp
             time = entry.time / 1000
             c.data[time] = try_real(entry.state)
         return c
 
-    def get_data(self, start_date: OPTIONAL_DT = None, end_date: OPTIONAL_DT = None):
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} len: {len(self):d}>'
+
+    def _get_columns(self) -> tuple[list[float], array | list]:
+        if not isinstance(data := self.data, _DataDict):
+            # data was replaced with a regular dict, so we can't cache the columns
+            return _create_columns(data)
+        if (columns := data._columns) is None:
+            columns = data._columns = _create_columns(data)
+        return columns
+
+    def _get_slice(self, start_date: OPTIONAL_DT, end_date: OPTIONAL_DT) -> slice:
+        timestamps = self._get_columns()[0]
+        start = 0 if start_date is None else bisect_left(timestamps, start_date.timestamp())
+        end = len(timestamps) if end_date is None else bisect_right(timestamps, end_date.timestamp())
+        return slice(start, end)
+
+    def _get_values(self, start_date: OPTIONAL_DT, end_date: OPTIONAL_DT) -> array | list:
+        values = self._get_columns()[1]
+        if start_date is None and end_date is None:
+            return values
+        return values[self._get_slice(start_date, end_date)]
+
+    def get_data(self, start_date: OPTIONAL_DT = None, end_date: OPTIONAL_DT = None) -> dict[float, Any]:
+        """Return the data as timestamp -> value
+
+        :param start_date: only values which are newer or equal than this
+        :param end_date: only values which are older or equal than this
+        """
         if start_date is None and end_date is None:
             return self.data
 
-        filter_start = start_date.timestamp() if start_date else None
-        filter_end = end_date.timestamp() if end_date else None
+        data = self.data
+        return {ts: data[ts] for ts in self._get_columns()[0][self._get_slice(start_date, end_date)]}
+
+    def window(self, start_date: OPTIONAL_DT = None, end_date: OPTIONAL_DT = None) -> OpenhabPersistenceData:
+        """Return a new object which contains only the data in the time window
+
+        :param start_date: only values which are newer or equal than this
+        :param end_date: only values which are older or equal than this
+        """
+        timestamps, values = self._get_columns()
+        s = self._get_slice(start_date, end_date)
+
+        data = self.data
+        c = self.__class__()
+        c.data.update((ts, data[ts]) for ts in timestamps[s])
+        c.data._columns = timestamps[s], values[s]
+        return c
+
+    def resample(self, interval: float | timedelta, func: AGGREGATE_FUNCS = 'mean') -> OpenhabPersistenceData:
+        """Group the values in buckets of fixed length and aggregate each bucket.
+        The buckets are aligned to the epoch and the timestamp of each bucket is the start of the bucket.
+        Buckets without values are omitted.
+
+        :param interval: length of a bucket in seconds
+        :param func: how the values of a bucket are aggregated
+        """
+        if isinstance(interval, timedelta):
+            interval = interval.total_seconds()
+        if interval <= 0:
+            msg = f'Interval must be > 0! Is: {interval}'
+            raise ValueError(msg)
+        aggregate = _get_aggregate_func(func)
+
+        c = self.__class__()
+        ret = c.data
+
+        ts, vals = self._get_columns()
+        start = 0
+        size = len(ts)
+        # the data is sorted so every bucket is a consecutive slice
+        while start < size:
+            bucket = floor(ts[start] / interval)
+            end = bisect_left(ts, (bucket + 1) * interval, start)
+            ret[bucket * interval] = aggregate(vals[start:end])
+            start = end
+        return c
+
+    def aggregate(self, func: AGGREGATE_FUNCS, start_date: OPTIONAL_DT = None, end_date: OPTIONAL_DT = None) -> Any:
+        """Aggregate the values
+
+        :param func: aggregate function
+        :param start_date: only values which are newer or equal than this
+        :param end_date: only values which are older or equal than this
+        :return: the aggregated value or ``None`` if there are no values
+        """
+        aggregate = _get_aggregate_func(func)
 
-        ret = {}
-        for ts, val in self.data.items():
-            if filter_start is not None and ts < filter_start:
-                continue
-            if filter_end is not None and ts > filter_end:
-                continue
-            ret[ts] = val
-        return ret
+        values = self._get_values(start_date, end_date)
+        if not values:
+            return 0 if func == 'count' else None
+        return aggregate(values)
 
     def min(self, start_date: OPTIONAL_DT = None, end_date: OPTIONAL_DT = None) -> float | None:
-        return min(self.get_data(start_date, end_date).values(), default=None)
+        return min(self._get_values(start_date, end_date), default=None)
 
     def max(self, start_date: OPTIONAL_DT = None, end_date: OPTIONAL_DT = None) -> float | None:
-        return max(self.get_data(start_date, end_date).values(), default=None)
+        return max(self._get_values(start_date, end_date), default=None)
 
     def average(self, start_date: OPTIONAL_DT = None, end_date: OPTIONAL_DT = None) -> float | None:
-        values = list(self.get_data(start_date, end_date).values())
-        ct = len(values)
-        if ct == 0:
+        values = self._get_values(start_date, end_date)
+        if not values:
             return None
-        return sum(values) / ct
+        return sum(values) / len(values)
+
+
+def _get_aggregate_func(func: str) -> Callable[[list], Any]:
+    if (aggregate := _AGGREGATE_FUNCS.get(func)) is None:
+        msg = f'Unknown function {func}! Available: {", ".join(_AGGREGATE_FUNCS)}'
+        raise ValueError(msg)
+    return aggregate
+
+
+class PersistenceDataCache:
+    """Thread safe LRU cache with a max age for the data returned from the persistence service
+
+    :param max_entries: max amount of cached entries, if more are added the least recently used one is removed
+    """
+
+    def __init__(self, max_entries: int = 64) -> None:
+        self.max_entries: Final = max_entries
+        self._lock: Final = Lock()
+        self._data: Final[OrderedDict[Hashable, tuple[float, OpenhabPersistenceData]]] = OrderedDict()
+
+    @staticmethod
+    def get_key(name: str, persistence: str | None, start_time: OPTIONAL_DT, end_time: OPTIONAL_DT,
+                max_age: float) -> tuple[str, Hashable]:
+        """Create the key for a query. The times are rounded down to ``max_age`` seconds,
+        so queries for almost the same time window (e.g. relative to the current time) use the same entry.
+        ``max_age`` is part of the key, because the rounded times are only comparable for the same ``max_age``.
+        """
+        def _round(dt: OPTIONAL_DT) -> float | None:
+            if dt is None:
+                return None
+            ts = dt.timestamp()
+            return floor(ts / max_age) if max_age > 0 else ts
+
+        return name, (persistence, max_age, _round(start_time), _round(end_time))
+
+    def get(self, key: tuple[str, Hashable], max_age: float) -> OpenhabPersistenceData | None:
+        with self._lock:
+            if (entry := self._data.get(key)) is None:
+                return None
+            ts, obj = entry
+            if monotonic() - ts > max_age:
+                return None
+
+            self._data.move_to_end(key)
+            return obj
+
+    def set(self, key: tuple[str, Hashable], obj: OpenhabPersistenceData) -> None:
+        with self._lock:
+            self._data[key] = monotonic(), obj
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def remove_item(self, name: str) -> None:
+        """Remove all cached entries of an item"""
+        with self._lock:
+            for key in [k for k in self._data if k[0] == name]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from inspect import isclass
+from time import perf_counter
+from typing import Annotated, Any, Final, get_args, get_origin
+
+from pydantic import TypeAdapter, ValidationError
+
+from .all_events import OPENHAB_EVENT_TYPE, OPENHAB_EVENT_TYPE_ADAPTER
+from .base import BaseModel
+
+
+# The payload of the openHAB events is always a json string, so the first match is always the event type
+RE_EVENT_TYPE: Final = re.compile(r'"type"\s*:\s*"(\w+)"')
+
+
+def get_event_type_names(obj: Any) -> set[str]:
+    """Return the literal values of the type field of all models of a (possibly annotated) union"""
+    names: set[str] = set()
+
+    objs = [obj]
+    while objs:
+        obj = objs.pop(0)
+
+        if isclass(obj) and issubclass(obj, BaseModel):
+            literal = obj.model_fields['type'].annotation
+            literal_value = get_args(literal)
+            if len(literal_value) != 1:
+                msg = f'Expected exactly one literal value for {literal!r}'
+                raise ValueError(msg)
+            names.add(literal_value[0])
+            continue
+
+        if get_origin(obj) is Annotated:
+            objs.append(get_args(obj)[0])
+            continue
+
+        new = get_args(obj)
+        if not new:
+            msg = f'Expected args for {obj!r}'
+            raise ValueError(msg)
+        objs.extend(new)
+
+    return names
+
+
+def build_type_adapters() -> dict[str, TypeAdapter]:
+    adapters: dict[str, TypeAdapter] = {}
+    for member in get_args(get_args(OPENHAB_EVENT_TYPE)[0]):
+        names = get_event_type_names(member)
+        if len(names) != 1:
+            msg = f'Expected exactly one event type for {member!r}'
+            raise ValueError(msg)
+        adapters[names.pop()] = TypeAdapter(member)
+    return adapters
+
+
+@dataclass(frozen=True)
+class EventParseStats:
+    count: int      #: Amount of parsed events
+    errors: int     #: Amount of events that could not be parsed
+    total: float    #: Total parse time in seconds
+    max: float      #: Highest parse time in seconds
+
+    @property
+    def avg(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class _ParseCounter:
+    __slots__ = ('count', 'errors', 'max', 'total')
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.errors: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+
+
+class OpenhabEventParser:
+    """Parses the websocket messages from openHAB.
+    The event type is sniffed from the message, so only the matching model has to be validated.
+    Messages with an unknown type are validated with the adapter for all events.
+    """
+
+    __slots__ = ('_adapters', '_counters')
+
+    def __init__(self) -> None:
+        self._adapters: Final = build_type_adapters()
+        self._counters: Final[dict[str, _ParseCounter]] = {}
+
+    def parse(self, data: str) -> Any:
+        start = perf_counter()
+
+        adapter = OPENHAB_EVENT_TYPE_ADAPTER
+        name = '<unknown>'
+        if (m := RE_EVENT_TYPE.search(data)) is not None and \
+                (typed_adapter := self._adapters.get(m.group(1))) is not None:
+            adapter = typed_adapter
+            name = m.group(1)
+
+        if (counter := self._counters.get(name)) is None:
+            counter = self._counters[name] = _ParseCounter()
+
+        try:
+            return adapter.validate_json(data)
+        except ValidationError:
+            counter.errors += 1
+            raise
+        finally:
+            dur = perf_counter() - start
+            counter.count += 1
+            counter.total += dur
+            counter.max = max(dur, counter.max)
+
+    def parse_batch(self, frames: list[str]) -> list[Any]:
+        """Parse multiple messages. Instead of the event the error is returned if a message is invalid."""
+        ret: list[Any] = []
+        for data in frames:
+            try:
+                ret.append(self.parse(data))
+            except ValidationError as e:  # noqa: PERF203
+                ret.append(e)
+        return ret
+
+    def get_stats(self) -> dict[str, EventParseStats]:
+        """Return the parse statistics per event type"""
+        return {
+            name: EventParseStats(count=c.count, errors=c.errors, total=c.total, max=c.max)
+            for name, c in sorted(self._counters.items())
+        }
+
+    def reset_stats(self) -> None:
+        self._counters.clear()
@@ -1,5 +1,6 @@
 from HABApp.openhab.connection.handler.func_async import (
     async_create_item,
+    async_create_items,
     async_get_item,
     async_get_items,
     async_get_root,
@@ -1,5 +1,6 @@
 from HABApp.openhab.connection.handler.func_sync import (
     create_item,
+    create_items,
     create_link,
     get_item,
     get_link,
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING
+from threading import Lock
+from typing import TYPE_CHECKING, Final
 
 from immutables import Map
 
@@ -29,8 +30,6 @@ Items = uses_item_registry()
 # noinspection PyProtectedMember
 def add_to_registry(item: OpenhabItem, *, set_value: bool = False) -> None:
     name = item.name
-    for grp in item.groups:
-        MEMBERS.setdefault(grp, set()).add(name)
 
     if not Items.item_exists(name):
         Items.add_item(item)
@@ -42,10 +41,6 @@ def add_to_registry(item: OpenhabItem, *, set_value: bool = False) -> None:
         if set_value:
             existing.set_value(item.value)
 
-        # remove old groups
-        for grp in set(existing.groups) - set(item.groups):
-            MEMBERS.get(grp, set()).discard(name)
-
         # same type - it was only an item update (e.g. label)!
         existing._update_item_definition(item)
         return None
@@ -62,30 +57,138 @@ def remove_from_registry(name: str) -> None:
     if not Items.item_exists(name):
         return None
 
-    item = Items.get_item(name)  # type: HABApp.openhab.items.OpenhabItem
-    for grp in item.groups:
-        m = MEMBERS.get(grp, set())
-        m.discard(name)
-        if not m:
-            MEMBERS.pop(grp, None)
-
     Items.pop_item(name)
     return None
 
 
-MEMBERS: dict[str, set[str]] = {}
-
-
-def fresh_item_sync() -> None:
-    MEMBERS.clear()
-
-
-def get_members(group_name: str) -> tuple[OpenhabItem, ...]:
-    ret = []
-    for name in MEMBERS.get(group_name, ()):
-        item = Items.get_item(name)  # type: OpenhabItem
-        ret.append(item)
-    return tuple(sorted(ret, key=lambda x: x.name))
+class GroupMembershipIndex:
+    """Index of the group membership of all openHAB items in the item registry.
+    The items update the index when they are added to or removed from the item registry
+    or when their groups change. The member tuples are cached until the membership changes.
+    """
+
+    def __init__(self) -> None:
+        self._lock: Final = Lock()
+        # group name -> item name -> item
+        self._members: Final[dict[str, dict[str, OpenhabItem]]] = {}
+        # item name -> groups
+        self._groups: Final[dict[str, frozenset[str]]] = {}
+
+        self._version: int = 0
+        self._cache: dict[tuple[str, bool], tuple[int, tuple[OpenhabItem, ...]]] = {}
+        self._cache_version: int = 0
+
+    @property
+    def version(self) -> int:
+        """Incremented every time the membership changes"""
+        return self._version
+
+    def add_item(self, item: OpenhabItem) -> None:
+        with self._lock:
+            name = item.name
+            groups = frozenset(item.groups)
+            for grp in self._groups.get(name, frozenset()) - groups:
+                self._remove_member(grp, name)
+
+            self._groups[name] = groups
+            for grp in groups:
+                self._members.setdefault(grp, {})[name] = item
+            self._version += 1
+
+    def update_item(self, item: OpenhabItem) -> None:
+        # the item definition changed, so it's only necessary to update the index if the groups changed
+        if self._groups.get(item.name) != item.groups:
+            self.add_item(item)
+
+    def remove_item(self, item: OpenhabItem) -> None:
+        with self._lock:
+            name = item.name
+            for grp in self._groups.pop(name, ()):
+                self._remove_member(grp, name)
+            self._version += 1
+
+    def _remove_member(self, group: str, name: str) -> None:
+        if (members := self._members.get(group)) is None:
+            return None
+        members.pop(name, None)
+        if not members:
+            self._members.pop(group)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._members.clear()
+            self._groups.clear()
+            self._version += 1
+
+    def get_member_names(self, group: str) -> frozenset[str]:
+        """Return the names of the direct members of a group"""
+        return frozenset(self._members.get(group, ()))
+
+    def get_members(self, group: str, *, nested: bool = False) -> tuple[OpenhabItem, ...]:
+        """Return the members of a group sorted by name
+
+        :param group: name of the group
+        :param nested: if ``True`` return the members of the group and of all nested groups, but not the groups itself
+        """
+        # The entries are stored with the version, so an entry from an old version is never returned
+        key = (group, nested)
+        if (entry := self._cache.get(key)) is not None and entry[0] == self._version:
+            return entry[1]
+
+        with self._lock:
+            version = self._version
+            if self._cache_version != version:
+                self._cache = {}
+                self._cache_version = version
+
+            if not nested:
+                items = list(self._members.get(group, {}).values())
+            else:
+                items = list(self._get_nested_members(group).values())
+            ret = tuple(sorted(items, key=lambda x: x.name))
+            self._cache[key] = version, ret
+        return ret
+
+    def _get_nested_members(self, group: str) -> dict[str, OpenhabItem]:
+        ret: dict[str, OpenhabItem] = {}
+        seen = {group}
+        groups = [group]
+        while groups:
+            for name, item in self._members.get(groups.pop(), {}).items():
+                # groups can be nested multiple times or contain themselves
+                if name in self._members or isinstance(item, HABApp.openhab.items.GroupItem):
+                    if name not in seen:
+                        seen.add(name)
+                        groups.append(name)
+                    continue
+                ret[name] = item
+        return ret
+
+    def get_groups(self, name: str, *, nested: bool = False) -> frozenset[str]:
+        """Return the groups of an item
+
+        :param name: name of the item
+        :param nested: if ``True`` also return the groups of the groups
+        """
+        groups = self._groups.get(name, frozenset())
+        if not nested:
+            return groups
+
+        ret = set(groups)
+        todo = list(groups)
+        while todo:
+            for grp in self._groups.get(todo.pop(), ()):
+                if grp not in ret:
+                    ret.add(grp)
+                    todo.append(grp)
+        return frozenset(ret)
+
+
+GROUP_INDEX: Final = GroupMembershipIndex()
+
+
+def get_members(group_name: str, *, nested: bool = False) -> tuple[OpenhabItem, ...]:
+    return GROUP_INDEX.get_members(group_name, nested=nested)
 
 
 # ----------------------------------------------------------------------------------------------------------------------
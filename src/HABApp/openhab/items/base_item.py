@@ -1,18 +1,23 @@
 import datetime
-from collections.abc import Mapping
+from collections.abc import Iterable, Mapping
 from typing import Any, NamedTuple
 
 from immutables import Map
 from typing_extensions import Self, override
 
 from HABApp.core.const import MISSING
+from HABApp.core.internals import uses_item_registry
 from HABApp.core.items import BaseValueItem
 from HABApp.core.lib.funcs import compare as _compare
 from HABApp.openhab.connection.plugins import send_websocket_event
 from HABApp.openhab.interface_sync import get_persistence_data
+from HABApp.openhab.item_to_reg import GROUP_INDEX
 from HABApp.openhab.items._event_builder import OutgoingCommandEvent, OutgoingStateEvent
 
 
+item_registry = uses_item_registry()
+
+
 class MetaData(NamedTuple):
     value: str
     config: Mapping[str, Any] = Map()
@@ -46,6 +51,19 @@ class OpenhabItem(BaseValueItem):
         self.tags = item.tags
         self.groups = item.groups
         self.metadata = item.metadata
+        GROUP_INDEX.update_item(self)
+        item_registry.update_index(self)
+
+    def _get_registry_index(self) -> Mapping[str, Iterable[str]]:
+        return {'tags': self.tags, 'groups': self.groups, 'metadata': self.metadata.keys()}
+
+    def _on_item_added(self) -> None:
+        super()._on_item_added()
+        GROUP_INDEX.add_item(self)
+
+    def _on_item_removed(self) -> None:
+        super()._on_item_removed()
+        GROUP_INDEX.remove_item(self)
 
     @classmethod
     def from_oh(cls, name: str, value: Any = None,
@@ -122,16 +140,20 @@ class OpenhabItem(BaseValueItem):
 
     def get_persistence_data(self, persistence: str | None = None,
                              start_time: datetime.datetime | None = None,
-                             end_time: datetime.datetime | None = None):
+                             end_time: datetime.datetime | None = None, *,
+                             page_length: int | None = None, max_age: float | None = None):
         """Query historical data from the OpenHAB persistence service
 
         :param persistence: name of the persistence service (e.g. ``rrd4j``, ``mapdb``). If not set default will be used
         :param start_time: return only items which are newer than this
         :param end_time: return only items which are older than this
+        :param page_length: if set the data will be requested in multiple pages with this amount of data points
+        :param max_age: if set and the same data was requested less than ``max_age`` seconds ago
+                        the cached data will be returned
         """
 
         return get_persistence_data(
-            self._name, persistence, start_time, end_time
+            self._name, persistence, start_time, end_time, page_length=page_length, max_age=max_age
         )
 
 
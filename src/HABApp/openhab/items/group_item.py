@@ -33,10 +33,18 @@ class GroupItem(OpenhabItem):
 
     @property
     def members(self) -> tuple[OpenhabItem, ...]:
-        """Resolves and then returns all group members"""
+        """Returns all direct group members sorted by name"""
 
         return get_members(self.name)
 
+    @property
+    def all_members(self) -> tuple[OpenhabItem, ...]:
+        """Returns all group members and the members of all nested groups sorted by name.
+        Nested groups are not returned.
+        """
+
+        return get_members(self.name, nested=True)
+
     def oh_post_update(self, value: Any = MISSING) -> None:
         """Post an update to the openHAB item
 
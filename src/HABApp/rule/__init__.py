@@ -1,3 +1,4 @@
+from HABApp.core.internals.wrapped_function import thread_partition
 from HABApp.core.wrapper import in_thread
 from HABApp.rule.interfaces import FinishedProcessInfo
 
@@ -3,6 +3,8 @@ import re
 import sys
 import warnings
 from collections.abc import Callable, Iterable
+from datetime import timedelta
+from functools import lru_cache
 from pathlib import Path
 from re import Pattern
 from typing import Any, Final, Literal, ParamSpec, TypeVar, overload
@@ -14,11 +16,13 @@ import HABApp.rule_manager
 import HABApp.util
 from HABApp.core.asyncio import create_task
 from HABApp.core.const.hints import TYPE_EVENT_CALLBACK
+from HABApp.core.events import TopicPattern
 from HABApp.core.internals import (
     ContextBoundEventBusListener,
     ContextProvidingObj,
     EventBusListener,
     EventFilterBase,
+    ItemRegistryQuery,
     uses_item_registry,
     uses_post_event,
     wrap_func,
@@ -71,6 +75,10 @@ class Rule(ContextProvidingObj):
         self.__runtime: HABApp.runtime.Runtime = hook.runtime
         assert isinstance(self.__runtime, HABApp.runtime.Runtime)
 
+        # all callbacks of the rule run in the thread pool partition of the rule file
+        if hook.rule_file is not None:
+            self._habapp_ctx.thread_partition = HABApp.rule_ctx.get_rule_file_thread_partition(hook.rule_file.name)
+
         # scheduler
         self.run: Final = _HABAppJobBuilder(self._habapp_ctx)
 
@@ -123,20 +131,28 @@ class Rule(ContextProvidingObj):
             event
         )
 
-    def listen_event(self, name: BaseItem | str,
+    def listen_event(self, name: BaseItem | str | TopicPattern,
                      callback: TYPE_EVENT_CALLBACK,
-                     event_filter: EventFilterBase | None = None
+                     event_filter: EventFilterBase | None = None, *,
+                     coalesce: timedelta | float | None = None, coalesce_batch: bool = False
                      ) -> EventBusListener:
         """
         Register an event listener
 
-        :param name: item or name to listen to
+        :param name: item or name to listen to.
+            Pass a :class:`~HABApp.core.events.TopicPattern` to listen to all matching names,
+            e.g. ``TopicPattern('zigbee2mqtt/#')``
         :param callback: callback that accepts one parameter which will contain the event
         :param event_filter: Event filter. This is typically :class:`~HABApp.core.events.ValueUpdateEventFilter` or
             :class:`~HABApp.core.events.ValueChangeEventFilter` which will also trigger on changes/update from openhab
             or mqtt. Additionally it can be an instance of :class:`~HABApp.core.events.EventFilter` which additionally
             filters on the values of the event. It is also possible to group filters logically with, e.g.
             :class:`~HABApp.core.events.AndFilterGroup` and :class:`~HABApp.core.events.OrFilterGroup`
+        :param coalesce: Time window in seconds (or timedelta) in which the events are coalesced.
+            The callback will only be called with the latest event of the window.
+            Events which are received while the callback is still running will be coalesced, too.
+            ``0`` only coalesces the events while the callback is running, ``None`` disables coalescing.
+        :param coalesce_batch: Call the callback with a list of all coalesced events instead of the latest event
         """
         cb = wrap_func(callback, context=self._habapp_ctx)
         name = name.name if isinstance(name, BaseItem) else name
@@ -147,7 +163,8 @@ class Rule(ContextProvidingObj):
             msg = f'Argument event_filter must be an instance of event filter (is {event_filter})'
             raise TypeError(msg)
 
-        listener = ContextBoundEventBusListener(name, cb, event_filter, parent_ctx=self._habapp_ctx)
+        listener = ContextBoundEventBusListener(
+            name, cb, event_filter, coalesce=coalesce, coalesce_batch=coalesce_batch, parent_ctx=self._habapp_ctx)
         return self._habapp_ctx.add_event_listener(listener)
 
     @overload
@@ -303,29 +320,34 @@ class Rule(ContextProvidingObj):
                 msg = 'Searching for tags, groups and metadata only works for OpenhabItem or its subclasses'
                 raise ValueError(msg)
 
-        ret = []
-        for item in item_registry.get_items():  # type: HABApp.core.items.BaseItem
-            if type is not None and not isinstance(item, type):
-                continue
-
-            if name is not None and not name.search(item.name):
-                continue
-
-            if _tags is not None and not _tags.issubset(item.tags):
-                continue
-
-            if _groups is not None and not _groups.issubset(item.groups):
-                continue
-
-            if metadata is not None and not any(map(metadata.search, item.metadata)):
-                continue
-
-            if metadata_value is not None and not any(
-                    map(metadata_value.search, map(lambda x: x[0], item.metadata.values()))):
-                continue
-
-            ret.append(item)
-        return ret
+        query = _get_item_query(
+            type, name,
+            frozenset(_tags) if _tags else None, frozenset(_groups) if _groups else None,
+            metadata, metadata_value
+        )
+        return list(query.get_items(item_registry))
+
+
+@lru_cache(maxsize=256)
+def _get_item_query(type: tuple[type, ...] | type | None, name: Pattern[str] | None,
+                    tags: frozenset[str] | None, groups: frozenset[str] | None,
+                    metadata: Pattern[str] | None, metadata_value: Pattern[str] | None) -> ItemRegistryQuery:
+    # The query caches the result until the item registry changes, so the same object is reused for the same search
+    index = {}
+    if tags:
+        index['tags'] = tags
+    if groups:
+        index['groups'] = groups
+
+    func = None
+    if metadata_value is not None:
+        def func(item: HABApp.openhab.items.OpenhabItem) -> bool:
+            return any(metadata_value.search(value) for value, _ in item.metadata.values())
+
+    return ItemRegistryQuery(
+        type=type, name=name, index=index,
+        index_pattern={'metadata': metadata} if metadata is not None else None, func=func
+    )
 
 
 PSPEC_RULE = ParamSpec('PSPEC_RULE')
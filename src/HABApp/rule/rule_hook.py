@@ -3,6 +3,7 @@ from collections.abc import Callable
 
 # noinspection PyProtectedMember
 from sys import _getframe as sys_get_frame
+from time import perf_counter_ns
 from types import FrameType, TracebackType
 from typing import TYPE_CHECKING, Any, Final
 
@@ -33,6 +34,9 @@ class HABAppRuleHook:
 
         self.closed = False
 
+        # perf counter in ns when the first rule was created
+        self.first_rule_ns: int | None = None
+
     def __enter__(self) -> None:
         pass
 
@@ -40,6 +44,8 @@ class HABAppRuleHook:
         self.closed = True
 
     def register_rule(self, rule: 'HABApp.rule.Rule'):
+        if self.first_rule_ns is None:
+            self.first_rule_ns = perf_counter_ns()
         if self.closed:
             # if we keep adding rules dynamically they will always get attached to the file and never unloaded
             log.warning(f'Added another rule of type {rule.__class__.__name__:s} '
@@ -1 +1 @@
-from .rule_ctx import HABAppRuleContext
+from .rule_ctx import HABAppRuleContext, get_rule_file_thread_partition
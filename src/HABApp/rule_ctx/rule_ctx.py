@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 import logging
+from fnmatch import fnmatchcase
 from typing import TYPE_CHECKING, TypeVar
 
 import HABApp
 from HABApp.core.const.topics import ALL_TOPICS
 from HABApp.core.internals import Context, EventBusListener, uses_event_bus, uses_item_registry, wrap_func
-from HABApp.core.internals.event_bus import EventBusBaseListener
+from HABApp.core.internals.event_bus import EventBusBaseListener, TopicPattern
 from HABApp.core.lib import get_obj_name
 
 
@@ -25,14 +26,25 @@ log = logging.getLogger('HABApp.Rule')
 TB = TypeVar('TB', bound=EventBusListener)
 
 
+def get_rule_file_thread_partition(name: str) -> str | None:
+    for partition, cfg in HABApp.CONFIG.habapp.thread_pool.partitions.items():
+        if any(fnmatchcase(name, pattern) for pattern in cfg.rule_files):
+            return partition
+    return None
+
+
 class HABAppRuleContext(Context):
     def __init__(self, rule: Rule) -> None:
         super().__init__()
         self.rule: Rule | None = rule
+        self.thread_partition: str | None = None
 
     def get_callback_name(self, callback: Callable) -> str | None:
         return f'{self.rule.rule_name}.{get_obj_name(callback):s}' if self.rule.rule_name else None
 
+    def get_thread_partition(self) -> str | None:
+        return self.thread_partition
+
     def add_event_listener(self, listener: TB) -> TB:
         event_bus.add_listener(listener)
         return listener
@@ -74,8 +86,8 @@ class HABAppRuleContext(Context):
                     if not isinstance(listener, EventBusBaseListener):
                         continue
 
-                    # Internal topics - don't warn there
-                    if listener.topic in ALL_TOPICS:
+                    # Internal topics and patterns - don't warn there
+                    if listener.topic in ALL_TOPICS or isinstance(listener.topic, TopicPattern):
                         continue
 
                     # check if specific item exists
@@ -5,6 +5,7 @@ from threading import Lock
 
 import HABApp
 from HABApp.core.events import ValueUpdateEvent, ValueUpdateEventFilter
+from HABApp.openhab.definitions import OpenhabItemDefinition
 from HABApp.openhab.items import NumberItem
 
 from .bench_base import BenchBaseRule
@@ -59,6 +60,7 @@ class OpenhabBenchRule(BenchBaseRule):
     def run_bench(self) -> None:
         # These are the benchmarks
         self.bench_item_create()
+        self.bench_item_create_bulk()
         self.bench_rtt_time()
 
     def bench_item_create(self) -> None:
@@ -110,6 +112,29 @@ class OpenhabBenchRule(BenchBaseRule):
         print('. done!\n')
         times.show()
 
+    def bench_item_create_bulk(self) -> None:
+        print('Bench bulk item operations ', end='')
+
+        times = BenchContainer()
+        count = len(self.name_list)
+
+        for name, label in (('create items', 'MyLabel'), ('unchanged items', 'MyLabel'), ('update items', 'New Label')):
+            definitions = [
+                OpenhabItemDefinition('Number', k, label=label, metadata={'unit': '%'}) for k in self.name_list
+            ]
+
+            b = times.create(name, factor=count)
+            start = time.time()
+            self.openhab.create_items(definitions)
+            b.times.append(time.time() - start)
+
+            time.sleep(0.2)
+            print('.', end='')
+
+        self.cleanup()
+        print(' done!\n')
+        times.show()
+
     def bench_rtt_time(self) -> None:
         self.openhab.create_item('Number', self.item_name, label='MyLabel')
         time.sleep(2)
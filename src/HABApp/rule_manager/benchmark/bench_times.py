@@ -28,8 +28,8 @@ class BenchContainer:
     def __init__(self) -> None:
         self.times = []
 
-    def create(self, name: str) -> 'BenchTime':
-        c = BenchTime(name)
+    def create(self, name: str, factor: int = 1) -> 'BenchTime':
+        c = BenchTime(name, factor)
         self.times.append(c)
         return c
 
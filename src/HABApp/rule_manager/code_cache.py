@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import logging
+import marshal
+import os
+import struct
+from importlib.util import MAGIC_NUMBER, cache_from_source
+from pathlib import Path
+from threading import Lock
+from typing import TYPE_CHECKING, Final
+
+
+if TYPE_CHECKING:
+    from types import CodeType
+
+
+log = logging.getLogger('HABApp.Rules')
+
+
+# Version of the cache file format. Must be increased if the compiled code changes
+# (e.g. different compile flags), so old cache files are not used any more.
+_CACHE_VERSION: Final = b'HABApp\x02'
+
+# cache version, magic number of the python version, mtime in ns, size
+_HEADER: Final = struct.Struct(f'<{len(_CACHE_VERSION):d}s{len(MAGIC_NUMBER):d}sqQ')
+
+
+def get_cache_path(path: Path) -> Path:
+    """Path of the cache file, e.g. ``rules/__pycache__/my_rule.cpython-312.opt-habapp.pyc``.
+    The file is in a separate optimization level, so it can't be mixed up with a regular pyc file.
+    """
+    return Path(cache_from_source(str(path), optimization='habapp'))
+
+
+class RuleCodeCache:
+    """Cache for the compiled code of the rule files. Rule files are not imported, so the regular
+    ``__pycache__`` of python is not used. The code is cached by path, mtime and size of the file
+    in memory and optionally on disk (next to the regular pyc files).
+    """
+
+    def __init__(self) -> None:
+        self._lock: Final = Lock()
+        self._codes: Final[dict[str, tuple[int, int, CodeType]]] = {}
+
+    def get_code(self, path: Path, *, disk: bool = False) -> CodeType:
+        name = str(path)
+
+        stat = path.stat()
+        mtime = stat.st_mtime_ns
+        size = stat.st_size
+
+        with self._lock:
+            entry = self._codes.get(name)
+        if entry is not None and entry[0] == mtime and entry[1] == size:
+            return entry[2]
+
+        code = self._read_cache_file(path, mtime, size) if disk else None
+        if code is None:
+            # Don't inherit the __future__ imports of this module, the rule file is compiled like runpy does
+            code = compile(path.read_bytes(), name, 'exec', dont_inherit=True)
+            if disk:
+                self._write_cache_file(path, mtime, size, code)
+
+        with self._lock:
+            self._codes[name] = mtime, size, code
+        return code
+
+    def remove(self, path: Path) -> None:
+        with self._lock:
+            self._codes.pop(str(path), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._codes.clear()
+
+    @staticmethod
+    def _read_cache_file(path: Path, mtime: int, size: int) -> CodeType | None:
+        try:
+            data = get_cache_path(path).read_bytes()
+        except OSError:
+            return None
+
+        try:
+            if _HEADER.unpack_from(data) != (_CACHE_VERSION, MAGIC_NUMBER, mtime, size):
+                return None
+            return marshal.loads(memoryview(data)[_HEADER.size:])
+        except (struct.error, ValueError, EOFError, TypeError) as e:
+            log.debug(f'Invalid cache file for {path}: {e}')
+            return None
+
+    @staticmethod
+    def _write_cache_file(path: Path, mtime: int, size: int, code: CodeType) -> None:
+        cache_path = get_cache_path(path)
+        tmp_path = cache_path.with_name(f'{cache_path.name}.{os.getpid():d}.tmp')
+        try:
+            cache_path.parent.mkdir(exist_ok=True)
+            tmp_path.write_bytes(_HEADER.pack(_CACHE_VERSION, MAGIC_NUMBER, mtime, size) + marshal.dumps(code))
+            # files might be loaded concurrently so we replace the file atomically
+            tmp_path.replace(cache_path)
+        except OSError as e:
+            log.debug(f'Could not write cache file for {path}: {e}')
+            tmp_path.unlink(missing_ok=True)
+
+
+CODE_CACHE: Final = RuleCodeCache()
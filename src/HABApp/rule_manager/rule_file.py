@@ -2,16 +2,21 @@ from __future__ import annotations
 
 import collections
 import logging
-import runpy
-from typing import TYPE_CHECKING
+import sys
+from dataclasses import dataclass
+from time import perf_counter_ns
+from types import ModuleType
+from typing import TYPE_CHECKING, Any
 
 import HABApp
 from HABApp.core.internals import get_current_context, wrap_func
 from HABApp.rule.rule_hook import HABAppRuleHook
+from HABApp.rule_manager.code_cache import CODE_CACHE
 
 
 if TYPE_CHECKING:
     from pathlib import Path
+    from types import CodeType
 
     from HABApp import Rule
     from HABApp.rule_manager import RuleManager
@@ -20,6 +25,42 @@ if TYPE_CHECKING:
 log = logging.getLogger('HABApp.Rules')
 
 
+@dataclass
+class RuleFileLoadTimes:
+    compile: int = 0        #: Time in ns to compile the file
+    exec: int = 0           #: Time in ns to execute the module until the first rule is created
+    rule_init: int = 0      #: Time in ns to execute the module from the creation of the first rule
+    rule_loaded: int = 0    #: Time in ns to check the rules and run ``on_rule_loaded``
+
+    def __str__(self) -> str:
+        total = self.compile + self.exec + self.rule_init + self.rule_loaded
+        return (f'{total / 1e9:.3f}s (compile: {self.compile / 1e9:.3f}s, exec: {self.exec / 1e9:.3f}s, '
+                f'rule __init__: {self.rule_init / 1e9:.3f}s, on_rule_loaded: {self.rule_loaded / 1e9:.3f}s)')
+
+
+def run_code(code: CodeType, path: str, init_globals: dict[str, Any]) -> None:
+    # This is the same as runpy.run_path but with an already compiled code object:
+    # The module is available in sys.modules while it gets executed.
+    # sys.argv is not modified because multiple files can be loaded concurrently.
+    module = ModuleType(path)
+    module_globals = module.__dict__
+    module_globals.update(init_globals)
+    module_globals.update(
+        __file__=path, __cached__=None, __loader__=None, __package__=path.rpartition('.')[0], __spec__=None
+    )
+
+    modules = sys.modules
+    existing = modules.get(path)
+    modules[path] = module
+    try:
+        exec(code, module_globals)  # noqa: S102
+    finally:
+        if existing is None:
+            modules.pop(path, None)
+        else:
+            modules[path] = existing
+
+
 class RuleFile:
     def __init__(self, rule_manager: RuleManager, name: str, path: Path) -> None:
         self.rule_manager = rule_manager
@@ -30,6 +71,8 @@ class RuleFile:
         self.rules: dict[str, Rule] = {}
         self.class_ctr: dict[str, int] = collections.defaultdict(lambda: 1)
 
+        self.load_times: RuleFileLoadTimes = RuleFileLoadTimes()
+
     def suggest_rule_name(self, obj: Rule) -> str:
 
         # if there is already a name set we make no suggestion
@@ -43,8 +86,10 @@ class RuleFile:
         return f'{name:s}.{found:d}' if found > 1 else f'{name:s}'
 
     async def check_all_rules(self) -> None:
+        start = perf_counter_ns()
         for rule in self.rules.values():
             await get_current_context(rule).check_rule()
+        self.load_times.rule_loaded = perf_counter_ns() - start
 
     async def unload(self) -> None:
 
@@ -69,8 +114,24 @@ class RuleFile:
 
         # It seems like python 3.8 doesn't allow path like objects anymore:
         # https://github.com/spacemanspiff2007/HABApp/issues/111
+        path = str(self.path)
+
+        start = perf_counter_ns()
+        code = CODE_CACHE.get_code(self.path, disk=HABApp.CONFIG.habapp.files.bytecode_cache)
+        compiled = perf_counter_ns()
+
         with rule_hook:
-            runpy.run_path(str(self.path), run_name=str(self.path), init_globals=rule_hook.in_dict())
+            run_code(code, path, init_globals=rule_hook.in_dict())
+
+        # Rules are typically created at the end of the file, so everything after the creation
+        # of the first rule is accounted as rule __init__
+        end = perf_counter_ns()
+        first_rule = rule_hook.first_rule_ns if rule_hook.first_rule_ns is not None else end
+
+        times = self.load_times
+        times.compile = compiled - start
+        times.exec = first_rule - compiled
+        times.rule_init = end - first_rule
 
     async def load(self) -> bool:
 
@@ -14,6 +14,7 @@ from HABApp.core.internals.proxy import uses_file_manager
 from HABApp.core.internals.wrapped_function import wrap_func
 from HABApp.core.logger import log_warning
 from HABApp.core.wrapper import log_exception
+from HABApp.rule_manager.code_cache import CODE_CACHE
 from HABApp.rule_manager.rule_file import RuleFile
 
 
@@ -111,6 +112,10 @@ class RuleManager:
         rule = self.files.pop(path_str)
 
         await rule.unload()
+
+        # the file was deleted so the compiled code is not needed anymore
+        if not path.is_file():
+            CODE_CACHE.remove(path)
         return None
 
     async def request_file_load(self, name: str, path: Path) -> None:
@@ -135,10 +140,10 @@ class RuleManager:
             log.warning(f'Failed to load {path_str}!')
             raise AlreadyHandledFileError()
 
-        log.debug(f'File {name} successfully loaded!')
-
         # Do simple checks which prevent errors
         await rule_file.check_all_rules()
+
+        log.info(f'File {name} loaded in {rule_file.load_times}')
         return None
 
     async def shutdown(self) -> None:
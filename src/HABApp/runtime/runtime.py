@@ -12,7 +12,7 @@ import HABApp.rule.interfaces._http
 import HABApp.rule_manager
 import HABApp.util
 from HABApp.core import Connections, shutdown
-from HABApp.core.internals import setup_internals
+from HABApp.core.internals import EventBus, setup_internals
 from HABApp.core.internals.proxy import ConstProxyObj
 from HABApp.core.wrapper import process_exception
 from HABApp.openhab import connection as openhab_connection
@@ -48,6 +48,9 @@ class Runtime:
 
             file_manager.setup()
 
+            # the event bus configuration is applied when the configuration is loaded
+            setup_event_bus(eb)
+
             # Load config
             HABApp.config.setup_habapp_configuration(config_folder)
 
@@ -74,3 +77,21 @@ class Runtime:
             process_exception('Runtime.start', e)
             await asyncio.sleep(1)  # Sleep so we can do a graceful shutdown
             shutdown.request()
+
+
+def setup_event_bus(eb: EventBus) -> None:
+    cfg = HABApp.CONFIG.habapp.event_bus
+    logging_cfg = HABApp.CONFIG.habapp.logging
+
+    def event_bus_cfg_changed() -> None:
+        if cfg.batched:
+            eb.enable_batched_dispatch(cfg.queue_size, cfg.batch_size)
+        else:
+            eb.disable_batched_dispatch()
+
+    def event_log_cfg_changed() -> None:
+        eb.set_event_log_limits((obj.topic, obj.count, obj.interval) for obj in logging_cfg.event_limits)
+
+    cfg.subscribe_for_changes(event_bus_cfg_changed)
+    logging_cfg.subscribe_for_changes(event_log_cfg_changed)
+    shutdown.register(eb.disable_batched_dispatch, msg='Stopping event bus dispatcher')
@@ -1,3 +1,4 @@
+from HABApp.core.lib import ValueHistory
 from HABApp.util import functions, multimode
 from HABApp.util.cache import ExpiringCache
 from HABApp.util.fade import Fade
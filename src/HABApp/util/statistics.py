@@ -1,7 +1,7 @@
-import collections
-import statistics
 import time
 
+from HABApp.core.lib import ValueHistory
+
 
 class Statistics:
     """Calculate mathematical statistics of numerical values.
@@ -13,6 +13,8 @@ class Statistics:
     :ivar median: median of all values
     :ivar last_value: last added value
     :ivar last_change: timestamp the last time a value was added
+
+    The values are kept in a :class:`~HABApp.util.ValueHistory`, so the statistics are updated incrementally.
     """
     def __init__(self, max_age=None, max_samples=None) -> None:
         """
@@ -25,8 +27,7 @@ class Statistics:
 
         self._max_age = max_age
 
-        self.timestamps = collections.deque(maxlen=max_samples)
-        self.values = collections.deque(maxlen=max_samples)
+        self.history: ValueHistory = ValueHistory(max_samples)
 
         self.sum: float = None
         self.min: float = None
@@ -38,39 +39,37 @@ class Statistics:
         self.last_value: float = None
         self.last_change: float = None
 
+    @property
+    def values(self) -> ValueHistory:
+        return self.history
+
+    @property
+    def timestamps(self) -> list[float]:
+        return list(self.history.timestamps())
+
     def _remove_old(self):
         if self._max_age is None:
             return None
 
         # remove too old entries
-        now = time.time()
-        while self.timestamps and (now - self.timestamps[0]) > self._max_age:
-            self.timestamps.popleft()
-            self.values.popleft()
+        self.history.remove_older_than(time.time() - self._max_age)
 
     def update(self) -> None:
         """update values without adding a new value"""
         self._remove_old()
 
-        __len = len(self.values)
+        history = self.history
 
-        if not __len:
-            self.sum = None
-            self.min = None
-            self.max = None
+        # the history returns None if there are no values
+        self.sum = history.sum
+        self.min = history.min
+        self.max = history.max
 
-            self.mean = None
-            self.median = None
-        else:
-            self.sum = sum(self.values)
-            self.min = min(self.values)
-            self.max = max(self.values)
-
-            self.mean = statistics.mean(self.values)
-            self.median = statistics.median(self.values)
+        self.mean = history.mean
+        self.median = history.median
 
-        if __len >= 2:
-            self.last_change = self.values[-1] - self.values[-2]
+        if len(history) >= 2:
+            self.last_change = history[-1] - history[-2]
         else:
             self.last_change = None
 
@@ -82,9 +81,7 @@ class Statistics:
         assert isinstance(value, (int, float)), type(value)
 
         self.last_value = value
-
-        self.timestamps.append(time.time())
-        self.values.append(value)
+        self.history.append(int(value) if isinstance(value, bool) else value, time.time())
 
         self.update()
 
@@ -74,7 +74,8 @@ def test_inject_queue_handler() -> None:
     dst = {
         'handlers': {
             'EventFile': {'class': 'logging.handlers.RotatingFileHandler', 'filename': 'events.log'},
-            'HABAppQueue_BufferEventFile': {'class': 'logging.handlers.QueueHandler', 'queue': handlers[0]._queue},
+            'HABAppQueue_BufferEventFile': {
+                'class': 'HABApp.config.logging.queue_handler.LazyQueueHandler', 'queue': handlers[0]._queue},
         },
         'loggers': {
             'HABApp.EventBus': {'handlers': ['HABAppQueue_BufferEventFile'], 'level': 'DEBUG', 'propagate': False}
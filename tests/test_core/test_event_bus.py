@@ -1,6 +1,20 @@
-from HABApp.core.events import ValueUpdateEvent
-from HABApp.core.events.filter import EventFilter, NoEventFilter, OrFilterGroup
+import asyncio
+import logging
+
+import pytest
+
+from HABApp.core.events import TopicPattern, ValueChangeEvent, ValueUpdateEvent
+from HABApp.core.events.filter import (
+    AndFilterGroup,
+    EventFilter,
+    NoEventFilter,
+    OrFilterGroup,
+    ValueChangeEventFilter,
+    ValueUpdateEventFilter,
+)
 from HABApp.core.internals import EventBus, EventBusListener, wrap_func
+from HABApp.core.internals.event_bus import event_bus as event_bus_module
+from HABApp.core.internals.event_bus import log_limit
 
 
 class TestEvent:
@@ -63,3 +77,251 @@ def test_multiple_events(sync_worker) -> None:
         eb.post_event('test', k)
 
     assert event_history == target
+
+
+async def test_batched_dispatch(sync_worker) -> None:
+    event_history = []
+    eb = EventBus()
+
+    listener = EventBusListener('test', wrap_func(event_history.append), NoEventFilter())
+    eb.add_listener(listener)
+    assert eb.get_dispatch_stats() is None
+
+    eb.enable_batched_dispatch(100, 3)
+
+    for i in range(10):
+        eb.post_event('test', i)
+    assert event_history == []
+
+    await asyncio.sleep(0.05)
+    assert event_history == list(range(10))
+
+    stats = eb.get_dispatch_stats()
+    assert stats.queue_depth == 0
+    assert stats.queue_depth_max == 10
+    assert stats.dispatched == 10
+    assert stats.dropped == 0
+
+    # remaining events get dispatched when the dispatcher is disabled
+    eb.post_event('test', 10)
+    eb.disable_batched_dispatch()
+    assert event_history == list(range(11))
+    assert eb.get_dispatch_stats() is None
+
+
+@pytest.mark.ignore_log_warnings
+async def test_batched_dispatch_drop(sync_worker) -> None:
+    event_history = []
+    eb = EventBus()
+
+    listener = EventBusListener('test', wrap_func(event_history.append), NoEventFilter())
+    eb.add_listener(listener)
+    eb.enable_batched_dispatch(5, 100)
+
+    for i in range(8):
+        eb.post_event('test', i)
+
+    stats = eb.get_dispatch_stats()
+    assert stats.queue_depth == 5
+    assert stats.dropped == 3
+
+    await asyncio.sleep(0.05)
+    assert event_history == [3, 4, 5, 6, 7]
+    eb.disable_batched_dispatch()
+
+
+def test_event_log_limits(caplog, monkeypatch) -> None:
+    caplog.set_level(logging.INFO)
+    eb = EventBus()
+    eb.set_event_log_limits([('meter/*', 2, 60), ('silent', 0, 1)])
+
+    for i in range(5):
+        eb.post_event('meter/power', i)
+        eb.post_event('meter/energy', i)
+        eb.post_event('silent', i)
+        eb.post_event('other', i)
+
+    msgs = [rec.getMessage() for rec in caplog.records if rec.name == 'HABApp.EventBus']
+    assert msgs == [
+        '         meter/power: 0', '        meter/energy: 0', '               other: 0',
+        '         meter/power: 1', '        meter/energy: 1', '               other: 1',
+        '               other: 2', '               other: 3', '               other: 4',
+    ]
+
+    # window expired
+    monkeypatch.setattr(log_limit, 'monotonic', lambda: 1_000_000)
+    caplog.clear()
+    eb.post_event('meter/power', 5)
+    assert [rec.getMessage() for rec in caplog.records] == ['         meter/power: 5']
+
+
+def test_event_log_limits_cache_size(monkeypatch) -> None:
+    monkeypatch.setattr(log_limit, 'TOPIC_CACHE_SIZE', 2)
+    limiter = log_limit.EventLogLimiter([('meter/*', 1, 60)])
+
+    for i in range(5):
+        assert limiter.allow(f'other/{i:d}')
+        assert len(limiter._topics) <= 2
+
+
+def test_listener_index(sync_worker) -> None:
+    calls = []
+    eb = EventBus()
+
+    def add_listener(name: str, event_filter) -> None:
+        eb.add_listener(EventBusListener('test', wrap_func(lambda _: calls.append(name)), event_filter))
+
+    add_listener('update_1', ValueUpdateEventFilter(value=1))
+    add_listener('change', ValueChangeEventFilter())
+    add_listener('update', ValueUpdateEventFilter())
+    add_listener('all', NoEventFilter())
+    add_listener('update_list', ValueUpdateEventFilter(value=[1]))
+    add_listener('update_2', EventFilter(ValueUpdateEvent, value=2))
+    add_listener('and_update_1', AndFilterGroup(NoEventFilter(), ValueUpdateEventFilter(value=1)))
+    add_listener('or', OrFilterGroup(ValueUpdateEventFilter(value=2), ValueChangeEventFilter(value=2)))
+    add_listener('str', EventFilter(str))
+
+    eb.post_event('test', ValueUpdateEvent('test', 1))
+    assert calls == ['update_1', 'update', 'all', 'and_update_1']
+    calls.clear()
+
+    eb.post_event('test', ValueUpdateEvent('test', 2))
+    assert calls == ['update', 'all', 'update_2', 'or']
+    calls.clear()
+
+    eb.post_event('test', ValueUpdateEvent('test', [1]))
+    assert calls == ['update', 'all', 'update_list']
+    calls.clear()
+
+    eb.post_event('test', ValueChangeEvent('test', 2, 1))
+    assert calls == ['change', 'all', 'or']
+    calls.clear()
+
+    eb.post_event('test', 'asdf')
+    assert calls == ['all', 'str']
+    calls.clear()
+
+    # subclass of the event
+    class MyUpdateEvent(ValueUpdateEvent):
+        pass
+
+    eb.post_event('test', MyUpdateEvent('test', 1))
+    assert calls == ['update_1', 'update', 'all', 'and_update_1']
+
+
+def test_topic_pattern() -> None:
+    assert TopicPattern('a/+/c').matches('a/b/c')
+    assert not TopicPattern('a/+/c').matches('a/b/d')
+    assert not TopicPattern('a/+').matches('a/b/c')
+    assert TopicPattern('a/#').matches('a')
+    assert TopicPattern('a/#').matches('a/b/c')
+    assert not TopicPattern('a/#').matches('b/a')
+    assert TopicPattern('#').matches('asdf')
+    assert TopicPattern('Light_*').matches('Light_Kitchen')
+    assert not TopicPattern('Light_*').matches('Lights')
+    assert TopicPattern('zigbee2mqtt/*_sensor/#').matches('zigbee2mqtt/door_sensor/battery')
+
+    for invalid in ('', 'a/#/b', 'a/b#', 'a+/b'):
+        with pytest.raises(ValueError):
+            TopicPattern(invalid)
+
+
+def test_pattern_listener(sync_worker) -> None:
+    calls = []
+    eb = EventBus()
+
+    def add_listener(name: str, topic: str) -> EventBusListener:
+        listener = EventBusListener(topic, wrap_func(lambda _: calls.append(name)), NoEventFilter())
+        eb.add_listener(listener)
+        return listener
+
+    add_listener('all', TopicPattern('#'))
+    add_listener('exact', 'zigbee2mqtt/sensor/state')
+    single = add_listener('single', TopicPattern('zigbee2mqtt/+/state'))
+    add_listener('multi', TopicPattern('zigbee2mqtt/#'))
+    add_listener('glob', TopicPattern('Light_*'))
+
+    eb.post_event('zigbee2mqtt/sensor/state', 1)
+    assert calls == ['exact', 'all', 'single', 'multi']
+    calls.clear()
+
+    eb.post_event('Light_Kitchen', 1)
+    assert calls == ['all', 'glob']
+    calls.clear()
+
+    eb.remove_listener(single)
+    eb.post_event('zigbee2mqtt/sensor/state', 1)
+    assert calls == ['exact', 'all', 'multi']
+    calls.clear()
+
+    eb.remove_all_listeners()
+    eb.post_event('zigbee2mqtt/sensor/state', 1)
+    assert calls == []
+
+
+def test_pattern_cache_size(sync_worker, monkeypatch) -> None:
+    monkeypatch.setattr(event_bus_module, 'PATTERN_CACHE_SIZE', 2)
+    calls = []
+    eb = EventBus()
+    eb.add_listener(EventBusListener(TopicPattern('a/+'), wrap_func(calls.append), NoEventFilter()))
+
+    for i in range(5):
+        eb.post_event(f'a/{i:d}', i)
+        assert len(eb._pattern_cache) <= 2
+    assert calls == [0, 1, 2, 3, 4]
+
+
+async def test_coalesce_listener() -> None:
+    event_history = []
+    eb = EventBus()
+
+    async def append_event(event) -> None:
+        event_history.append(event)
+
+    listener = EventBusListener('test', wrap_func(append_event), NoEventFilter(), coalesce=0.05)
+    eb.add_listener(listener)
+    assert listener.describe() == '"test" (filter=NoEventFilter(), coalesce=0.05s)'
+
+    for i in range(10):
+        eb.post_event('test', i)
+    assert event_history == []
+
+    await asyncio.sleep(0.1)
+    assert event_history == [9]
+    assert listener.coalescer.received == 10
+    assert listener.coalescer.delivered == 1
+
+    # pending events are discarded when the listener gets canceled
+    eb.post_event('test', 10)
+    eb.remove_listener(listener)
+    listener.coalescer.cancel()
+    await asyncio.sleep(0.1)
+    assert event_history == [9]
+
+
+async def test_coalesce_listener_batch() -> None:
+    event_history = []
+    eb = EventBus()
+    running = asyncio.Event()
+
+    async def append_events(events) -> None:
+        event_history.append(events)
+        await running.wait()
+
+    listener = EventBusListener('test', wrap_func(append_events), NoEventFilter(), coalesce=0, coalesce_batch=True)
+    eb.add_listener(listener)
+
+    eb.post_event('test', 1)
+    await asyncio.sleep(0.01)
+    assert event_history == [[1]]
+
+    # events are coalesced while the callback is still running
+    for i in range(2, 5):
+        eb.post_event('test', i)
+    await asyncio.sleep(0.01)
+    assert event_history == [[1]]
+
+    running.set()
+    await asyncio.sleep(0.01)
+    assert event_history == [[1], [2, 3, 4]]
+    eb.remove_listener(listener)
@@ -1,3 +1,4 @@
+import asyncio
 from collections.abc import Awaitable, Callable
 from pathlib import Path
 from unittest.mock import Mock, call
@@ -161,3 +162,132 @@ async def test_reloads_on(test_logs: LogCollector, file_manager) -> None:
     assert f2._state is FileState.LOADED
 
     test_logs.add_expected('HABApp.files', 'WARNING', "File path2 reloads on file that doesn't exist: n/name1")
+
+
+async def test_parallel_load(monkeypatch, test_logs: LogCollector, file_manager) -> None:
+    monkeypatch.setattr(HABApp.CONFIG.habapp.files, 'parallel_load', 2)
+
+    running = set()
+    max_running = 0
+    loaded = []
+
+    async def coro_on_load(name: str, path: Path) -> None:
+        nonlocal max_running
+        running.add(name)
+        max_running = max(max_running, len(running))
+        await asyncio.sleep(0.01 if name != 'n/name1' else 0.05)
+        running.remove(name)
+        loaded.append(name)
+
+    async def coro_on_unload(name: str, path: Path) -> None:
+        pass
+
+    async def coro_other(name: str, path: Path) -> None:
+        assert not running
+        loaded.append(name)
+
+    file_manager.add_handler(
+        'myhandler', logger=file_manager_logger, prefix='n', on_load=coro_on_load, on_unload=coro_on_unload
+    )
+    file_manager.add_handler(
+        'other', logger=file_manager_logger, prefix='p', on_load=coro_other, on_unload=coro_on_unload
+    )
+    file_manager._file_names.add_folder('n', Path('n'), priority=1)
+    file_manager._file_names.add_folder('p', Path('p'), priority=2)
+
+    for name, depends_on in (('n/name1', []), ('n/name2', []), ('n/name3', []), ('n/name4', ['n/name1']),
+                             ('p/param1', []), ('p/param2', [])):
+        file_manager._files[name] = HABAppFile(name, Path(name), b'', FileProperties(depends_on=depends_on))
+
+    await file_manager._load_file_task(keep_alive=False)
+
+    assert all(f._state is FileState.LOADED for f in file_manager._files.values())
+    assert max_running == 2
+
+    # files of the other handler are loaded first, the dependency is loaded before the file
+    assert loaded[:2] == ['p/param1', 'p/param2']
+    assert set(loaded[2:4]) == {'n/name2', 'n/name3'}
+    assert loaded[4:] == ['n/name1', 'n/name4']
+    test_logs.assert_ok()
+
+
+async def test_batch(monkeypatch, test_logs: LogCollector, file_manager) -> None:
+    steps = []
+
+    async def coro_on_load(name: str, path: Path) -> None:
+        steps.append(('load', name))
+
+    async def coro_on_unload(name: str, path: Path) -> None:
+        steps.append(('unload', name))
+
+    file_manager.add_handler(
+        'myhandler', logger=file_manager_logger, prefix='n', on_load=coro_on_load, on_unload=coro_on_unload
+    )
+    file_manager._file_names.add_folder('n', Path('n'), priority=1)
+
+    properties = {
+        'n/name1': FileProperties(depends_on=['n/name3']),
+        'n/name2': FileProperties(),
+        'n/name3': FileProperties(depends_on=['n/name4']),
+        'n/name4': FileProperties(),
+        'n/name5': FileProperties(depends_on=['n/name6']),
+    }
+
+    def create_file(name: str) -> HABAppFile:
+        return HABAppFile(name, Path(name), b'', properties[name])
+
+    monkeypatch.setattr(file_manager, '_FileManager__create_file', create_file)
+
+    file_manager._files['n/name2'] = f2 = create_file('n/name2')
+    f2._state = FileState.LOADED
+
+    for name in ('n/name1', 'n/name2', 'n/name3', 'n/name4', 'n/name5'):
+        file_manager._files_request_load.add(name)
+
+    assert await file_manager._process_batch(log_msg=False) == (1, 4)
+
+    # name5 depends on a file which doesn't exist
+    assert file_manager.get_file('n/name5')._state is FileState.DEPENDENCIES_ERROR
+    assert steps == [
+        ('unload', 'n/name2'),
+        ('load', 'n/name2'), ('load', 'n/name4'), ('load', 'n/name3'), ('load', 'n/name1'),
+    ]
+
+    # nothing left to do
+    assert await file_manager._process_batch(log_msg=False) == (0, 0)
+    test_logs.assert_ok()
+
+
+async def test_parallel_load_reloads_on(monkeypatch, test_logs: LogCollector, file_manager) -> None:
+    monkeypatch.setattr(HABApp.CONFIG.habapp.files, 'parallel_load', 2)
+
+    steps = []
+
+    async def coro_on_load(name: str, path: Path) -> None:
+        steps.append(('load', name))
+        await asyncio.sleep(0.01)
+
+    async def coro_on_unload(name: str, path: Path) -> None:
+        steps.append(('unload', name))
+
+    file_manager.add_handler(
+        'myhandler', logger=file_manager_logger, prefix='n', on_load=coro_on_load, on_unload=coro_on_unload
+    )
+    file_manager._file_names.add_folder('n', Path('n'), priority=1)
+
+    f1 = HABAppFile('n/name1', Path('n/name1'), b'', FileProperties(reloads_on=['n/name2']))
+    f2 = HABAppFile('n/name2', Path('n/name2'), b'', FileProperties())
+    file_manager._files['n/name1'] = f1
+    file_manager._files['n/name2'] = f2
+    f1._state = FileState.DEPENDENCIES_OK
+    f2._state = FileState.DEPENDENCIES_OK
+
+    assert await file_manager._do_files_load(['n/name1', 'n/name2'], 2) == 2
+    assert f1._state is FileState.UNLOAD_PENDING
+
+    await file_manager._load_file_task(keep_alive=False)
+
+    # the files are not loaded concurrently so name1 gets reloaded, the same as with the sequential load
+    assert steps == [('load', 'n/name1'), ('load', 'n/name2'), ('unload', 'n/name1'), ('load', 'n/name1')]
+    assert all(f._state is FileState.LOADED for f in file_manager._files.values())
+    test_logs.assert_ok()
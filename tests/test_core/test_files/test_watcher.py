@@ -7,8 +7,9 @@ from typing_extensions import Self
 from watchfiles import Change
 
 from HABApp.core.const.const import PYTHON_312
-from HABApp.core.files import HABAppFileWatcher
+from HABApp.core.files import FileDispatcher, FolderDispatcher, HABAppFileWatcher
 from HABApp.core.files import watcher as watcher_module
+from HABApp.core.files.watcher import DispatcherIndex
 
 
 class MyPath(PurePath):
@@ -59,3 +60,32 @@ async def test_watcher(monkeypatch, test_logs) -> None:
         'HABApp.file.events', 'DEBUG', 'Watching my\\folder\\1' if os.name == 'nt' else 'Watching my/folder/1')
     test_logs.add_expected('HABApp.file.events', 'DEBUG', 'added my/folder/2/file1 (ignored)')
     test_logs.assert_ok()
+
+
+def test_dispatcher_index() -> None:
+    async def coro(text: str) -> None:
+        pass
+
+    d1 = FolderDispatcher('d1', coro, 'my/folder')
+    d2 = FileDispatcher('d2', coro, 'my/folder/sub/file.py')
+    d3 = FolderDispatcher('d3', coro, 'my/folder/sub')
+    d4 = FolderDispatcher('d4', coro, '/abs/folder')
+
+    index = DispatcherIndex((d1, d2, d3, d4))
+
+    # dispatchers are returned in the order they were added
+    assert index.get_dispatchers('my/folder/sub/file.py') == [d1, d2, d3]
+    assert index.get_dispatchers('my/folder/sub/file2.py') == [d1, d3]
+    assert index.get_dispatchers('my/folder/file.py') == [d1]
+    assert index.get_dispatchers('my/folder') == [d1]
+    assert index.get_dispatchers('/abs/folder/a/b/c.py') == [d4]
+
+    # only whole folder names match
+    assert index.get_dispatchers('my/folder2/file.py') == []
+    assert index.get_dispatchers('my/file.py') == []
+    assert index.get_dispatchers('/abs') == []
+    assert index.get_dispatchers('file.py') == []
+
+    for d in (d1, d2, d3, d4):
+        for path in ('my/folder/sub/file.py', 'my/folder2/file.py', '/abs/folder/a/b/c.py', 'my/folder'):
+            assert d.allow(None, path) is (d in index.get_dispatchers(path))
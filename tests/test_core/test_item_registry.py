@@ -1,8 +1,12 @@
+import re
+
 import pytest
 
 from HABApp.core.errors import ItemNotFoundException
-from HABApp.core.internals import ItemRegistry
-from HABApp.core.items import Item
+from HABApp.core.internals import ItemRegistry, ItemRegistryQuery
+from HABApp.core.items import BaseValueItem, Item
+from HABApp.openhab.items import OpenhabItem
+from HABApp.openhab.items.base_item import MetaData
 
 
 def test_basics() -> None:
@@ -33,3 +37,69 @@ def test_errors() -> None:
 
     with pytest.raises(ItemNotFoundException, match='Item asdf does not exist!'):
         ir.get_item('asdf')
+
+
+def test_query() -> None:
+    ir = ItemRegistry()
+    a = ir.add_item(Item('a'))
+    b = ir.add_item(BaseValueItem('b'))
+    c = ir.add_item(Item('c'))
+
+    q = ItemRegistryQuery(type=Item)
+    assert q.get_items(ir) == (a, c)
+    assert q.get_items(ir) is q.get_items(ir)
+
+    assert ItemRegistryQuery(type=BaseValueItem).get_items(ir) == (a, b, c)
+    assert ItemRegistryQuery(name=re.compile('[ab]')).get_items(ir) == (a, b)
+    assert ItemRegistryQuery(type=Item, func=lambda x: x.name != 'a').get_items(ir) == (c, )
+
+    # the result is updated when the registry changes
+    ir.pop_item('a')
+    assert q.get_items(ir) == (c, )
+    ir.add_item(a)
+    assert q.get_items(ir) == (c, a)
+
+
+def test_query_func() -> None:
+    ir = ItemRegistry()
+    a = ir.add_item(Item('a', 1))
+    b = ir.add_item(Item('b', 2))
+
+    # the function depends on the value which does not change the registry, so it must not be cached
+    q = ItemRegistryQuery(type=Item, func=lambda x: x.value == 1)
+    assert q.get_items(ir) == (a, )
+
+    a.set_value(2)
+    b.set_value(1)
+    assert q.get_items(ir) == (b, )
+
+
+def test_index(ir: ItemRegistry) -> None:
+    a = ir.add_item(OpenhabItem('a', tags=frozenset({'t1', 't2'}), groups=frozenset({'g1'}),
+                                metadata={'homekit': MetaData('')}))
+    b = ir.add_item(OpenhabItem('b', tags=frozenset({'t1'}), metadata={'alexa': MetaData('')}))
+
+    assert ItemRegistryQuery(index={'tags': ['t1']}).get_items(ir) == (a, b)
+    assert ItemRegistryQuery(index={'tags': ['t1', 't2']}).get_items(ir) == (a, )
+    assert ItemRegistryQuery(index={'tags': ['t1'], 'groups': ['g1']}).get_items(ir) == (a, )
+    assert ItemRegistryQuery(index={'tags': ['t3']}).get_items(ir) == ()
+    assert ItemRegistryQuery(index_pattern={'metadata': re.compile('^a')}).get_items(ir) == (b, )
+
+    q = ItemRegistryQuery(index={'tags': ['t2']})
+    assert q.get_items(ir) == (a, )
+
+    version = ir.version
+    b._update_item_definition(OpenhabItem('b', tags=frozenset({'t1', 't2'})))
+    assert ir.version != version
+    assert q.get_items(ir) == (a, b)
+
+    # no change -> no new version
+    version = ir.version
+    ir.update_index(b)
+    assert ir.version == version
+
+    ir.pop_item('a')
+    assert q.get_items(ir) == (b, )
+    assert ir._indexes['tags'].keys() == {'t1', 't2'}
+    assert 'groups' not in ir._indexed.get('b', {})
+    ir.pop_item('b')
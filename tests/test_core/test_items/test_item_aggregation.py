@@ -1,5 +1,8 @@
 import asyncio
 
+import pytest
+
+from HABApp.core.events import ValueUpdateEvent
 from HABApp.core.items import AggregationItem, Item
 
 
@@ -72,4 +75,30 @@ async def test_aggregation_item_cleanup() -> None:
     await asyncio.sleep(5 * INTERVAL)
 
     agg.aggregation_period(INTERVAL)
-    assert list(agg._vals) == [7, 9]
+    assert list(agg._history) == [7, 9]
+
+
+async def test_aggregation_item_incremental() -> None:
+    agg = AggregationItem.get_create_item('MyIncrementalAggregation')
+    src = Item.get_create_item('MyIncrementalSource')
+
+    agg.aggregation_period(60)
+    agg.aggregation_source(src)
+    agg.aggregation_func(max)
+
+    for value in (1, 5, 3):
+        await agg._add_value(ValueUpdateEvent(src.name, value))
+    assert agg.value == 5
+
+    agg.aggregation_func(min)
+    await agg._add_value(ValueUpdateEvent(src.name, 2))
+    assert agg.value == 1
+
+    # Fallback for non numeric values
+    agg.aggregation_func(lambda x: ','.join(map(str, x)))
+    await agg._add_value(ValueUpdateEvent(src.name, 'a'))
+    assert agg.value == '1,5,3,2,a'
+
+    agg.aggregation_func(max)
+    with pytest.raises(TypeError):
+        agg._aggregate()
@@ -72,8 +72,8 @@ async def test_cancel_running(parent_rule, u: UpdatedTime) -> None:
     w2 = u.tasks[1]
 
     await asyncio.sleep(1.1)
-    assert w1.fut.task.done()
-    assert not w2.fut.task.done()
+    assert not w1.fut.is_pending
+    assert w2.fut.is_pending
 
     assert w2 in u.tasks
     w2.cancel()
@@ -209,3 +209,18 @@ async def test_watcher_update_cleanup(monkeypatch, parent_rule, c: ChangedTime,
 
     assert text_warning == 'Item test_save_restore has been deleted 0.7s ago even though it has item watchers.' \
                            ' If it will be added again the watchers have to be created again, too!'
+
+
+async def test_batched_schedule(parent_rule, u: UpdatedTime, monkeypatch) -> None:
+    calls = []
+    monkeypatch.setattr(u, '_schedule_events', lambda: calls.append(1))
+
+    for _ in range(10):
+        u.set(Instant.now())
+    assert not calls
+
+    await asyncio.sleep(0)
+    assert calls == [1]
+
+    for t in u.tasks:
+        t.cancel()
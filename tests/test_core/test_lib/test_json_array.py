@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+from HABApp.core.lib.json_array import JsonArraySplitter
+
+
+def split(data: bytes, size: int) -> list[bytes]:
+    splitter = JsonArraySplitter()
+    elements = []
+    for i in range(0, len(data), size):
+        elements.extend(splitter.feed(data[i:i + size]))
+    assert splitter.done
+    return elements
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 1000])
+def test_split(size: int) -> None:
+    objs = [
+        {'name': 'a', 'tags': ['x', 'y'], 'nested': {'list': [1, 2, {'a': None}]}},
+        {'name': 'quote " and brackets [{', 'escaped': 'back\\\\slash \\" end'},
+        {'name': 'c', 'value': 1.5},
+        [1, [2, 3]],
+        'str, with comma',
+        5,
+    ]
+    data = json.dumps(objs, indent=2).encode()
+
+    assert [json.loads(e) for e in split(data, size)] == objs
+
+
+def test_empty() -> None:
+    assert split(b' [ ] ', 1) == []
+    assert split(b'[{}]', 1) == [b'{}']
+
+
+def test_incomplete() -> None:
+    splitter = JsonArraySplitter()
+    assert splitter.feed(b'[{"a": 1}, {"b": "[') == [b'{"a": 1}']
+    assert not splitter.done
+    assert splitter.feed(b'"}]') == [b'{"b": "["}']
+    assert splitter.done
+
+
+def test_no_array() -> None:
+    with pytest.raises(ValueError, match='Expected a json array'):
+        JsonArraySplitter().feed(b'{"a": 1}')
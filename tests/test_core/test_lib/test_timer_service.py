@@ -0,0 +1,80 @@
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from HABApp.core.lib import TimerService
+
+
+async def test_timer() -> None:
+    service = TimerService()
+    m = Mock()
+    t = service.create_timer(m, 0.05)
+    assert not t.is_pending
+
+    t.reset()
+    assert t.is_pending
+    assert service.get_stats().pending == 1
+
+    # resets only move the deadline
+    for _ in range(5):
+        await asyncio.sleep(0.02)
+        t.reset()
+    assert service.get_stats().heap == 1
+    m.assert_not_called()
+
+    await asyncio.sleep(0.07)
+    m.assert_called_once()
+    assert not t.is_pending
+
+    stats = service.get_stats()
+    assert stats.timers == 1
+    assert stats.pending == 0
+    assert stats.resets == 6
+    assert stats.expired == 1
+
+
+async def test_timer_order() -> None:
+    service = TimerService()
+    calls = []
+
+    timers = [service.create_timer(lambda i=i: calls.append(i), secs) for i, secs in enumerate((0.06, 0.02, 0.04))]
+    for t in timers:
+        t.reset()
+
+    await asyncio.sleep(0.1)
+    assert calls == [1, 2, 0]
+
+
+async def test_timer_cancel() -> None:
+    service = TimerService()
+    m = Mock()
+    t = service.create_timer(m, 0.02)
+    t.reset()
+    t.cancel()
+    assert service.get_stats().pending == 0
+    assert service.get_stats().timers == 0
+
+    # can not be started again
+    t.reset()
+    await asyncio.sleep(0.05)
+    m.assert_not_called()
+    assert service.get_stats().heap == 0
+
+    with pytest.raises(ValueError):
+        service.create_timer(m, -1)
+
+
+
+async def test_timer_reset_after_expire() -> None:
+    service = TimerService()
+    m = Mock()
+    t = service.create_timer(m, 0.02)
+
+    # the function is called in the next loop iteration, if the timer was reset in between it's not called
+    t.reset()
+    service._call_expired([t])
+    m.assert_not_called()
+
+    await asyncio.sleep(0.04)
+    m.assert_called_once()
@@ -0,0 +1,90 @@
+import random
+import statistics
+
+import pytest
+
+from HABApp.core.lib import ValueHistory
+
+
+def test_ring_buffer() -> None:
+    h = ValueHistory(max_samples=3)
+    for i in range(5):
+        h.append(i, i / 10)
+
+    assert len(h) == 3
+    assert list(h) == [2, 3, 4]
+    assert list(h.timestamps()) == [0.2, 0.3, 0.4]
+    assert h[0] == 2
+    assert h[-1] == 4
+    assert h.get_timestamp(-1) == 0.4
+
+    assert h.popleft() == (0.2, 2)
+    assert h.remove_older_than(0.35) == 1
+    assert list(h) == [4]
+
+    with pytest.raises(IndexError):
+        h[1]
+
+    h.clear()
+    assert len(h) == 0
+    with pytest.raises(IndexError):
+        h.popleft()
+
+
+def test_types() -> None:
+    h = ValueHistory()
+    h.append(1, 0)
+    assert type(h[0]) is int
+
+    h.append(1.5, 1)
+    assert list(h) == [1, 1.5]
+    assert h.sum == 2.5
+    assert h.numeric
+
+    h.append('a', 2)
+    assert list(h) == [1, 1.5, 'a']
+    assert not h.numeric
+    with pytest.raises(TypeError):
+        _ = h.sum
+
+
+def test_statistics() -> None:
+    h = ValueHistory()
+    assert h.sum is None
+    assert h.median is None
+
+    for max_samples in (None, 1, 2, 7):
+        h = ValueHistory(max_samples)
+        ref = []
+
+        for i in range(500):
+            if random.random() < 0.6 or not ref:
+                value = random.choice((random.randint(-10, 10), random.random() * 100, i))
+                h.append(value, i)
+                ref.append(value)
+                if max_samples is not None and len(ref) > max_samples:
+                    ref.pop(0)
+            else:
+                h.popleft()
+                ref.pop(0)
+
+            assert list(h) == ref
+            if not ref:
+                continue
+
+            assert h.sum == pytest.approx(sum(ref))
+            assert h.mean == pytest.approx(statistics.mean(ref))
+            assert h.min == min(ref)
+            assert h.max == max(ref)
+            assert h.median == statistics.median(ref)
+
+
+def test_heaps_stay_small() -> None:
+    h = ValueHistory()
+    for i in range(10_000):
+        h.append(i, i)
+        if len(h) > 50:
+            h.popleft()
+
+    assert h.median == 9974.5
+    assert len(h._low) + len(h._high) <= 2 * 50 + 16
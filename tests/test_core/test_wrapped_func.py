@@ -1,4 +1,5 @@
 import asyncio
+import threading
 from datetime import date
 from unittest.mock import AsyncMock, Mock
 
@@ -6,13 +7,16 @@ import pytest
 
 import HABApp
 from HABApp.core.const.topics import TOPIC_ERRORS
-from HABApp.core.events import NoEventFilter
+from HABApp.core.events import NoEventFilter, ValueCommandEvent, ValueUpdateEvent
 from HABApp.core.internals import EventBusListener, wrap_func
 from HABApp.core.internals.wrapped_function.wrapped_sync import WrappedSyncFunction
 from HABApp.core.internals.wrapped_function.wrapped_thread import (
+    PoolFunc,
     WrappedThreadFunction,
     create_thread_pool,
+    get_thread_pool_metrics,
     stop_thread_pool,
+    thread_partition,
 )
 from tests.helpers import TestEventBus
 
@@ -123,3 +127,77 @@ async def test_wrapped_sync_func(thread_pool, eb: TestEventBus) -> None:
 
     ret = await WrappedSyncFunction(func).async_run()
     assert ret is None
+
+
+async def test_thread_pool_metrics(thread_pool) -> None:
+
+    def func() -> int:
+        return 1
+
+    f = WrappedThreadFunction(func, name='my_func')
+    for _ in range(3):
+        await f.async_run()
+
+    metrics = get_thread_pool_metrics()
+    assert metrics.threads == 2
+    assert metrics.peak_concurrency == 1
+    assert metrics.run_time.count == 3
+    assert metrics.queue_wait.count == 3
+    assert sum(metrics.queue_wait.buckets.values()) == 3
+    assert metrics.callbacks['my_func'].count == 3
+
+    summary = metrics.get_summary()
+    assert summary[0] == 'Thread pool: 2 threads, peak concurrency: 1, runs: 3'
+    assert summary[-1].startswith('    my_func: runs 3, total ')
+
+    # metrics get reset with the thread pool
+    create_thread_pool(2)
+    assert get_thread_pool_metrics().run_time.count == 0
+
+
+def test_pool_func_usage_high(thread_pool) -> None:
+    parent = WrappedThreadFunction(lambda: None)
+    inner = PoolFunc(parent, lambda: None, (), {})
+
+    def func() -> None:
+        inner.run()
+
+    outer = PoolFunc(parent, func, (), {})
+    outer.run()
+
+    # concurrency is sampled when the function starts and ends
+    assert inner.usage_high == 2
+    assert outer.usage_high == 1
+
+
+async def test_thread_pool_partitions() -> None:
+    create_thread_pool(1, priority_threads=1, partitions={'slow': 1})
+
+    def get_thread_name(*args: object) -> str:
+        return threading.current_thread().name
+
+    @thread_partition('slow')
+    def partition_func(*args: object) -> str:
+        return threading.current_thread().name
+
+    try:
+        assert await WrappedThreadFunction(get_thread_name).async_run() == 'HabAppWorker_0'
+        assert (await WrappedThreadFunction(partition_func).async_run()).startswith('HabAppWorker_slow')
+        assert (await WrappedThreadFunction(get_thread_name, partition='slow').async_run()).startswith(
+            'HabAppWorker_slow')
+
+        # Command events always run in the priority partition
+        event = ValueCommandEvent('item', 1)
+        assert (await WrappedThreadFunction(get_thread_name).async_run(event)).startswith('HabAppWorker_priority')
+        assert (await WrappedThreadFunction(partition_func).async_run(event)).startswith('HabAppWorker_priority')
+        assert (await WrappedThreadFunction(partition_func).async_run(ValueUpdateEvent('item', 1))).startswith(
+            'HabAppWorker_slow')
+
+        assert get_thread_pool_metrics().threads == 3
+    finally:
+        stop_thread_pool()
+
+
+def test_thread_partition_decorator() -> None:
+    with pytest.raises(ValueError, match='Partition name must be a non empty string'):
+        thread_partition('')
@@ -0,0 +1,107 @@
+import pytest
+from aiomqtt import Message
+from pydantic import BaseModel
+
+import HABApp.mqtt.mqtt_codecs as mqtt_codecs_module
+from HABApp.mqtt.mqtt_codecs import CODEC_REGISTRY, get_topic_pattern
+from HABApp.mqtt.mqtt_payload import get_msg_payload
+from HABApp.mqtt.util import (
+    MqttJsonCodec,
+    MqttModelCodec,
+    MqttNumberCodec,
+    MqttRawCodec,
+    MqttStrCodec,
+    register_payload_codec,
+    remove_payload_codec,
+)
+
+
+@pytest.fixture(autouse=True)
+def _clear_registry():
+    CODEC_REGISTRY.clear()
+    yield
+    CODEC_REGISTRY.clear()
+
+
+def get_payload(topic: str, payload: bytes):
+    return get_msg_payload(Message(topic, payload, None, None, None, None))
+
+
+@pytest.mark.parametrize(
+    'topic, pattern, result', (
+        ('a/+/c', 'a/b/c', True),
+        ('a/+/c', 'a/b/b/c', False),
+        ('a/#', 'a', True),
+        ('a/#', 'a/b/c', True),
+        ('a/#', 'ab', False),
+        ('#', 'a/b', True),
+        ('+/+', 'a/b', True),
+        ('+/+', 'a', False),
+    )
+)
+def test_topic_pattern(topic: str, pattern: str, result: bool) -> None:
+    assert get_topic_pattern(topic).matches(pattern) is result
+
+
+def test_topic_pattern_invalid() -> None:
+    assert get_topic_pattern('a/b') is None
+    with pytest.raises(ValueError):
+        get_topic_pattern('a/#/b')
+    with pytest.raises(ValueError):
+        get_topic_pattern('a/b+')
+
+
+def test_codecs() -> None:
+    class Model(BaseModel):
+        a: int
+
+    register_payload_codec('raw', MqttRawCodec())
+    register_payload_codec('str', MqttStrCodec())
+    register_payload_codec('zigbee2mqtt/+', MqttJsonCodec())
+    register_payload_codec('zigbee2mqtt/model', MqttModelCodec(Model))
+    register_payload_codec('number/#', MqttNumberCodec())
+
+    assert get_payload('raw', b'1') == ('raw', b'1')
+    assert get_payload('str', b'1') == ('str', '1')
+    assert get_payload('zigbee2mqtt/dev', b'{"a": 1}') == ('zigbee2mqtt/dev', {'a': 1})
+    assert get_payload('zigbee2mqtt/model', b'{"a": 1}') == ('zigbee2mqtt/model', Model(a=1))
+    assert get_payload('number/a', b'1') == ('number/a', 1)
+    assert get_payload('number/a', b'1.5') == ('number/a', 1.5)
+
+    # no codec
+    assert get_payload('other', b'1') == ('other', 1)
+
+    assert remove_payload_codec('zigbee2mqtt/+')
+    assert not remove_payload_codec('zigbee2mqtt/+')
+    assert get_payload('zigbee2mqtt/dev', b'[1]') == ('zigbee2mqtt/dev', [1])
+
+
+def test_codec_pattern_order() -> None:
+    register_payload_codec('a/#', MqttStrCodec())
+    register_payload_codec('a/+', MqttRawCodec())
+    assert get_payload('a/b', b'1') == ('a/b', '1')
+
+    # register again replaces the codec
+    register_payload_codec('a/#', MqttNumberCodec())
+    assert get_payload('a/b', b'1') == ('a/b', b'1')
+    assert get_payload('a/b/c', b'1') == ('a/b/c', 1)
+
+    assert remove_payload_codec('a/+')
+    assert get_payload('a/b', b'1') == ('a/b', 1)
+
+
+def test_codec_cache_size(monkeypatch) -> None:
+    monkeypatch.setattr(mqtt_codecs_module, 'CODEC_CACHE_SIZE', 2)
+    register_payload_codec('a/+', MqttStrCodec())
+
+    for i in range(5):
+        assert get_payload(f'a/{i:d}', b'1') == (f'a/{i:d}', '1')
+        assert get_payload(f'b/{i:d}', b'1') == (f'b/{i:d}', 1)
+        assert len(CODEC_REGISTRY._cache) <= 2
+
+
+@pytest.mark.ignore_log_errors
+def test_codec_error(eb) -> None:
+    eb.allow_errors = True
+    register_payload_codec('number', MqttNumberCodec())
+    assert get_payload('number', b'asdf') == (None, None)
@@ -0,0 +1,69 @@
+import asyncio
+from unittest.mock import MagicMock
+
+from HABApp.config import CONFIG
+from HABApp.mqtt.connection import publish
+from HABApp.mqtt.connection.publish import PublishHandler, async_publish, create_queue, get_publish_key
+
+
+def test_coalesce_retained(monkeypatch) -> None:
+    monkeypatch.setattr(CONFIG.mqtt.publish, 'coalesce_retained', True)
+    queue = create_queue()
+    monkeypatch.setattr(publish, 'QUEUE', queue)
+
+    async_publish('a', 1, retain=True)
+    async_publish('b', 1, retain=True)
+    async_publish('a', 2, retain=True)
+    async_publish('a', 3, qos=1, retain=False)
+    async_publish('a', 4, retain=True)
+    async_publish('a', 5, retain=True)
+
+    assert queue.get_stats().coalesced == 2
+    assert [queue.get_nowait() for _ in range(queue.qsize())] == [
+        ('a', 2, 0, True), ('b', 1, 0, True), ('a', 3, 1, False), ('a', 5, 0, True)
+    ]
+
+    assert get_publish_key(('a', 1, 0, False)) == ('a', False)
+
+
+async def test_in_flight(monkeypatch) -> None:
+    monkeypatch.setattr(CONFIG.mqtt.publish, 'in_flight', 3)
+    queue = create_queue()
+    monkeypatch.setattr(publish, 'QUEUE', queue)
+
+    published = []
+    in_flight = 0
+    in_flight_max = 0
+    confirm = asyncio.Event()
+
+    async def client_publish(topic, value, qos, retain) -> None:
+        nonlocal in_flight, in_flight_max
+        published.append(topic)
+        in_flight += 1
+        in_flight_max = max(in_flight, in_flight_max)
+        await confirm.wait()
+        in_flight -= 1
+
+    handler = PublishHandler()
+    handler.plugin_connection = MagicMock(context=MagicMock(publish=client_publish))
+
+    for i in range(10):
+        async_publish(f'topic{i}', i, qos=1)
+
+    task = asyncio.create_task(handler.mqtt_task())
+    await asyncio.sleep(0.05)
+    assert published == ['topic0', 'topic1', 'topic2']
+    assert handler.get_stats().in_flight == 3
+
+    confirm.set()
+    await asyncio.sleep(0.05)
+    assert published == [f'topic{i}' for i in range(10)]
+    assert in_flight_max == 3
+
+    stats = handler.get_stats()
+    assert stats.published == 10
+    assert stats.in_flight == 0
+    assert stats.queue.size == 0
+
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
@@ -0,0 +1,184 @@
+import json
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from HABApp.openhab.connection.handler import func_async
+from HABApp.openhab.connection.handler.func_async import async_get_persistence_data
+from HABApp.openhab.definitions.helpers import OpenhabPersistenceData
+from HABApp.openhab.definitions.helpers.persistence_data import PersistenceDataCache
+from HABApp.openhab.definitions.rest import ItemHistoryResp
+
+
+def get_dt(ts: float) -> datetime:
+    return datetime.fromtimestamp(ts, tz=timezone.utc)
+
+
+def create_data(data: dict) -> OpenhabPersistenceData:
+    obj = OpenhabPersistenceData()
+    obj.data = data
+    return obj
+
+
+def test_from_resp() -> None:
+    resp = ItemHistoryResp.model_validate({'name': 'Item', 'data': [
+        {'time': 2000, 'state': '2'}, {'time': 1000, 'state': '1.5'}, {'time': 3000, 'state': '5'}
+    ]})
+    data = OpenhabPersistenceData.from_resp(resp)
+    assert data.data == {1: 1.5, 2: 2, 3: 5}
+    assert list(data.data) == [1, 2, 3]
+    assert type(data.data[2]) is int
+
+    resp = ItemHistoryResp.model_validate({'name': 'Item', 'data': [
+        {'time': 1000, 'state': 'ON'}, {'time': 2000, 'state': '1'}
+    ]})
+    data = OpenhabPersistenceData.from_resp(resp)
+    assert data.data == {1: 'ON', 2: 1}
+
+    # data is a regular dict which can be modified
+    data.data[3] = 'OFF'
+    assert data.get_data() == {1: 'ON', 2: 1, 3: 'OFF'}
+
+
+def test_aggregate() -> None:
+    data = create_data({1: 4, 2: 2, 3: 8, 4: 6})
+
+    assert data.min() == 2
+    assert data.max() == 8
+    assert data.average() == 5
+
+    assert data.min(get_dt(3)) == 6
+    assert data.max(end_date=get_dt(2)) == 4
+    assert data.average(get_dt(2), get_dt(3)) == 5
+    assert data.get_data(get_dt(2), get_dt(3)) == {2: 2, 3: 8}
+    assert data.average(get_dt(5)) is None
+
+    assert data.aggregate('sum') == 20
+    assert data.aggregate('count', get_dt(2)) == 3
+    assert data.aggregate('count', get_dt(5)) == 0
+    assert data.aggregate('last', end_date=get_dt(3)) == 8
+
+    with pytest.raises(ValueError):
+        data.aggregate('asdf')
+
+
+def test_window_resample() -> None:
+    data = create_data({0: 1, 1: 3, 5: 5, 6: 7, 25: 9})
+
+    window = data.window(get_dt(1), get_dt(6))
+    assert window.data == {1: 3, 5: 5, 6: 7}
+
+    resampled = data.resample(5)
+    assert resampled.data == {0: 2, 5: 6, 25: 9}
+    assert data.resample(10, 'count').data == {0: 4, 20: 1}
+    assert data.resample(10, 'max').data == {0: 7, 20: 9}
+    assert type(window.data[1]) is int
+
+
+def test_columns() -> None:
+    resp = ItemHistoryResp.model_validate({'name': 'Item', 'data': [
+        {'time': 2000, 'state': '2'}, {'time': 1000, 'state': '1'}, {'time': 3000, 'state': '3'}
+    ]})
+    data = OpenhabPersistenceData.from_resp(resp)
+    assert data.max() == 3
+
+    # modifications of the data are reflected
+    data.data[4] = 7
+    assert data.max() == 7
+    assert data.get_data(get_dt(3)) == {3: 3, 4: 7}
+    data.data.update({0: 9})
+    assert data.aggregate('first') == 9
+    del data.data[0]
+    assert data.aggregate('first') == 1
+
+    # columns are created even if the data is replaced with a regular dict
+    data.data = {1: 'ON', 2: 'OFF'}
+    assert data.aggregate('last') == 'OFF'
+    assert data.window(get_dt(2)).data == {2: 'OFF'}
+
+
+def test_cache() -> None:
+    cache = PersistenceDataCache(max_entries=2)
+    obj = OpenhabPersistenceData()
+
+    cache.set(('a', 1), obj)
+    cache.set(('b', 1), obj)
+    assert cache.get(('a', 1), 10) is obj
+    assert cache.get(('a', 1), -1) is None
+
+    # b is the least recently used entry
+    cache.set(('c', 1), obj)
+    assert cache.get(('b', 1), 10) is None
+    assert cache.get(('a', 1), 10) is obj
+
+    cache.remove_item('a')
+    assert cache.get(('a', 1), 10) is None
+    assert cache.get(('c', 1), 10) is obj
+
+
+def test_cache_key() -> None:
+    key = PersistenceDataCache.get_key
+
+    # times are rounded to max_age so queries relative to now will use the same entry
+    assert key('a', None, get_dt(100), get_dt(200), 60) == key('a', None, get_dt(101.5), get_dt(201.5), 60)
+    assert key('a', None, get_dt(100), None, 60) != key('a', None, get_dt(130), None, 60)
+    assert key('a', None, get_dt(100), None, 60) != key('a', 'rrd4j', get_dt(100), None, 60)
+    assert key('a', None, get_dt(100), None, 0) != key('a', None, get_dt(100.5), None, 0)
+    assert key('a', None, None, None, 60)[0] == 'a'
+    # different max_age values must not share a bucket
+    assert key('a', None, get_dt(0), get_dt(150), 60) != key('a', None, get_dt(0), get_dt(20), 120)
+
+
+async def test_paging(monkeypatch) -> None:
+    pages = [
+        [{'time': 1000, 'state': '1'}, {'time': 2000, 'state': '2'}],
+        [{'time': 3000, 'state': '3'}, {'time': 4000, 'state': '4'}],
+        [{'time': 5000, 'state': '5'}],
+    ]
+
+    async def get(url, params: dict):
+        return Mock(status=200, read=AsyncMock(
+            return_value=json.dumps({'name': 'Item', 'data': pages[int(params['page'])]}).encode()
+        ))
+
+    mock = AsyncMock(side_effect=get)
+    monkeypatch.setattr(func_async, 'get', mock)
+
+    ret = await async_get_persistence_data('Item', 'rrd4j', None, None, page_length=2)
+    assert [p.time for p in ret.data] == [1000, 2000, 3000, 4000, 5000]
+    assert mock.call_count == 3
+    assert mock.call_args[1]['params'] == {'serviceId': 'rrd4j', 'pagelength': '2', 'page': '2'}
+
+
+@pytest.mark.parametrize('page_length', [2, 3])
+async def test_paging_not_supported(monkeypatch, page_length: int) -> None:
+    # service ignores the paging and always returns all data
+    data = [{'time': 1000, 'state': '1'}, {'time': 2000, 'state': '2'}, {'time': 3000, 'state': '3'}]
+
+    async def get(url, params: dict):
+        return Mock(status=200, read=AsyncMock(return_value=json.dumps({'name': 'Item', 'data': data}).encode()))
+
+    mock = AsyncMock(side_effect=get)
+    monkeypatch.setattr(func_async, 'get', mock)
+
+    ret = await async_get_persistence_data('Item', None, None, None, page_length=page_length)
+    assert [p.time for p in ret.data] == [1000, 2000, 3000]
+    assert mock.call_count == 1 if page_length == 2 else 2
+
+
+async def test_paging_max_pages(monkeypatch) -> None:
+    monkeypatch.setattr(func_async, 'PERSISTENCE_MAX_PAGES', 3)
+
+    async def get(url, params: dict):
+        page = int(params['page'])
+        return Mock(status=200, read=AsyncMock(
+            return_value=json.dumps({'name': 'Item', 'data': [{'time': (page + 1) * 1000, 'state': '1'}]}).encode()
+        ))
+
+    mock = AsyncMock(side_effect=get)
+    monkeypatch.setattr(func_async, 'get', mock)
+
+    ret = await async_get_persistence_data('Item', None, None, None, page_length=1)
+    assert [p.time for p in ret.data] == [1000, 2000, 3000]
+    assert mock.call_count == 3
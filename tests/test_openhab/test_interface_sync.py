@@ -7,6 +7,7 @@ import HABApp.openhab.interface_sync
 from HABApp.core.asyncio import AsyncContextError
 from HABApp.openhab.interface_sync import (
     create_item,
+    create_items,
     create_link,
     get_item,
     get_link,
@@ -41,6 +42,7 @@ def test_all_imported(func: Callable) -> None:
     (item_exists,           ('name', )),
     (remove_item,           ('name', )),
     (create_item,           ('String', 'name')),
+    (create_items,          ([], )),
     (get_persistence_services,  ()),
     (get_persistence_data,  ('name', None, None, None)),
     (set_persistence_data,  ('name', 'asdf', datetime.now(), None)),
@@ -1,22 +1,18 @@
 from HABApp.core.internals import ItemRegistry
-from HABApp.openhab import item_to_reg as item_to_reg_module
-from HABApp.openhab.item_to_reg import MEMBERS, add_to_registry, get_members, remove_from_registry
+from HABApp.openhab.item_to_reg import GROUP_INDEX, add_to_registry, get_members, remove_from_registry
 from HABApp.openhab.items import GroupItem, NumberItem, StringItem
 
 
-def test_get_group_name_to_item(monkeypatch, clean_objs, ir: ItemRegistry) -> None:
-    a = ir.add_item(StringItem('a', 1))
-    b = ir.add_item(StringItem('b', 'asdf'))
-    c = ir.add_item(StringItem('c', (1, 2)))
-    d = ir.add_item(StringItem('d'))
-    monkeypatch.setitem(MEMBERS, 'test_grp', {d.name, c.name, b.name, a.name})
+def test_get_group_name_to_item(clean_objs, ir: ItemRegistry) -> None:
+    d = ir.add_item(StringItem('d', groups=frozenset({'test_grp'})))
+    c = ir.add_item(StringItem('c', (1, 2), groups=frozenset({'test_grp'})))
+    b = ir.add_item(StringItem('b', 'asdf', groups=frozenset({'test_grp'})))
+    a = ir.add_item(StringItem('a', 1, groups=frozenset({'test_grp'})))
 
     assert get_members('test_grp') == (a, b, c, d)
 
 
-def test_add(monkeypatch, clean_objs) -> None:
-    monkeypatch.setattr(item_to_reg_module, 'MEMBERS', {})
-
+def test_add(clean_objs) -> None:
     a = StringItem('a', groups={'c', })
     b = StringItem('b', groups={'c', 'does_not_exist'})
     c = GroupItem('c')
@@ -28,10 +24,10 @@ def test_add(monkeypatch, clean_objs) -> None:
     assert get_members('c') == (a, b)
     assert c.members == (a, b)
 
-    assert 'does_not_exist' in item_to_reg_module.MEMBERS
+    assert GROUP_INDEX.get_member_names('does_not_exist') == {'b'}
     remove_from_registry(b.name)
     assert get_members('c') == (a, )
-    assert 'does_not_exist' not in item_to_reg_module.MEMBERS
+    assert GROUP_INDEX.get_member_names('does_not_exist') == set()
 
     remove_from_registry(c.name)
     add_to_registry(c)
@@ -43,9 +39,47 @@ def test_add(monkeypatch, clean_objs) -> None:
     assert get_members('asdf') == ()
 
 
-def test_update(monkeypatch, clean_objs) -> None:
-    monkeypatch.setattr(item_to_reg_module, 'MEMBERS', {})
+def test_group_change(clean_objs, test_logs) -> None:
+    a = StringItem('a', groups=frozenset({'g1'}))
+    add_to_registry(a)
+    members = get_members('g1')
+    assert members == (a, )
+
+    # members are cached
+    assert get_members('g1') is members
+
+    # label change does not invalidate the cache
+    add_to_registry(StringItem('a', label='label', groups=frozenset({'g1'})))
+    assert get_members('g1') is members
+
+    add_to_registry(StringItem('a', groups=frozenset({'g2'})))
+    assert get_members('g1') == ()
+    assert get_members('g2') == (a, )
+    assert GROUP_INDEX.get_groups('a') == {'g2'}
+
+    # type change
+    add_to_registry(NumberItem('a', groups=frozenset({'g2'})))
+    assert get_members('g2') == (NumberItem.get_item('a'), )
+    test_logs.add_expected('HABApp.openhab.items', 'WARNING', f'Item type changed from {StringItem} to {NumberItem}')
+
+
+def test_nested(clean_objs) -> None:
+    add_to_registry(GroupItem('all', groups=frozenset({'loop'})))
+    add_to_registry(GroupItem('g1', groups=frozenset({'all'})))
+    add_to_registry(GroupItem('g2', groups=frozenset({'all', 'g1'})))
+    add_to_registry(GroupItem('loop', groups=frozenset({'g2'})))
+    add_to_registry(a := StringItem('a', groups=frozenset({'g1'})))
+    add_to_registry(b := StringItem('b', groups=frozenset({'g2', 'all'})))
 
+    grp = GroupItem.get_item('all')
+    assert grp.members == (b, GroupItem.get_item('g1'), GroupItem.get_item('g2'))
+    assert grp.all_members == (a, b)
+
+    assert GROUP_INDEX.get_groups('a') == {'g1'}
+    assert GROUP_INDEX.get_groups('a', nested=True) == {'g1', 'all', 'loop', 'g2'}
+
+
+def test_update(clean_objs) -> None:
     a = NumberItem('a')
     add_to_registry(a)
 
@@ -55,3 +89,16 @@ def test_update(monkeypatch, clean_objs) -> None:
 
     assert a.label == 'asdf'
     assert a.dimension == 'length'
+
+
+def test_members_cache_version(clean_objs) -> None:
+    a = StringItem('a', groups=frozenset({'g'}))
+    add_to_registry(a)
+    assert get_members('g') == (a, )
+
+    # an entry which was created for an old version must not be returned
+    GROUP_INDEX._cache[('g', False)] = (GROUP_INDEX.version - 1, ())
+    assert get_members('g') == (a, )
+
+    add_to_registry(b := StringItem('b', groups=frozenset({'g'})))
+    assert get_members('g') == (a, b)
@@ -1,17 +1,21 @@
+import json
 import logging
 
 from whenever import Instant
 
 import HABApp.openhab.connection.plugins.load_items as load_items_module
+import HABApp.openhab.map_items as map_items_module
 from HABApp.core.internals import ItemRegistry
 from HABApp.openhab.connection.connection import OpenhabContext
 from HABApp.openhab.connection.plugins import LoadOpenhabItemsPlugin
-from HABApp.openhab.definitions.rest import ItemRespList, ShortItemResp, ThingResp
+from HABApp.openhab.definitions.rest import ShortItemResp, ThingResp
 from HABApp.openhab.definitions.rest.things import ThingStatusResp
+from HABApp.openhab.events import ItemRemovedEvent, ItemStateUpdatedEvent, ItemUpdatedEvent
+from HABApp.openhab.item_to_reg import get_members
 from HABApp.openhab.items import Thing
 
 
-async def _mock_get_all_items():
+async def _mock_iter_items_json(chunk_size: int):
     resp = [
         {
             'link': 'link length',
@@ -54,7 +58,9 @@ async def _mock_get_all_items():
         },
     ]
 
-    return ItemRespList.validate_python(resp)
+    elements = [json.dumps(obj).encode() for obj in resp]
+    for i in range(0, len(elements), chunk_size):
+        yield elements[i:i + chunk_size]
 
 
 async def _mock_get_all_items_state():
@@ -68,12 +74,18 @@ async def _mock_get_empty():
     return []
 
 
+async def _mock_iter_empty(chunk_size: int):
+    for _ in ():
+        yield []
+
+
 async def _mock_raise():
     raise ValueError()
 
 
 async def test_item_sync(monkeypatch, ir: ItemRegistry, test_logs) -> None:
-    monkeypatch.setattr(load_items_module, 'async_get_items', _mock_get_all_items)
+    monkeypatch.setattr(load_items_module, 'async_iter_items_json', _mock_iter_items_json)
+    monkeypatch.setattr(load_items_module, 'ITEMS_CHUNK_SIZE', 2)
     monkeypatch.setattr(load_items_module, 'async_get_all_items_state', _mock_get_all_items_state)
     monkeypatch.setattr(load_items_module, 'async_get_things', _mock_get_empty)
 
@@ -95,8 +107,57 @@ async def test_item_sync(monkeypatch, ir: ItemRegistry, test_logs) -> None:
                            'Item ItemLength is a UoM item but "unit" is not found in item metadata')
 
 
+async def test_item_reconcile(monkeypatch, ir: ItemRegistry, test_logs) -> None:
+    monkeypatch.setattr(load_items_module, 'async_iter_items_json', _mock_iter_items_json)
+
+    mapped = []
+    map_item = map_items_module.map_item
+
+    def _map_item(name, *args, **kwargs):
+        mapped.append(name)
+        return map_item(name, *args, **kwargs)
+
+    monkeypatch.setattr(map_items_module, 'map_item', _map_item)
+
+    def new_context() -> OpenhabContext:
+        return OpenhabContext.new_context(version=(1, 0, 0), session=None, session_options=None, out_queue=None)
+
+    plugin = LoadOpenhabItemsPlugin()
+    await plugin.load_items(new_context())
+    assert mapped == ['ItemLength', 'ItemPlain', 'ItemNoUpdate']
+    assert set(plugin.item_fingerprints) == {'ItemLength', 'ItemPlain', 'ItemNoUpdate'}
+    assert plugin.item_fingerprints['ItemPlain'] == ('Number', 'Label plain', frozenset(), frozenset(), None)
+
+    # Reconnect: nothing has changed so nothing gets mapped again
+    mapped.clear()
+    ir.get_item('ItemPlain').set_value(5)
+    context = new_context()
+    await plugin.load_items(context)
+    assert mapped == []
+    assert ir.get_item('ItemPlain').value is None
+    assert set(context.created_items) == {'ItemLength', 'ItemPlain', 'ItemNoUpdate'}
+    assert get_members('grp1') == (ir.get_item('ItemLength'), )
+
+    # Changed definition gets mapped again
+    plugin.item_fingerprints['ItemPlain'] = 0
+    await plugin.load_items(new_context())
+    assert mapped == ['ItemPlain']
+
+    # Items which were changed through events get mapped again
+    mapped.clear()
+    await plugin.item_event_received(ItemUpdatedEvent('ItemPlain', 'Number', 'Label', frozenset(), frozenset()))
+    await plugin.item_event_received(ItemRemovedEvent('ItemLength', 'Number:Length', None, frozenset(), frozenset()))
+    await plugin.item_event_received(ItemStateUpdatedEvent('ItemNoUpdate', 5))
+    assert set(plugin.item_fingerprints) == {'ItemNoUpdate'}
+    await plugin.load_items(new_context())
+    assert mapped == ['ItemLength', 'ItemPlain']
+
+    test_logs.add_expected('HABApp.openhab.items', logging.WARNING,
+                           'Item ItemLength is a UoM item but "unit" is not found in item metadata')
+
+
 async def test_thing_sync(monkeypatch, ir: ItemRegistry, test_logs) -> None:
-    monkeypatch.setattr(load_items_module, 'async_get_items', _mock_get_empty)
+    monkeypatch.setattr(load_items_module, 'async_iter_items_json', _mock_iter_empty)
     monkeypatch.setattr(load_items_module, 'async_get_all_items_state', _mock_raise)
 
     things_resp: list[ThingResp] = []
@@ -140,7 +201,10 @@ async def test_thing_sync(monkeypatch, ir: ItemRegistry, test_logs) -> None:
 
     assert ir.get_item('thing_2').status_description == 'asdf'
 
-    assert test_logs.copy().set_min_level(10).update().get_messages() == [
+    messages = test_logs.copy().set_min_level(10).update().get_messages()
+    assert messages.pop(2).startswith(
+        '   [HABApp.openhab.items] | DEBUG | Loaded items in 0 chunks (0 changed): request ')
+    assert messages == [
         '   [HABApp.openhab.items] | DEBUG | Requesting items',
         '   [HABApp.openhab.items] | DEBUG | Got response with 0 items',
         '   [HABApp.openhab.items] | INFO  | Updated 0 Items',
@@ -149,6 +213,7 @@ async def test_thing_sync(monkeypatch, ir: ItemRegistry, test_logs) -> None:
         '   [        HABApp.Items] | DEBUG | Added thing_1 (Thing)',
         '   [        HABApp.Items] | DEBUG | Added thing_2 (Thing)',
         '   [HABApp.openhab.items] | INFO  | Updated 2 Things',
+        '   [              HABApp] | DEBUG | Added event listener for "openHAB.Items" (filter=NoEventFilter())',
         '   [HABApp.openhab.items] | DEBUG | Starting Thing sync',
         '   [HABApp.openhab.items] | DEBUG | Re-synced thing_2',
         '   [HABApp.openhab.items] | DEBUG | Thing sync complete',
@@ -0,0 +1,101 @@
+from HABApp.core.lib import OutgoingQueue
+from HABApp.openhab.connection.out_queue import get_http_event_key, get_websocket_event_key
+from HABApp.openhab.definitions.websockets import ItemCommandSendEvent, ItemStateSendEvent
+from HABApp.openhab.definitions.websockets.item_value_types import DecimalTypeModel
+
+
+def get_all(queue: OutgoingQueue) -> list:
+    ret = []
+    while not queue.empty():
+        ret.append(queue.get_nowait())
+        queue.task_done()
+    return ret
+
+
+def test_no_coalesce() -> None:
+    queue = OutgoingQueue(get_http_event_key)
+    for i in range(3):
+        queue.put_nowait(('item', str(i), False))
+    assert queue.qsize() == 3
+    assert get_all(queue) == [('item', '0', False), ('item', '1', False), ('item', '2', False)]
+
+
+def test_coalesce_http() -> None:
+    queue = OutgoingQueue(get_http_event_key, coalesce=True)
+
+    queue.put_nowait(('a', '1', False))
+    queue.put_nowait(('b', '1', False))
+    queue.put_nowait(('a', '2', False))
+    queue.put_nowait(('a', 'ON', True))
+    queue.put_nowait(('a', '3', False))
+    queue.put_nowait(('a', '4', False))
+    queue.put_nowait(('a', 'OFF', True))
+    queue.put_nowait(('a', 'OFF', True))
+
+    assert queue.qsize() == 6
+    stats = queue.get_stats()
+    assert stats.coalesced == 2
+    assert stats.age >= 0
+
+    # Updates are not moved in front of commands
+    assert get_all(queue) == [
+        ('a', '2', False), ('b', '1', False), ('a', 'ON', True), ('a', '4', False), ('a', 'OFF', True),
+        ('a', 'OFF', True)
+    ]
+
+    # Item can be coalesced again after it has been sent
+    queue.put_nowait(('a', '5', False))
+    queue.put_nowait(('a', '6', False))
+    assert get_all(queue) == [('a', '6', False)]
+
+    queue.put_nowait(('a', '7', False))
+    assert queue.clear() == 1
+    stats = queue.get_stats()
+    assert stats.size == 0
+    assert stats.dropped == 1
+    assert stats.coalesced == 3
+
+
+def test_coalesce_websocket() -> None:
+    queue = OutgoingQueue(get_websocket_event_key, coalesce=True)
+
+    def state(name: str, value: int) -> ItemStateSendEvent:
+        return ItemStateSendEvent.create(name, DecimalTypeModel(type='Decimal', value=str(value)))
+
+    e1, e2, e3 = state('Item1', 1), state('Item1', 2), state('Item2', 1)
+    cmd = ItemCommandSendEvent.create('Item1', DecimalTypeModel(type='Decimal', value='5'))
+
+    for e in (e1, e2, e3, cmd, e1):
+        queue.put_nowait(e)
+
+    assert get_all(queue) == [e2, e3, cmd, e1]
+
+
+def test_http_worker_routing(monkeypatch) -> None:
+    from HABApp.config import CONFIG
+    from HABApp.openhab.connection.plugins.out import OutgoingCommandsPlugin
+
+    monkeypatch.setattr(CONFIG.openhab.connection, 'http_workers', 4)
+
+    plugin = OutgoingCommandsPlugin()
+    assert plugin.get_http_queue('a') is None
+
+    plugin.http_queues = tuple(OutgoingQueue(get_http_event_key) for _ in range(4))
+    names = [f'Item{i:d}' for i in range(20)]
+    for i in range(3):
+        for name in names:
+            plugin.async_post_update(name, i)
+        plugin.async_send_command(names[0], 'ON')
+
+    # every item is processed by exactly one worker in the order it was queued
+    found: dict[str, list] = {}
+    for queue in plugin.http_queues:
+        for item, state, is_cmd in get_all(queue):
+            assert plugin.get_http_queue(item) is queue
+            found.setdefault(item, []).append((state, is_cmd))
+
+    assert found[names[0]] == [('0', False), ('ON', True), ('1', False), ('ON', True), ('2', False), ('ON', True)]
+    for name in names[1:]:
+        assert found[name] == [('0', False), ('1', False), ('2', False)]
+
+    assert set(plugin.get_queue_stats()) == {'http0', 'http1', 'http2', 'http3'}
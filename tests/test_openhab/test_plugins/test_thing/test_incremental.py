@@ -0,0 +1,85 @@
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+import HABApp.openhab.connection.plugins.plugin_things.plugin_things as plugin_module
+from HABApp.openhab.connection.plugins.plugin_things.plugin_things import TextualThingConfigPlugin
+from tests.helpers import MockFile
+
+
+THING_DATA = [
+    {'statusInfo': {'status': 'ONLINE', 'statusDetail': 'NONE'}, 'editable': True, 'label': 'Sun',
+     'configuration': {}, 'properties': {}, 'UID': 'astro:sun:1', 'thingTypeUID': 'astro:sun', 'channels': [
+        {'linkedItems': [], 'uid': 'astro:sun:1:rise#start', 'id': 'rise#start', 'channelTypeUID': 'astro:start',
+         'itemType': 'DateTime', 'kind': 'STATE', 'label': 'Start', 'description': '', 'defaultTags': [],
+         'properties': {}, 'configuration': {}},
+    ]}
+]
+
+TEXT = '''
+test: False
+filter:
+  thing_type: astro:sun
+create items:
+  - type: Number
+    name: Name1
+channels:
+  - filter:
+      channel_type: astro:start
+    link items:
+      - type: DateTime
+        name: Name2
+        label: {}
+'''
+
+
+@pytest.fixture
+def create_item(monkeypatch):
+    mock = AsyncMock(return_value=True)
+    monkeypatch.setattr(plugin_module, 'create_item', mock)
+    monkeypatch.setattr(plugin_module.ItemsFileWriter, 'create_file', lambda self, file: False)
+    return mock
+
+
+def get_created(mock: AsyncMock) -> list[str]:
+    ret = [c.args[0].name for c in mock.call_args_list]
+    mock.reset_mock()
+    return ret
+
+
+async def test_incremental_load(create_item: AsyncMock) -> None:
+    cfg = TextualThingConfigPlugin()
+    cfg.cache_cfg = THING_DATA
+    cfg.cache_ts = time.time()
+
+    file = MockFile('/thing_test.yml', data=TEXT.format('Label1'))
+    file.warn_on_delete = False
+
+    await cfg.file_load('/thing_test.yml', file)
+    assert get_created(create_item) == ['Name1', 'Name2']
+    assert cfg.created_items['thing_test.yml'] == {'Name1', 'Name2'}
+
+    # nothing has changed -> nothing will be done
+    await cfg.file_load('/thing_test.yml', file)
+    assert get_created(create_item) == []
+
+    # only the changed item is sent to openHAB
+    file.data = TEXT.format('Label2')
+    await cfg.file_load('/thing_test.yml', file)
+    assert get_created(create_item) == ['Name2']
+    assert cfg.created_items['thing_test.yml'] == {'Name1', 'Name2'}
+
+    # thing data has changed -> the file is evaluated again but the items are already correct
+    cfg.cache_cfg = [{**THING_DATA[0], 'label': 'New Label'}]
+    await cfg.file_load('/thing_test.yml', file)
+    assert get_created(create_item) == []
+    assert cfg.file_checksums
+
+    # everything is sent again after a reconnect
+    cfg.file_checksums.clear()
+    cfg.applied_items.clear()
+    await cfg.file_load('/thing_test.yml', file)
+    assert get_created(create_item) == ['Name1', 'Name2']
+
+    cfg.do_cleanup.cancel()
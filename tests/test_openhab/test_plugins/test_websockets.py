@@ -1,5 +1,10 @@
+import pytest
+from pydantic import ValidationError
+
 from HABApp.openhab.connection.plugins import WebsocketPlugin
-from HABApp.openhab.definitions.websockets import OPENHAB_EVENT_TYPE
+from HABApp.openhab.definitions.websockets import OPENHAB_EVENT_TYPE, WebsocketHeartbeatEvent
+from HABApp.openhab.definitions.websockets.item_events import ItemStateUpdatedEvent
+from HABApp.openhab.definitions.websockets.parser import OpenhabEventParser
 
 
 def test_type_adapter() -> None:
@@ -26,3 +31,33 @@ def test_type_adapter() -> None:
         'ThingUpdatedEvent',
         'WebSocketEvent'
     ]
+
+
+def test_event_parser() -> None:
+    parser = OpenhabEventParser()
+
+    # type is after the payload which contains a type, too
+    data = ('{"topic":"openhab/items/Ping/stateupdated","payload":"{\\"type\\":\\"Decimal\\",\\"value\\":\\"1\\"}",'
+            '"type":"ItemStateUpdatedEvent"}')
+    event = parser.parse(data)
+    assert isinstance(event, ItemStateUpdatedEvent)
+    assert event.to_event().value == 1
+
+    heartbeat = '{"type":"WebSocketEvent","topic":"openhab/websocket/heartbeat","payload":"PONG"}'
+    assert isinstance(parser.parse(heartbeat), WebsocketHeartbeatEvent)
+
+    with pytest.raises(ValidationError):
+        parser.parse('{"type":"UnknownEvent","topic":"a"}')
+
+    ret = parser.parse_batch([data, '{"type":"ItemStateUpdatedEvent"}'])
+    assert isinstance(ret[0], ItemStateUpdatedEvent)
+    assert isinstance(ret[1], ValidationError)
+
+    stats = parser.get_stats()
+    assert list(stats) == ['<unknown>', 'ItemStateUpdatedEvent', 'WebSocketEvent']
+    assert stats['ItemStateUpdatedEvent'].count == 3
+    assert stats['ItemStateUpdatedEvent'].errors == 1
+    assert stats['<unknown>'].errors == 1
+
+    parser.reset_stats()
+    assert parser.get_stats() == {}
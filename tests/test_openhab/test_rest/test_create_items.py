@@ -0,0 +1,87 @@
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from HABApp.openhab.connection.handler import func_async
+from HABApp.openhab.connection.handler.func_async import async_create_items
+from HABApp.openhab.definitions import OpenhabItemDefinition
+from HABApp.openhab.definitions.rest import ItemChannelLinkResp, ItemResp
+
+
+def test_definition() -> None:
+    d = OpenhabItemDefinition('Number:Temperature', 'Name', tags=['a'], metadata={'ns': 'val'})
+    assert d.tags == ('a', )
+    assert d.get_metadata() == {'ns': ('val', {})}
+
+    with pytest.raises(ValueError):
+        OpenhabItemDefinition('Asdf', 'Name')
+    with pytest.raises(ValueError):
+        OpenhabItemDefinition('Number:Asdf', 'Name')
+    with pytest.raises(ValueError):
+        OpenhabItemDefinition('Number', 'Name', group_function='AND')
+
+    resp = ItemResp.model_validate({
+        'type': 'Group', 'name': 'Name', 'state': 'NULL', 'tags': ['a', 'b'], 'groupNames': [],
+        'groupType': 'Switch', 'function': {'name': 'OR', 'params': ['ON', 'OFF']}
+    })
+    d = OpenhabItemDefinition(
+        'Group', 'Name', tags=('b', 'a'), group_type='Switch', group_function='OR', group_function_params=('ON', 'OFF')
+    )
+    assert not d.item_differs(resp)
+    assert OpenhabItemDefinition('Group', 'Name', tags=('b', 'a'), group_type='Switch').item_differs(resp)
+    assert OpenhabItemDefinition('Group', 'Name', tags=('a', ), group_type='Switch').item_differs(resp)
+
+
+async def test_create_items(monkeypatch) -> None:
+    existing = [
+        ItemResp.model_validate({
+            'type': 'Number', 'name': 'Unchanged', 'label': 'Label', 'state': 'NULL', 'tags': [], 'groupNames': [],
+            'metadata': {'ns': {'value': 'val', 'config': {'a': 1}}}
+        }),
+        ItemResp.model_validate({
+            'type': 'Number', 'name': 'Changed', 'state': 'NULL', 'tags': [], 'groupNames': [],
+        }),
+        ItemResp.model_validate({
+            'type': 'Number', 'name': 'Meta', 'state': 'NULL', 'tags': [], 'groupNames': [],
+            'metadata': {'ns': {'value': 'val'}}
+        }),
+    ]
+    links = [ItemChannelLinkResp.model_validate({'itemName': 'Unchanged', 'channelUID': 'a:b:c', 'editable': True})]
+
+    monkeypatch.setattr(func_async, 'async_get_items', AsyncMock(return_value=existing))
+    monkeypatch.setattr(func_async, 'async_get_links', AsyncMock(return_value=links))
+    put = AsyncMock(return_value=Mock(status=200))
+    monkeypatch.setattr(func_async, 'put', put)
+
+    ret = await async_create_items([
+        OpenhabItemDefinition('Number', 'Unchanged', 'Label', metadata={'ns': ('val', {'a': 1})}, link='a:b:c'),
+        OpenhabItemDefinition('Number', 'Changed', 'Label'),
+        OpenhabItemDefinition('Number', 'Meta', metadata={'ns': ('val', {'a': 1})}),
+        OpenhabItemDefinition('Number', 'New', groups=['Grp'], link='a:b:d'),
+        OpenhabItemDefinition('Group', 'Grp'),
+    ])
+
+    assert ret.unchanged == ('Unchanged', )
+    assert set(ret.updated) == {'Changed', 'Meta'}
+    assert ret.created == ('Grp', 'New')
+    assert ret.failed == {}
+
+    urls = [c.args[0] for c in put.call_args_list]
+    # groups are created first
+    assert urls[0] == '/rest/items/Grp'
+    assert sorted(urls) == [
+        '/rest/items/Changed', '/rest/items/Grp', '/rest/items/Meta/metadata/ns', '/rest/items/New',
+        '/rest/links/New/a%3Ab%3Ad',
+    ]
+
+
+async def test_create_items_error(monkeypatch) -> None:
+    monkeypatch.setattr(func_async, 'async_get_items', AsyncMock(return_value=[]))
+    monkeypatch.setattr(func_async, 'put', AsyncMock(return_value=Mock(status=405)))
+
+    ret = await async_create_items([OpenhabItemDefinition('Number', 'Name')], concurrency=1)
+    assert ret.created == ()
+    assert list(ret.failed) == ['Name']
+
+    with pytest.raises(ValueError):
+        await async_create_items([OpenhabItemDefinition('Number', 'Name')] * 2)
@@ -0,0 +1,96 @@
+import marshal
+import os
+import struct
+from importlib.util import MAGIC_NUMBER
+from pathlib import Path
+
+import pytest
+
+from HABApp.rule_manager import code_cache as code_cache_module
+from HABApp.rule_manager.code_cache import RuleCodeCache, get_cache_path
+
+
+@pytest.fixture()
+def file(tmp_path: Path) -> Path:
+    file = tmp_path / 'my_rule.py'
+    file.write_text('a = 1\n')
+    return file
+
+
+def run(code) -> dict:
+    obj = {}
+    exec(code, obj)  # noqa: S102
+    return obj
+
+
+def test_memory(file: Path) -> None:
+    cache = RuleCodeCache()
+
+    code = cache.get_code(file)
+    assert run(code)['a'] == 1
+    assert cache.get_code(file) is code
+    assert not get_cache_path(file).parent.is_dir()
+
+    # file changed
+    file.write_text('a = 22\n')
+    stat = file.stat()
+    os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    code = cache.get_code(file)
+    assert run(code)['a'] == 22
+    assert cache.get_code(file) is code
+
+    cache.remove(file)
+    assert cache.get_code(file) is not code
+
+
+def test_disk(monkeypatch, file: Path) -> None:
+    code = RuleCodeCache().get_code(file, disk=True)
+    assert run(code)['a'] == 1
+
+    cache_file = get_cache_path(file)
+    assert cache_file.is_file()
+    assert cache_file.parent.name == '__pycache__'
+    assert cache_file.name.endswith('.opt-habapp.pyc')
+
+    def raise_compile(*args, **kwargs):
+        raise AssertionError()
+
+    # new cache (e.g. after a restart) loads the code from disk
+    monkeypatch.setattr(code_cache_module, 'compile', raise_compile, raising=False)
+    assert run(RuleCodeCache().get_code(file, disk=True))['a'] == 1
+    monkeypatch.undo()
+
+    # invalid file -> compile
+    cache_file.write_bytes(b'asdf')
+    assert run(RuleCodeCache().get_code(file, disk=True))['a'] == 1
+
+    # file changed -> compile
+    file.write_text('a = 333\n')
+    stat = file.stat()
+    os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert run(RuleCodeCache().get_code(file, disk=True))['a'] == 333
+    assert run(RuleCodeCache().get_code(file, disk=True))['a'] == 333
+
+
+def test_future_flags(file: Path) -> None:
+    # The module of the cache uses "from __future__ import annotations".
+    # This must not be inherited by the compiled rule file
+    file.write_text('class A:\n    x: int\n\nANNOTATIONS = A.__annotations__\n')
+
+    assert run(RuleCodeCache().get_code(file))['ANNOTATIONS'] == {'x': int}
+    assert run(RuleCodeCache().get_code(file, disk=True))['ANNOTATIONS'] == {'x': int}
+    assert run(RuleCodeCache().get_code(file, disk=True))['ANNOTATIONS'] == {'x': int}
+
+
+def test_old_cache_file(file: Path) -> None:
+    # cache file of a previous version
+    code = compile(file.read_bytes(), str(file), 'exec')
+    stat = file.stat()
+    cache_file = get_cache_path(file)
+    cache_file.parent.mkdir()
+    cache_file.write_bytes(
+        MAGIC_NUMBER + struct.pack('<qQ', stat.st_mtime_ns, stat.st_size) + marshal.dumps(code)
+    )
+
+    assert RuleCodeCache._read_cache_file(file, stat.st_mtime_ns, stat.st_size) is None
@@ -55,6 +55,14 @@ def test_search_oh(ir: ItemRegistry) -> None:
     assert Rule.get_items(metadata_value=r'meta_v\d') == [item1, item2]
     assert Rule.get_items(groups='grp1', metadata_value=r'meta_v\d') == [item1]
 
+    # metadata value changed
+    item1._update_item_definition(
+        OpenhabItem('oh_item_1', tags=frozenset(['tag1', 'tag2', 'tag3']),
+                    groups=frozenset(['grp1', 'grp2']), metadata={'meta1': MetaData('meta_v2')})
+    )
+    assert Rule.get_items(metadata_value='meta_v1') == []
+    assert Rule.get_items(metadata_value='meta_v2') == [item1, item2]
+
 
 def test_classcheck() -> None:
     with pytest.raises(ValueError):
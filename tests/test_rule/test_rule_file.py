@@ -0,0 +1,62 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+from HABApp import Rule
+from HABApp.rule import rule as rule_module
+from HABApp.rule_manager.rule_file import RuleFileLoadTimes, run_code
+from tests.rule_runner import SimpleRuleRunner
+
+
+def test_run_code(tmp_path: Path) -> None:
+    file = tmp_path / 'my_file.py'
+    file.write_text('import sys\nRESULT.append((__name__, __file__, sys.modules[__name__]))\n')
+
+    name = str(file)
+    result = []
+    run_code(compile(file.read_text(), name, 'exec'), name, {'RESULT': result})
+
+    assert len(result) == 1
+    module_name, module_file, module = result[0]
+    assert module_name == name
+    assert module_file == name
+    assert module.RESULT is result
+    assert name not in sys.modules
+
+
+def test_run_code_exception(tmp_path: Path) -> None:
+    name = str(tmp_path / 'my_file.py')
+    with pytest.raises(ZeroDivisionError):
+        run_code(compile('1 / 0', name, 'exec'), name, {})
+    assert name not in sys.modules
+
+
+def test_load_times() -> None:
+    times = RuleFileLoadTimes(compile=1_000_000, exec=20_000_000, rule_init=300_000_000, rule_loaded=4_000_000_000)
+    assert str(times) == ('4.321s (compile: 0.001s, exec: 0.020s, rule __init__: 0.300s, '
+                          'on_rule_loaded: 4.000s)')
+
+
+@pytest.mark.no_internals
+async def test_first_rule_time() -> None:
+
+    class MyRule(Rule):
+        def __init__(self) -> None:
+            super().__init__()
+
+    init = MyRule.__init__
+
+    async with SimpleRuleRunner():
+        hook = rule_module._get_rule_hook()
+        assert hook.first_rule_ns is None
+
+        MyRule()
+        first = hook.first_rule_ns
+        assert first is not None
+
+        MyRule()
+        assert hook.first_rule_ns == first
+
+    # the rule class is not modified
+    assert MyRule.__init__ is init
@@ -25,6 +25,16 @@ class TestCases(unittest.TestCase):
         stat.add_value(0)
         self.assertEqual(stat.median, 1.5)
 
+    def test_max_samples(self) -> None:
+        stat = Statistics(max_samples=2)
+        for i in range(5):
+            stat.add_value(i)
+        self.assertEqual(list(stat.values), [3, 4])
+        self.assertEqual(stat.sum, 7)
+        self.assertEqual(stat.min, 3)
+        self.assertEqual(stat.median, 3.5)
+        self.assertEqual(stat.last_change, 1)
+
 
 if __name__ == '__main__':
     unittest.main()